@@ -0,0 +1,63 @@
+"""Geração de projetos mkdocs sintéticos para os benchmarks."""
+import io as _io
+import os as _os
+import tempfile as _tempfile
+from ruamel.yaml import YAML as _YAML
+
+
+def synthetic_nav(entries: int, fanout: int = 100, depth: int = 1, indexes: bool = False) -> list:
+    """
+    Nav com 'entries' documentos distribuídos em 'depth' níveis de seções com
+    até 'fanout' itens cada. Com indexes=True cada seção ganha um index.md no
+    fim da lista, para o organize_nav_indexes ter o que reorganizar.
+    """
+    def level(keys: list, remaining: int, start: int, stop: int) -> list:
+        if remaining == 0:
+            items = [{f"Doc{i}": "/".join(keys + [f"Doc{i}", f"Doc{i}.md"])} for i in range(start, stop)]
+        else:
+            span = fanout ** remaining
+            items = []
+            for first in range(start, stop, span):
+                # nomes distintos por nível: uma seção nunca tem a mesma chave da seção pai
+                section = f"Secao{first // span}" if remaining == 1 else f"Grupo{remaining}_{first // span}"
+                items.append({section: level(keys + [section], remaining - 1, first, min(first + span, stop))})
+        if indexes and keys:
+            items.append({keys[-1]: "/".join(keys + ["index.md"])})
+        return items
+
+    return level([], depth, 0, entries)
+
+
+def make_project(entries: int, fanout: int = 100, depth: int = 1, indexes: bool = False) -> str:
+    """
+    Cria um projeto temporário (mkdocs.yml + pasta docs) e aponta as variáveis
+    de ambiente do docwriter para ele. Deve ser chamado antes de importar docwriter.core.
+    """
+    root = _tempfile.mkdtemp(prefix="docwriter-bench-")
+    docs = _os.path.join(root, "docs")
+    _os.makedirs(docs)
+    config_path = _os.path.join(root, "mkdocs.yml")
+
+    yaml = _YAML()
+    buffer = _io.StringIO()
+    yaml.dump({"site_name": "Benchmark", "nav": synthetic_nav(entries, fanout, depth, indexes), "theme": {"name": "material"}}, buffer)
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(buffer.getvalue())
+
+    _os.environ["MKDOCS_CONFIG_PATH"] = config_path
+    _os.environ["MKDOCS_DOC_ROOT_PATH"] = docs
+    _os.environ.setdefault("DEFAULT_TEXT_FOR_NEW_SECTIONS", "Benchmark {key}")
+    return root
+
+
+def make_documents(root: str, count: int) -> list[str]:
+    """Cria 'count' arquivos .md pequenos fora da pasta docs."""
+    source = _os.path.join(root, "source")
+    _os.makedirs(source, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = _os.path.join(source, f"novo{i}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# Novo {i}\n")
+        paths.append(path)
+    return paths
@@ -0,0 +1,81 @@
+"""
+Mede core.import_tree() em uma árvore sintética de documentos Markdown.
+
+    python benchmarks/bench_import_tree.py --files 50000 --workers 1 8
+"""
+import argparse as _argparse
+import os as _os
+import sys as _sys
+import subprocess as _subprocess
+import time as _time
+
+_sys.path.insert(0, _os.path.join(_os.path.dirname(__file__), "..", "src"))
+
+from _synthetic import make_project as _make_project
+
+
+def _make_source_tree(root: str, files: int, fanout: int, size: int) -> str:
+    source = _os.path.join(root, "source")
+    body = ("# Documento\n\n" + "lorem ipsum " * (size // 12 + 1))[:size]
+    for i in range(files):
+        folder = _os.path.join(source, f"Area{i // (fanout * fanout)}", f"Tema{(i // fanout) % fanout}")
+        _os.makedirs(folder, exist_ok=True)
+        with open(_os.path.join(folder, f"doc{i}.md"), "w", encoding="utf-8") as f:
+            f.write(body)
+    return source
+
+
+def _run(args, workers: int) -> None:
+    """Uma medição em projeto novo: o nav começa vazio em todas as rodadas."""
+    root = _make_project(0)
+    source = _make_source_tree(root, args.files, args.fanout, args.size)
+
+    from docwriter import core
+
+    copies = []
+    start = _time.perf_counter()
+    imported = core.import_tree(source, "Importados", workers=workers,
+                                progress=lambda done, total: copies.append(_time.perf_counter()))
+    elapsed = _time.perf_counter() - start
+    copy_time = copies[-1] - copies[0] if copies else 0.0
+    print(f"import_tree(workers={workers:<2}):  {elapsed:6.1f} s total ({copy_time:5.1f} s copiando), "
+          f"{len(imported) / elapsed:6.0f} arquivos/s")
+
+
+def _run_single(args) -> None:
+    root = _make_project(0)
+    source = _make_source_tree(root, args.sample, args.fanout, args.size)
+
+    from docwriter import core
+
+    start = _time.perf_counter()
+    for i, path in enumerate(sorted(_os.path.join(d, n) for d, _, names in _os.walk(source) for n in names)):
+        core.index(f"Isolado.Doc{i}", path)
+    per_file = (_time.perf_counter() - start) / args.sample
+    print(f"index() isolado:          {per_file * 1000:6.1f} ms/arquivo com nav quase vazio (cresce com o nav)")
+
+
+def main(argv=None):
+    parser = _argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--fanout", type=int, default=100)
+    parser.add_argument("--size", type=int, default=4096, help="bytes por documento")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--sample", type=int, default=20, help="documentos medidos com index() isolado")
+    parser.add_argument("--only", type=int, help=_argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.only is not None:
+        _run_single(args) if args.only == 0 else _run(args, args.only)
+        return
+
+    print(f"{args.files} arquivos de {args.size} bytes")
+    # cada rodada em um processo novo, já que o core carrega a configuração na importação
+    base = [_sys.executable, __file__, "--files", str(args.files), "--fanout", str(args.fanout),
+            "--size", str(args.size), "--sample", str(args.sample)]
+    for only in [0] + args.workers:
+        _subprocess.run(base + ["--only", str(only)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compara index() operação a operação com batch_index() em um nav sintético.
+
+    python benchmarks/bench_transaction.py --entries 10000 --single 5 --batch 500
+"""
+import argparse as _argparse
+import os as _os
+import sys as _sys
+import time as _time
+
+_sys.path.insert(0, _os.path.join(_os.path.dirname(__file__), "..", "src"))
+
+from _synthetic import make_project as _make_project, make_documents as _make_documents
+
+
+def main(argv=None):
+    parser = _argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--single", type=int, default=5, help="operações com index() isolado")
+    parser.add_argument("--batch", type=int, default=500, help="operações dentro de batch_index()")
+    args = parser.parse_args(argv)
+
+    root = _make_project(args.entries)
+    documents = _make_documents(root, args.single + args.batch)
+    _os.chdir(root)
+
+    from docwriter import core
+
+    start = _time.perf_counter()
+    for i, path in enumerate(documents[:args.single]):
+        core.index(f"Isolado.Doc{i}", path)
+    single = args.single / (_time.perf_counter() - start)
+
+    start = _time.perf_counter()
+    core.batch_index((f"Lote.Doc{i}", path) for i, path in enumerate(documents[args.single:]))
+    batch = args.batch / (_time.perf_counter() - start)
+
+    print(f"nav: {args.entries} entradas")
+    print(f"index() isolado: {single:10.2f} ops/s")
+    print(f"batch_index():   {batch:10.2f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compara a escrita antiga do write_config (copy2 para .bkp + reescrita no lugar)
+com a escrita atômica (arquivo temporário + fsync + os.replace, backup por hard link).
+
+    python benchmarks/bench_write_config.py --entries 10000 --writes 5
+"""
+import argparse as _argparse
+import os as _os
+import shutil as _shutil
+import sys as _sys
+import time as _time
+
+_sys.path.insert(0, _os.path.join(_os.path.dirname(__file__), "..", "src"))
+
+from _synthetic import make_project as _make_project
+
+
+def _written_bytes() -> int | None:
+    """Bytes escritos pelo processo até agora (somente Linux, /proc/self/io)."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _legacy_write(config_path: str, data: dict) -> None:
+    from docwriter.yaml_io import _yaml
+    _shutil.copy2(config_path, config_path + ".bkp")
+    with open(config_path, "w", encoding="utf-8") as f:
+        _yaml.dump(data, f)
+
+
+def _measure(label: str, writes: int, write) -> None:
+    before_bytes = _written_bytes()
+    start = _time.perf_counter()
+    for _ in range(writes):
+        write()
+    elapsed = (_time.perf_counter() - start) / writes
+    after_bytes = _written_bytes()
+    per_write = "n/d" if before_bytes is None else f"{(after_bytes - before_bytes) / writes / 1024:.0f} KiB"
+    print(f"{label:<24} {elapsed * 1000:8.1f} ms/escrita   {per_write} escritos/escrita")
+
+
+def main(argv=None):
+    parser = _argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--writes", type=int, default=5)
+    parser.add_argument("--backups", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    root = _make_project(args.entries)
+    config_path = _os.environ["MKDOCS_CONFIG_PATH"]
+
+    from docwriter.yaml_io import read_config, write_config
+
+    data = read_config(config_path)
+    print(f"nav: {args.entries} entradas, {_os.path.getsize(config_path) / 1024:.0f} KiB")
+    _measure("antigo (copy2 + rewrite)", args.writes, lambda: _legacy_write(config_path, data))
+    _measure(f"atômico ({args.backups} backups)", args.writes, lambda: write_config(config_path, data, backups=args.backups))
+    _measure("atômico (sem backup)", args.writes, lambda: write_config(config_path, data, backups=0))
+    _shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Suíte de benchmarks do docwriter com saída em JSON.
+
+Gera mkdocs.yml sintéticos com 1k/10k/100k entradas em formatos diferentes
+(profundidade x fan-out) e mede as operações do navtree, o organize_nav_indexes,
+read_config/read_section/write_config, a leitura/gravação do nav compacto
+(MKDOCS_COMPACT_NAV) e o core.index de ponta a ponta, com e sem o diário
+(MKDOCS_JOURNAL).
+
+    python benchmarks/run.py --output resultados.json
+    python benchmarks/run.py --sizes 1000,10000 --shapes 1x100,3x20 --rounds 5
+    python benchmarks/run.py --sizes 10000 --compare resultados.json
+
+Com --compare os tempos medianos são comparados com um resultado anterior
+(de outro commit) e o código de saída é 1 se algum ficou mais lento que --threshold.
+"""
+import argparse as _argparse
+import datetime as _datetime
+import io as _io
+import json as _json
+import os as _os
+import platform as _platform
+import random as _random
+import shutil as _shutil
+import statistics as _statistics
+import subprocess as _subprocess
+import sys as _sys
+import time as _time
+
+_sys.path.insert(0, _os.path.join(_os.path.dirname(__file__), "..", "src"))
+
+from _synthetic import make_documents as _make_documents, make_project as _make_project, synthetic_nav as _synthetic_nav
+
+# Quantidade de operações por rodada nos benchmarks baratos do navtree
+_NAV_OPS = 1000
+
+
+def _measure(rounds: int, run, setup=None, ops: int = 1) -> dict:
+    """Executa 'run' em 'rounds' rodadas e devolve os tempos por operação, em segundos."""
+    times = []
+    for _ in range(rounds):
+        state = setup() if setup else None
+        start = _time.perf_counter()
+        run(state)
+        times.append((_time.perf_counter() - start) / ops)
+    return {
+        "rounds": rounds,
+        "ops_per_round": ops,
+        "min": min(times),
+        "median": _statistics.median(times),
+        "mean": _statistics.fmean(times),
+    }
+
+
+def _leaf_paths(nav: list, prefix: str = "") -> list[str]:
+    paths = []
+    for item in nav:
+        if not isinstance(item, dict):
+            continue
+        for key, value in item.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(value, list):
+                paths.extend(_leaf_paths(value, path))
+            else:
+                paths.append(path)
+    return paths
+
+
+def _roundtrip(nav: list) -> list:
+    """Passa o nav pelo ruamel para ter os mesmos tipos (CommentedMap/Seq) do arquivo real."""
+    from docwriter.yaml_io import _yaml
+    buffer = _io.StringIO()
+    _yaml.dump(nav, buffer)
+    return _yaml.load(buffer.getvalue())
+
+
+def _bench_shape(entries: int, depth: int, fanout: int, rounds: int) -> list[dict]:
+    from docwriter import core
+    from docwriter.project import Project
+    from docwriter.navtree import nav_add, nav_get, nav_remove, nav_update, organize_nav_indexes
+    from docwriter.yaml_io import invalidate, read_config, read_nav_compact, read_section, write_config, write_nav_compact
+
+    root = _make_project(entries, fanout, depth)
+    config_path = _os.environ["MKDOCS_CONFIG_PATH"]
+    core.set_default_project(None)
+    results = []
+
+    def record(name: str, measurement: dict) -> None:
+        results.append({"benchmark": name, "entries": entries, "depth": depth, "fanout": fanout, **measurement})
+        print(f"  {name:<28} {measurement['median'] * 1000:10.3f} ms/op", file=_sys.stderr)
+
+    try:
+        def cold(_):
+            invalidate(config_path)
+            read_config(config_path)
+        record("yaml_io.read_config[cold]", _measure(rounds, cold))
+        record("yaml_io.read_config[cached]", _measure(rounds, lambda _: read_config(config_path)))
+
+        def section(_):
+            invalidate(config_path)
+            read_section(config_path, "nav")
+        record("yaml_io.read_section[nav]", _measure(rounds, section))
+
+        def compact(_):
+            invalidate(config_path)
+            read_nav_compact(config_path)
+        record("yaml_io.read_nav_compact", _measure(rounds, compact))
+        tree = read_nav_compact(config_path)
+        record("yaml_io.write_nav_compact", _measure(rounds, lambda _: write_nav_compact(config_path, tree, backups=0)))
+        del tree
+        invalidate(config_path)
+
+        data = read_config(config_path)
+        nav = data["nav"]
+        record("yaml_io.write_config", _measure(rounds, lambda _: write_config(config_path, data)))
+        record("yaml_io.write_config[no backup]", _measure(rounds, lambda _: write_config(config_path, data, backups=0)))
+        record("yaml_io.write_config[nav]", _measure(rounds, lambda _: write_config(config_path, data, key="nav")))
+
+        paths = _leaf_paths(nav)
+        sample = _random.Random(entries).choices(paths, k=_NAV_OPS)
+        parents = [path.rsplit(".", 1)[0] if "." in path else "" for path in sample]
+        added = [f"{parent}.Bench{i}" if parent else f"Bench{i}" for i, parent in enumerate(parents)]
+
+        def get(_):
+            for path in sample:
+                nav_get(nav, path)
+        record("navtree.nav_get", _measure(rounds, get, ops=_NAV_OPS))
+
+        def update(_):
+            for path in sample:
+                nav_update(nav, path, "bench.md")
+        record("navtree.nav_update", _measure(rounds, update, ops=_NAV_OPS))
+
+        def add(_):
+            for path in added:
+                nav_add(nav, path, "bench.md")
+
+        def remove(_):
+            for path in added:
+                nav_remove(nav, path)
+        # cada rodada de add é desfeita pela de remove, e vice-versa
+        add_times, remove_times = [], []
+        for _ in range(rounds):
+            add_times.append(_measure(1, add, ops=_NAV_OPS)["median"])
+            remove_times.append(_measure(1, remove, ops=_NAV_OPS)["median"])
+        for name, times in (("navtree.nav_add", add_times), ("navtree.nav_remove", remove_times)):
+            record(name, {"rounds": rounds, "ops_per_round": _NAV_OPS, "min": min(times),
+                          "median": _statistics.median(times), "mean": _statistics.fmean(times)})
+
+        indexed_nav = _roundtrip(_synthetic_nav(entries, fanout, depth, indexes=True))
+        record("navtree.organize_nav_indexes", _measure(rounds, lambda _: organize_nav_indexes(indexed_nav)))
+
+        # o nav foi alterado pelos benchmarks acima; o core volta a ler do disco
+        invalidate(config_path)
+        documents = iter(_make_documents(root, rounds))
+        record("core.index", _measure(rounds, lambda path: core.index(f"Bench.{_os.path.basename(path)[:-3]}", path),
+                                      setup=lambda: next(documents)))
+
+        # o mesmo com o diário (MKDOCS_JOURNAL): uma linha acrescentada por operação, e a compactação
+        project = Project(config_path, _os.environ["MKDOCS_DOC_ROOT_PATH"], journal=True)
+        documents = iter(_make_documents(root, rounds))
+        project.get_nav()
+        record("core.index[journal]", _measure(rounds, lambda path: project.index(f"Journal.{_os.path.basename(path)[:-3]}", path),
+                                               setup=lambda: next(documents)))
+        record("project.compact_journal", _measure(1, lambda _: project.compact_journal()))
+    finally:
+        invalidate(config_path)
+        core.set_default_project(None)
+        _shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def _metadata() -> dict:
+    try:
+        commit = _subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                 cwd=_os.path.dirname(_os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, _subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": _datetime.datetime.now(_datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": _platform.python_version(),
+        "platform": _platform.platform(),
+    }
+
+
+def _key(result: dict) -> tuple:
+    return result["benchmark"], result["entries"], result["depth"], result["fanout"]
+
+
+def _compare(results: list[dict], baseline_path: str, threshold: float) -> int:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_key(result): result for result in _json.load(f)["results"]}
+    regressions = 0
+    for result in results:
+        old = baseline.get(_key(result))
+        if old is None or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  <- mais lento"
+            regressions += 1
+        name, entries, depth, fanout = _key(result)
+        print(f"{name:<32} {entries:>7} {depth}x{fanout:<4} {ratio:7.2f}x{flag}", file=_sys.stderr)
+    return 1 if regressions else 0
+
+
+def _parse_shapes(value: str) -> list[tuple[int, int]]:
+    shapes = []
+    for shape in value.split(","):
+        depth, fanout = shape.lower().split("x")
+        shapes.append((int(depth), int(fanout)))
+    return shapes
+
+
+def main(argv=None) -> int:
+    parser = _argparse.ArgumentParser(description=__doc__, formatter_class=_argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="quantidades de entradas no nav")
+    parser.add_argument("--shapes", default="1x100,3x20", help="profundidade x fan-out das seções")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=1.10, help="razão acima da qual conta como regressão")
+    args = parser.parse_args(argv)
+
+    results = []
+    for entries in (int(size) for size in args.sizes.split(",")):
+        for depth, fanout in _parse_shapes(args.shapes):
+            print(f"nav: {entries} entradas, {depth}x{fanout}", file=_sys.stderr)
+            results.extend(_bench_shape(entries, depth, fanout, args.rounds))
+
+    report = {"metadata": _metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            _json.dump(report, f, indent=2)
+    else:
+        _json.dump(report, _sys.stdout, indent=2)
+        print()
+    return _compare(results, args.compare, args.threshold) if args.compare else 0
+
+
+if __name__ == "__main__":
+    _sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Interface de linha de comando do docwriter, sem Qt.
+
+    docwriter index Aplicações.Teste C:/docs/teste.md
+    docwriter unindex Aplicações.Teste --file teste.md
+    docwriter index-folder Aplicações
+    docwriter index-all-folders --workers 8
+    docwriter rename Aplicações.Teste Novo
+    docwriter move Aplicações.Teste Arquivo.Teste
+    docwriter list
+    docwriter verify --repair
+    docwriter split-nav
+    docwriter merge-nav --output mkdocs.build.yml
+    docwriter watch --apply
+    docwriter compact
+    docwriter undo
+    docwriter --batch < operacoes.jsonl
+
+No modo --batch cada linha da entrada é um objeto JSON com "op" e os mesmos
+argumentos do método correspondente do Project, por exemplo:
+
+    {"op": "index", "yaml_path": "A.B", "file_path": "b.md"}
+    {"op": "unindex", "yaml_path": "A.C"}
+
+Todas as operações são aplicadas com uma leitura e uma escrita do mkdocs.yml;
+se alguma falhar, nada é gravado. Os resultados de cada linha só são escritos
+depois da gravação, seguidos de {"committed": true}; em caso de falha a saída
+é só a linha de erro com "committed": false.
+
+O comando watch observa a pasta docs e escreve uma linha JSON por lote de
+alterações externas (created/deleted, orphans/missing); com --apply o nav é
+corrigido a cada lote e orphans/missing trazem só o que não pôde ser corrigido.
+
+Com MKDOCS_JOURNAL=1 as alterações vão para o diário ao lado do mkdocs.yml;
+compact grava o mkdocs.yml com todas elas e undo desfaz a última.
+"""
+import argparse as _argparse
+import json as _json
+import sys as _sys
+
+# op do modo --batch -> (método do Project, campo JSON -> argumento do método)
+_BATCH_OPS = {
+    "index": ("index", {"yaml_path": "yaml_path", "file_path": "file_path"}),
+    "unindex": ("unindex", {"yaml_path": "yamlpath", "file_path": "file_path"}),
+    "index-folder": ("index_folder", {"yaml_path": "yaml_path"}),
+    "index-all-folders": ("index_all_folders", {"root_path": "root_path"}),
+    "update": ("update", {"yaml_path": "yaml_path", "file_path": "file_path"}),
+    "rename": ("rename", {"yaml_path": "yaml_path", "new_key": "new_key"}),
+    "move": ("move", {"yaml_path": "yaml_path", "new_path": "new_path"}),
+}
+
+
+def _parser() -> _argparse.ArgumentParser:
+    parser = _argparse.ArgumentParser(prog="docwriter", description="Edita o nav do mkdocs.yml e a pasta docs.")
+    parser.add_argument("--config", help="arquivo mkdocs.yml (padrão: MKDOCS_CONFIG_PATH)")
+    parser.add_argument("--docs", help="pasta de documentação (padrão: MKDOCS_DOC_ROOT_PATH)")
+    parser.add_argument("--nav-dir", help="pasta com um arquivo por seção do nav (padrão: MKDOCS_NAV_DIR)")
+    parser.add_argument("--batch", action="store_true", help="lê operações JSONL da entrada padrão")
+    commands = parser.add_subparsers(dest="command")
+
+    command = commands.add_parser("index", help="indexa um documento")
+    command.add_argument("yaml_path")
+    command.add_argument("file_path")
+
+    command = commands.add_parser("unindex", help="remove um item do nav")
+    command.add_argument("yaml_path")
+    command.add_argument("--file", dest="file_path", default="", help="remove também o arquivo da pasta docs")
+
+    command = commands.add_parser("index-folder", help="cria e indexa o index.md de uma pasta")
+    command.add_argument("yaml_path")
+
+    command = commands.add_parser("index-all-folders", help="cria e indexa o index.md de todas as pastas que não têm")
+    command.add_argument("root_path", nargs="?", default=None, help="só as pastas abaixo deste caminho")
+    command.add_argument("--workers", type=int, default=4, help="threads da criação dos arquivos")
+
+    command = commands.add_parser("rename", help="renomeia um item do nav e a sua pasta")
+    command.add_argument("yaml_path")
+    command.add_argument("new_key")
+
+    command = commands.add_parser("move", help="move um item do nav (com os filhos) e a sua pasta")
+    command.add_argument("yaml_path")
+    command.add_argument("new_path")
+
+    command = commands.add_parser("list", help="lista os caminhos do nav")
+    command.add_argument("prefix", nargs="?", default="", help="lista apenas abaixo deste caminho")
+
+    command = commands.add_parser("split-nav", help="separa o nav do mkdocs.yml em um arquivo por seção")
+
+    command = commands.add_parser("merge-nav", help="gera o mkdocs.yml completo a partir das seções")
+    command.add_argument("--output", help="arquivo gerado (padrão: o próprio mkdocs.yml)")
+
+    command = commands.add_parser("verify", help="compara a pasta docs com o nav (saída JSON)")
+    command.add_argument("--repair", action="store_true", help="corrige o nav com uma única escrita")
+    command.add_argument("--workers", type=int, default=None, help="threads da leitura da pasta docs")
+
+    command = commands.add_parser("watch", help="observa a pasta docs e relata diferenças com o nav")
+    command.add_argument("--apply", action="store_true", help="corrige o nav a cada lote de alterações")
+    command.add_argument("--debounce", type=float, default=0.3, help="segundos sem eventos antes de cada lote")
+    command.add_argument("--polling", action="store_true", help="usa polling em vez de inotify")
+    command.add_argument("--interval", type=float, default=1.0, help="intervalo do polling, em segundos")
+
+    command = commands.add_parser("compact", help="grava no mkdocs.yml as alterações do diário (MKDOCS_JOURNAL)")
+
+    command = commands.add_parser("undo", help="desfaz a última alteração ainda no diário (MKDOCS_JOURNAL)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.batch and not args.command:
+        parser.print_help()
+        return 2
+
+    try:
+        from docwriter.project import Project
+        project = Project.from_env(args.config, args.docs)
+        if args.nav_dir:
+            project.nav_dir = args.nav_dir
+        if args.batch:
+            return _run_batch(project, _sys.stdin, _sys.stdout)
+        return _run_command(project, args)
+    except Exception as ex:
+        print(f"docwriter: {ex}", file=_sys.stderr)
+        return 1
+
+
+def _run_command(project, args) -> int:
+    if args.command == "list":
+        _list(project, args.prefix)
+        return 0
+    if args.command == "split-nav":
+        for name in project.split_nav():
+            print(name)
+        return 0
+    if args.command == "merge-nav":
+        project.merge_nav(args.output)
+        return 0
+    if args.command == "verify":
+        return _verify(project, args, _sys.stdout)
+    if args.command == "watch":
+        return _watch(project, args, _sys.stdout)
+    if args.command == "index-all-folders":
+        for yaml_path in project.index_all_folders(args.root_path, args.workers):
+            print(yaml_path)
+        return 0
+    if args.command == "compact":
+        print(project.compact_journal())
+        return 0
+    if args.command == "undo":
+        if not project.undo():
+            print("docwriter: nada a desfazer no diário", file=_sys.stderr)
+            return 1
+        return 0
+    if args.command == "index":
+        result = project.index(args.yaml_path, args.file_path)
+    elif args.command == "unindex":
+        result = project.unindex(args.yaml_path, args.file_path)
+    elif args.command == "index-folder":
+        result = project.index_folder(args.yaml_path)
+    elif args.command == "move":
+        result = project.move(args.yaml_path, args.new_path)
+    else:
+        result = project.rename(args.yaml_path, args.new_key)
+    if not result:
+        print(f"docwriter: nada alterado para {args.yaml_path}", file=_sys.stderr)
+        return 1
+    return 0
+
+
+def _list(project, prefix: str) -> None:
+    from docwriter.navtree import nav_tree
+
+    for path, value in nav_tree(project.read_nav()).entries():
+        if prefix and path != prefix and not path.startswith(prefix + "."):
+            continue
+        print(path if value is None else f"{path}\t{value}")
+
+
+def _verify(project, args, out) -> int:
+    """Escreve o Drift em JSON; retorna 1 se restarem diferenças (depois do reparo, com --repair)."""
+    drift = project.verify(args.workers)
+    if args.repair:
+        drift = project.repair(drift)
+    line = {"orphans": list(drift.orphans), "missing": [list(item) for item in drift.missing]}
+    out.write(_json.dumps(line, ensure_ascii=False) + "\n")
+    return 1 if drift else 0
+
+
+def _watch(project, args, out) -> int:
+    """Uma linha JSON com as diferenças iniciais e outra por lote de alterações, até Ctrl+C."""
+    from docwriter.watcher import Watcher
+
+    def report(drift, **extra) -> None:
+        if args.apply and drift:
+            drift = watcher.apply(drift)
+        line = {**extra, "orphans": list(drift.orphans), "missing": [list(item) for item in drift.missing]}
+        out.write(_json.dumps(line, ensure_ascii=False) + "\n")
+        out.flush()
+
+    watcher = Watcher(project, args.debounce, args.interval, True if args.polling else None)
+    try:
+        report(watcher.drift())
+        for changes in watcher.changes():
+            report(watcher.drift(changes), created=list(changes.created), deleted=list(changes.deleted))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return 0
+
+
+def _run_batch(project, stream, out) -> int:
+    """Aplica cada linha JSONL em uma única transação e escreve um resultado por linha depois de gravar."""
+    results = []
+    line_number = 0
+    try:
+        with project.transaction():
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                operation = _json.loads(line)
+                name = operation.get("op")
+                if name not in _BATCH_OPS:
+                    raise ValueError(f"operação desconhecida: {name!r}")
+                function, fields = _BATCH_OPS[name]
+                kwargs = {argument: operation[field] for field, argument in fields.items() if field in operation}
+                result = getattr(project, function)(**kwargs)
+                results.append({"line": line_number, "op": name, "result": bool(result)})
+            # daqui em diante a falha é da gravação, não de uma linha
+            line_number = None
+    except Exception as ex:
+        # nada foi gravado: os resultados das linhas anteriores não valem mais
+        out.write(_json.dumps({"line": line_number, "error": str(ex), "committed": False}, ensure_ascii=False) + "\n")
+        return 1
+    for result in results:
+        out.write(_json.dumps(result, ensure_ascii=False) + "\n")
+    out.write(_json.dumps({"committed": True}) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    _sys.exit(main())
@@ -0,0 +1,637 @@
+"""
+Representação compacta do nav para sites muito grandes (MKDOCS_COMPACT_NAV=1).
+
+O nav carregado pelo ruamel tem um CommentedMap por item e um CommentedSeq por
+pasta, cada um com seus atributos de comentário e formatação, e repete a mesma
+string de chave em cada caminho; com 100k itens isso chega a centenas de MB.
+Aqui cada item é uma linha de uma tabela: pai, primeiro/último filho e irmãos
+em arrays de inteiros, a chave como id de uma tabela de strings internadas e o
+arquivo em uma lista.
+
+A árvore é montada uma vez na leitura (yaml_io.read_nav_compact) e só volta ao
+formato de listas/dicts na gravação (yaml_io.write_nav_compact). Entre as duas,
+as funções do navtree, o NavModel, a busca e o consistency trabalham direto
+sobre ela. Comentários e aspas dentro do bloco nav não são preservados nesse
+modo; o resto do arquivo de configuração continua byte a byte igual.
+"""
+import json as _json
+import re as _re
+import sys as _sys
+from array import array as _array
+from docwriter import profiling as _profiling
+from docwriter.navtree import NavAdded as _NavAdded, NavMoved as _NavMoved, NavRemoved as _NavRemoved, NavUpdated as _NavUpdated, _is_index
+
+# Linha da raiz (o próprio nav) e "nenhum nó" nas tabelas de ligação
+_ROOT = 0
+_NONE = -1
+# Id de chave dos itens soltos do nav ("- arquivo.md", sem chave)
+_NO_KEY = -1
+# Valor das linhas que são pastas (no nav, uma lista de filhos)
+_SECTION = object()
+# Escalares gravados sem aspas em to_yaml(): letras, dígitos, espaços simples e . / ( ) -
+# sem começar com dígito; o resto vai entre aspas duplas (escape do JSON, válido em YAML)
+_PLAIN = _re.compile(r"[^\W\d][\w./()-]*(?: [\w./()-]+)*")
+# Palavras que o YAML 1.1 leria como booleano/nulo
+_RESERVED = frozenset(("y", "n", "yes", "no", "on", "off", "true", "false", "null"))
+
+
+class NavNode:
+    """
+    Vista de um item da CompactNav (usada pelo NavModel); guarda só a árvore e
+    a linha. Duas vistas da mesma linha da mesma árvore são iguais.
+    """
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: "CompactNav", index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def key(self) -> str | None:
+        """Chave do item, ou None para um arquivo solto na lista."""
+        key = self.tree._key[self.index]
+        return self.tree._strings[key] if key != _NO_KEY else None
+
+    @property
+    def value(self) -> str | None:
+        """Arquivo do item; None para pastas."""
+        value = self.tree._values[self.index]
+        return None if value is _SECTION else value
+
+    @property
+    def is_section(self) -> bool:
+        return self.tree._values[self.index] is _SECTION
+
+    def children(self) -> list["NavNode"]:
+        return [NavNode(self.tree, child) for child in self.tree._children(self.index)]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.tree._children(self.index))
+
+    def __bool__(self) -> bool:
+        return self.tree._first[self.index] != _NONE
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, NavNode) and other.tree is self.tree and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f"NavNode({self.key!r}, {self.value!r})"
+
+
+class CompactNav:
+    """
+    Nav em tabelas planas, com a mesma interface do NavTree (get, add, remove,
+    update, rename, move, position, paths, subscribe) e os mesmos NavEvent.
+
+        tree = CompactNav.from_nav(nav)
+        tree.add("Aplicações.Teste", "Aplicações/Teste/teste.md")
+        nav = tree.to_nav()
+
+    A árvore é o seu próprio nav ('tree.nav is tree'), então pode ser passada
+    no lugar da lista para nav_get/nav_add/organize_nav_indexes. get() de uma
+    pasta devolve uma cópia dos filhos no formato do nav; alterar essa cópia
+    não altera a árvore (use update()).
+
+    Linhas de itens removidos não são reaproveitadas: um NavNode nunca passa a
+    apontar para outro item. Elas só são liberadas quando o nav é lido de novo.
+    """
+
+    def __init__(self):
+        # uma posição por linha; a linha 0 é a raiz
+        self._parent = _array('i', [_NONE])
+        self._first = _array('i', [_NONE])
+        self._last = _array('i', [_NONE])
+        self._next = _array('i', [_NONE])
+        self._prev = _array('i', [_NONE])
+        self._key = _array('i', [_NO_KEY])
+        # arquivo de cada linha (str ou None) ou _SECTION
+        self._values: list = [_SECTION]
+        # id -> chave e chave -> id; cada nome de chave é guardado uma vez só
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        # linha da pasta -> (id da chave -> primeira linha filha com essa chave), montado sob demanda
+        self._levels: dict[int, dict[int, int]] = {}
+        self._listeners: list = []
+
+    @classmethod
+    def from_nav(cls, nav: list | None) -> "CompactNav":
+        """Monta a árvore a partir da lista 'nav' (ruamel ou dict/list comuns)."""
+        tree = cls()
+        tree._extend(_ROOT, nav if isinstance(nav, list) else [])
+        return tree
+
+    def copy(self) -> "CompactNav":
+        """Cópia independente das tabelas, sem os callbacks registrados com subscribe()."""
+        tree = CompactNav()
+        for name in ("_parent", "_first", "_last", "_next", "_prev", "_key"):
+            setattr(tree, name, _array('i', getattr(self, name)))
+        tree._values = list(self._values)
+        tree._strings = list(self._strings)
+        tree._string_ids = dict(self._string_ids)
+        return tree
+
+    def to_nav(self, path: str = "") -> list:
+        """Filhos de 'path' ("" = o nav inteiro) no formato do nav, com dict/list comuns."""
+        node = self._resolve(path) if path else _ROOT
+        return self._materialize(node) if node != _NONE else []
+
+    def to_yaml(self, key: str = "nav") -> str:
+        """
+        Bloco 'key:' com o nav em YAML, gerado direto das tabelas (sem montar as
+        listas/dicts), no mesmo formato do ruamel: listas sem indentação extra sob a chave.
+        """
+        keys, values = self._key, self._values
+        # cada chave é tratada uma vez só
+        quoted = [_quote(text) for text in self._strings]
+        lines = [f"{_quote(key)}:" + ("" if self else " []")]
+        stack = [("", child) for child in reversed(list(self._children(_ROOT)))]
+        while stack:
+            indent, node = stack.pop()
+            value = values[node]
+            if keys[node] == _NO_KEY:
+                lines.append(f"{indent}- {_quote(value)}")
+                continue
+            item = f"{indent}- {quoted[keys[node]]}:"
+            if value is _SECTION:
+                children = list(self._children(node))
+                if not children:
+                    item += " []"
+                stack.extend((indent + "  ", child) for child in reversed(children))
+            elif value is not None:
+                item += f" {_quote(value)}"
+            lines.append(item)
+        return "\n".join(lines) + "\n"
+
+    @property
+    def nav(self) -> "CompactNav":
+        return self
+
+    @property
+    def root(self) -> NavNode:
+        return NavNode(self, _ROOT)
+
+    def __len__(self) -> int:
+        """Quantidade de itens do primeiro nível, como len() da lista nav."""
+        return len(self.root)
+
+    def __bool__(self) -> bool:
+        return self._first[_ROOT] != _NONE
+
+    def __repr__(self) -> str:
+        return f"CompactNav({len(self._values) - 1} linhas, {len(self._strings)} chaves)"
+
+    def subscribe(self, callback) -> None:
+        """Registra callback(event: NavEvent), chamado a cada alteração."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def reindex(self) -> None:
+        """Descarta os índices das pastas; serão reconstruídos sob demanda."""
+        self._levels.clear()
+
+    def index_all(self) -> "CompactNav":
+        return self
+
+    def entries(self):
+        """(caminho, arquivo) de cada item na ordem do documento; arquivo = None para pastas."""
+        strings, keys, values = self._strings, self._key, self._values
+        stack = [("", child) for child in reversed(list(self._children(_ROOT)))]
+        while stack:
+            prefix, node = stack.pop()
+            if keys[node] == _NO_KEY:
+                continue
+            key = strings[keys[node]]
+            path = f"{prefix}.{key}" if prefix else key
+            value = values[node]
+            if value is _SECTION:
+                yield path, None
+                stack.extend((path, child) for child in reversed(list(self._children(node))))
+            else:
+                yield path, value
+
+    def paths(self) -> list[str]:
+        """Todos os caminhos pontuados da árvore, na ordem do documento."""
+        return [path for path, _ in self.entries()]
+
+    def __contains__(self, path: str) -> bool:
+        return self._resolve(path) != _NONE
+
+    def position(self, path: str) -> int:
+        """Posição do item na lista do pai, ou -1 se ele não existir."""
+        node = self._resolve(path)
+        return self._position(node) if node != _NONE else -1
+
+    def get(self, path: str) -> None | str | list:
+        node = self._resolve(path)
+        if node == _NONE:
+            return None
+        value = self._values[node]
+        return self._materialize(node) if value is _SECTION else value
+
+    def add(self, path: str, file_path: str) -> "CompactNav":
+        """Adiciona um item ao nav, criando as pastas que faltarem."""
+        keys = path.split('.')
+        current = _ROOT
+        # primeiro item criado/alterado no caminho: é o único que gera evento
+        event = None
+
+        for i, key in enumerate(keys):
+            prefix = '.'.join(keys[:i + 1])
+            last = i == len(keys) - 1
+            found = self._child(current, key)
+
+            if found != _NONE:
+                if not last:
+                    # documento no meio do caminho vira pasta
+                    if self._values[found] is not _SECTION:
+                        self._values[found] = _SECTION
+                        event = event or (_NavUpdated, prefix, found)
+                else:
+                    self._set_value(found, file_path)
+                    event = event or (_NavUpdated, prefix, found)
+            else:
+                found = self._new(current, self._intern(key), file_path if last else _SECTION)
+                event = event or (_NavAdded, prefix, found)
+            current = found
+
+        if event:
+            event_type, event_path, node = event
+            self._emit(event_type, event_path, node)
+        return self
+
+    def remove(self, path: str) -> "CompactNav":
+        """Remove o item (e seus filhos) e as pastas que ficarem vazias acima dele."""
+        keys = path.split('.')
+        current = _ROOT
+        stack = []
+        for i, key in enumerate(keys):
+            found = self._child(current, key)
+            if found == _NONE:
+                return self
+            stack.append((found, '.'.join(keys[:i + 1])))
+            if self._values[found] is not _SECTION:
+                break
+            current = found
+        node, removed = stack.pop()
+        position = self._detach(node)
+        self._forget(node)
+        while stack:
+            node, prefix = stack.pop()
+            if self._values[node] is not _SECTION or self._first[node] != _NONE:
+                break
+            position = self._detach(node)
+            self._levels.pop(node, None)
+            removed = prefix
+        # um só evento, para o nível mais alto que saiu da árvore
+        self._emit(_NavRemoved, removed, position=position)
+        return self
+
+    def update(self, path: str, new_file) -> bool:
+        """Troca o valor de um item existente (um arquivo, ou uma lista no formato do nav)."""
+        node = self._resolve(path)
+        if node == _NONE:
+            return False
+        self._set_value(node, new_file)
+        self._emit(_NavUpdated, path, node)
+        return True
+
+    def rename(self, path: str, new_key: str) -> bool:
+        """
+        Troca a chave do item em 'path' por 'new_key', mantendo a posição e os filhos.
+        Retorna False se o item não existir ou se já houver um irmão com a nova chave.
+        """
+        node = self._resolve(path)
+        if node == _NONE:
+            return False
+        key = self._strings[self._key[node]]
+        if new_key == key:
+            return True
+        parent = self._parent[node]
+        if self._child(parent, new_key) != _NONE:
+            return False
+        self._unindex_child(parent, node)
+        self._key[node] = self._intern(new_key)
+        self._index_child(parent, node)
+        if self._listeners:
+            prefix = path.rpartition('.')[0]
+            position = self._position(node)
+            self._emit(_NavMoved, f"{prefix}.{new_key}" if prefix else new_key, position=position,
+                       old_path=path, old_parent=prefix, old_position=position)
+        return True
+
+    def move(self, path: str, new_path: str, retarget=None) -> bool:
+        """
+        Move o item em 'path' (com todos os filhos) para 'new_path', como em
+        NavTree.move(). A subárvore não é copiada: só as ligações do item mudam.
+        """
+        if new_path == path:
+            return path in self
+        node = self._resolve(path)
+        if node == _NONE or new_path.startswith(path + '.') or self._resolve(new_path) != _NONE:
+            return False
+        old_parent = path.rpartition('.')[0]
+        new_parent, _, new_key = new_path.rpartition('.')
+        if new_parent == old_parent:
+            if retarget:
+                self._retarget(node, retarget)
+            return self.rename(path, new_key)
+
+        target, created = self._make_level(new_parent)
+        if target == _NONE:
+            return False
+        if retarget:
+            self._retarget(node, retarget)
+        old_position = self._detach(node)
+        self._key[node] = self._intern(new_key)
+        self._link(target, node)
+        emptied = self._prune(old_parent)
+
+        if created:
+            self._emit(_NavAdded, created, position=self.position(created))
+        self._emit(_NavMoved, new_path, node, old_path=path, old_parent=old_parent, old_position=old_position)
+        if emptied:
+            path, position = emptied
+            self._emit(_NavRemoved, path, position=position)
+        return True
+
+    def organize(self, paths=None) -> "CompactNav":
+        """organize_nav_indexes() sobre a tabela: as pastas em 'paths' (None = todas)."""
+        if paths is None:
+            for child in list(self._children(_ROOT)):
+                if self._key[child] != _NO_KEY and self._values[child] is _SECTION:
+                    self._organize_folder(child)
+            return self
+        for path in dict.fromkeys(paths):
+            node = self._resolve(path)
+            if node != _NONE and self._values[node] is _SECTION:
+                self._organize_folder(node)
+        return self
+
+    # Internos
+
+    def _intern(self, key: str) -> int:
+        key_id = self._string_ids.get(key)
+        if key_id is None:
+            key_id = len(self._strings)
+            self._strings.append(_sys.intern(key))
+            self._string_ids[key] = key_id
+        return key_id
+
+    def _new(self, parent: int, key: int, value) -> int:
+        node = len(self._values)
+        self._parent.append(_NONE)
+        self._first.append(_NONE)
+        self._last.append(_NONE)
+        self._next.append(_NONE)
+        self._prev.append(_NONE)
+        self._key.append(key)
+        self._values.append(value)
+        self._link(parent, node)
+        return node
+
+    def _extend(self, parent: int, level: list) -> None:
+        """Acrescenta os itens de 'level' (formato do nav) como filhos de 'parent'."""
+        # os filhos entram sempre no fim do pai, então a ordem da pilha não importa
+        stack = [(parent, level)]
+        while stack:
+            parent, level = stack.pop()
+            for item in level:
+                if isinstance(item, dict):
+                    for key, value in item.items():
+                        if isinstance(value, list):
+                            stack.append((self._new(parent, self._intern(str(key)), _SECTION), value))
+                        else:
+                            self._new(parent, self._intern(str(key)), _scalar(value))
+                elif item is not None and not isinstance(item, list):
+                    self._new(parent, _NO_KEY, _scalar(item))
+
+    def _materialize(self, node: int) -> list:
+        nav = []
+        stack = [(node, nav)]
+        while stack:
+            parent, level = stack.pop()
+            for child in self._children(parent):
+                value = self._values[child]
+                if value is _SECTION:
+                    value = []
+                    stack.append((child, value))
+                key = self._key[child]
+                level.append(value if key == _NO_KEY else {self._strings[key]: value})
+        return nav
+
+    def _children(self, node: int):
+        child = self._first[node]
+        following = self._next
+        while child != _NONE:
+            yield child
+            child = following[child]
+
+    def _level(self, parent: int) -> dict[int, int]:
+        level = self._levels.get(parent)
+        if level is None:
+            level = {}
+            for child in self._children(parent):
+                key = self._key[child]
+                if key != _NO_KEY:
+                    # mantém a primeira ocorrência, como na busca linear
+                    level.setdefault(key, child)
+            if _profiling.active:
+                _profiling.count("nav.nodes", len(level))
+            self._levels[parent] = level
+        return level
+
+    def _child(self, parent: int, key: str) -> int:
+        if _profiling.active:
+            _profiling.count("nav.nodes")
+        key_id = self._string_ids.get(key)
+        if key_id is None or self._values[parent] is not _SECTION:
+            return _NONE
+        return self._level(parent).get(key_id, _NONE)
+
+    def _resolve(self, path: str) -> int:
+        node = _ROOT
+        for key in path.split('.'):
+            node = self._child(node, key)
+            if node == _NONE:
+                return _NONE
+        return node
+
+    def _position(self, node: int) -> int:
+        position = 0
+        previous = self._prev
+        node = previous[node]
+        while node != _NONE:
+            position += 1
+            node = previous[node]
+        return position
+
+    def _link(self, parent: int, node: int) -> None:
+        """Coloca 'node' como último filho de 'parent'."""
+        last = self._last[parent]
+        self._parent[node] = parent
+        self._prev[node] = last
+        self._next[node] = _NONE
+        if last == _NONE:
+            self._first[parent] = node
+        else:
+            self._next[last] = node
+        self._last[parent] = node
+        level = self._levels.get(parent)
+        if level is not None and self._key[node] != _NO_KEY:
+            # no fim da lista: só vale se a chave ainda não existia
+            level.setdefault(self._key[node], node)
+
+    def _detach(self, node: int) -> int:
+        """Tira 'node' (com a subárvore) da lista do pai; retorna a posição que ele ocupava."""
+        parent = self._parent[node]
+        position = self._position(node)
+        previous, following = self._prev[node], self._next[node]
+        if previous == _NONE:
+            self._first[parent] = following
+        else:
+            self._next[previous] = following
+        if following == _NONE:
+            self._last[parent] = previous
+        else:
+            self._prev[following] = previous
+        self._parent[node] = self._prev[node] = self._next[node] = _NONE
+        self._unindex_child(parent, node)
+        return position
+
+    def _index_child(self, parent: int, node: int) -> None:
+        level = self._levels.get(parent)
+        key = self._key[node]
+        if level is not None and key != _NO_KEY:
+            current = level.get(key)
+            # só vale a primeira ocorrência da chave na ordem da lista
+            if current is None or (current != node and self._position(node) < self._position(current)):
+                level[key] = node
+
+    def _unindex_child(self, parent: int, node: int) -> None:
+        level = self._levels.get(parent)
+        key = self._key[node]
+        if level is None or level.get(key) != node:
+            return
+        del level[key]
+        # outra ocorrência da mesma chave passa a ser a primeira
+        for child in self._children(parent):
+            if child != node and self._key[child] == key:
+                level[key] = child
+                break
+
+    def _forget(self, node: int) -> None:
+        """Descarta os índices das pastas da subárvore de 'node' (que saiu da árvore)."""
+        if not self._levels:
+            return
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._levels.pop(current, None)
+            stack.extend(self._children(current))
+
+    def _set_value(self, node: int, value) -> None:
+        for child in list(self._children(node)):
+            self._detach(child)
+            self._forget(child)
+        if isinstance(value, list):
+            self._values[node] = _SECTION
+            self._extend(node, value)
+        else:
+            self._values[node] = _scalar(value)
+
+    def _make_level(self, path: str) -> tuple[int, str | None]:
+        """Linha da pasta 'path', criando as que faltarem; (_NONE, None) se passar por um documento."""
+        current = _ROOT
+        created = None
+        keys = path.split('.') if path else []
+        for i, key in enumerate(keys):
+            found = self._child(current, key)
+            if found == _NONE:
+                found = self._new(current, self._intern(key), _SECTION)
+                created = created or '.'.join(keys[:i + 1])
+            elif self._values[found] is not _SECTION:
+                return _NONE, None
+            current = found
+        return current, created
+
+    def _prune(self, path: str) -> tuple[str, int] | None:
+        """Remove 'path' e os pais que ficaram vazios; retorna (caminho mais alto removido, posição)."""
+        emptied = None
+        while path:
+            node = self._resolve(path)
+            if node == _NONE or self._values[node] is not _SECTION or self._first[node] != _NONE:
+                break
+            emptied = (path, self._detach(node))
+            path = path.rpartition('.')[0]
+        return emptied
+
+    def _retarget(self, node: int, retarget) -> None:
+        """Aplica retarget a todos os arquivos da subárvore de 'node'."""
+        values = self._values
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            value = values[current]
+            if value is _SECTION:
+                stack.extend(self._children(current))
+            elif isinstance(value, str):
+                values[current] = retarget(value)
+
+    def _organize_folder(self, folder: int) -> None:
+        """Mesma regra de navtree._organize_folder: index da pasta primeiro, depois o resto."""
+        key = self._key[folder]
+        dir_index = _NONE
+        indexes = []
+        others = []
+        children = list(self._children(folder))
+        for child in children:
+            value = self._values[child]
+            if value is _SECTION:
+                self._organize_folder(child)
+            elif _is_index(value):
+                if self._key[child] == _NO_KEY:
+                    indexes.append(child)
+                    continue
+                if self._key[child] == key:
+                    if dir_index == _NONE:
+                        dir_index = child
+                    else:
+                        indexes.append(child)
+                    continue
+            others.append(child)
+
+        order = ([dir_index] if dir_index != _NONE else indexes) + others
+        if order == children:
+            return
+        for child in children:
+            self._parent[child] = self._prev[child] = self._next[child] = _NONE
+        self._first[folder] = self._last[folder] = _NONE
+        self._levels.pop(folder, None)
+        for child in order:
+            self._link(folder, child)
+        for child in set(children) - set(order):
+            self._forget(child)
+
+    def _emit(self, event_type, path: str, node: int = _NONE, position: int | None = None, **extra) -> None:
+        if not self._listeners:
+            return
+        if position is None:
+            position = self._position(node)
+        event = event_type(path=path, parent=path.rpartition('.')[0], position=position, **extra)
+        for listener in list(self._listeners):
+            listener(event)
+
+
+def _quote(text: str) -> str:
+    if _PLAIN.fullmatch(text) and text.lower() not in _RESERVED:
+        return text
+    return _json.dumps(text, ensure_ascii=False)
+
+def _scalar(value):
+    return value if value is None or isinstance(value, str) else str(value)
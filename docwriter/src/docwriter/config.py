@@ -1,8 +1,41 @@
-from dotenv import load_dotenv as _load_dotenv
 import os as _os
 
-_load_dotenv()
+_loaded = False
 
-MKDOCS_DOC_ROOT_PATH = _os.getenv("MKDOCS_DOC_ROOT_PATH")
-MKDOCS_CONFIG_PATH = _os.getenv("MKDOCS_CONFIG_PATH")
-DEFAULT_TEXT_FOR_NEW_SECTIONS = _os.getenv("DEFAULT_TEXT_FOR_NEW_SECTIONS")
\ No newline at end of file
+# Nome da variável -> conversão do valor lido do ambiente/.env
+_SETTINGS = {
+    "MKDOCS_DOC_ROOT_PATH": lambda value: value,
+    "MKDOCS_CONFIG_PATH": lambda value: value,
+    "DEFAULT_TEXT_FOR_NEW_SECTIONS": lambda value: value,
+    # Quantidade de backups rotacionados do arquivo de configuração (0 desativa)
+    "MKDOCS_CONFIG_BACKUPS": lambda value: int(value or 1),
+    # Como os documentos são colocados na pasta docs: copy, reflink, hardlink, symlink ou cas
+    "MKDOCS_PLACEMENT": lambda value: value or "copy",
+    # Pasta com um arquivo por seção do nav; vazio mantém o nav dentro do mkdocs.yml
+    "MKDOCS_NAV_DIR": lambda value: value or None,
+    # Nav em memória na forma compacta (compact.py), para sites com 100k+ itens
+    "MKDOCS_COMPACT_NAV": lambda value: (value or "").strip().lower() in ("1", "true", "yes"),
+    # Segundos de espera pela trava do arquivo de configuração quando outro processo está gravando
+    "MKDOCS_LOCK_TIMEOUT": lambda value: float(value or 30),
+    # Alterações do nav acrescentadas a um diário ao lado do mkdocs.yml (journal.py) em vez de regravá-lo
+    "MKDOCS_JOURNAL": lambda value: (value or "").strip().lower() in ("1", "true", "yes"),
+    # Operações no diário que disparam a compactação (0 = só sob demanda)
+    "MKDOCS_JOURNAL_LIMIT": lambda value: int(value or 500),
+    # Detalhamento de tempos de cada operação: 1 = saída de erro, ou um arquivo; vazio desliga
+    "DOCWRITER_PROFILE": lambda value: value or None,
+}
+
+
+def __getattr__(name: str):
+    """
+    As configurações são lidas no primeiro acesso (e o .env carregado nesse
+    momento), não na importação do módulo.
+    """
+    if name not in _SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    global _loaded
+    if not _loaded:
+        from dotenv import load_dotenv as _load_dotenv
+        _load_dotenv()
+        _loaded = True
+    return _SETTINGS[name](_os.getenv(name))
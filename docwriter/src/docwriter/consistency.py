@@ -0,0 +1,117 @@
+"""
+Comparação entre os documentos da pasta docs e os arquivos referenciados no nav.
+
+A pasta é lida uma vez (os.scandir, uma thread por seção do primeiro nível) e
+os dois lados viram conjuntos, então a diferença sai em O(n). A mesma leitura
+também dá as pastas (scan_tree), usadas por Project.index_all_folders().
+"""
+import os as _os
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from dataclasses import dataclass as _dataclass
+from docwriter.exceptions import MkdocsUtilsError as _MkdocsUtilsError
+from docwriter.navtree import nav_tree as _nav_tree
+from docwriter.utils import yamlpath_to_filepath as _yamlpath_to_filepath
+
+
+@_dataclass(frozen=True)
+class Drift:
+    """
+    Diferenças entre a pasta docs e o nav.
+    orphans = documentos da pasta que não estão no nav
+    missing = (caminho no nav, arquivo) cujo arquivo não existe na pasta
+    """
+    orphans: tuple[str, ...] = ()
+    missing: tuple[tuple[str, str], ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.orphans or self.missing)
+
+
+def scan_docs(root: str, workers: int | None = None) -> set[str]:
+    """
+    Documentos .md da pasta 'root', relativos a ela e separados por '/'.
+    Pastas e arquivos ocultos são ignorados; cada seção do primeiro nível é
+    lida em uma thread ('workers' = máximo de threads, None = padrão do executor).
+    """
+    return scan_tree(root, workers)[0]
+
+def scan_tree(root: str, workers: int | None = None) -> tuple[set[str], set[str]]:
+    """(documentos .md, pastas) de 'root' na mesma leitura de scan_docs(), relativos a ela."""
+    files, folders, sections = set(), set(), []
+    try:
+        with _os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    sections.append(entry.name)
+                elif _is_document(entry.name):
+                    files.add(entry.name)
+    except FileNotFoundError:
+        return files, folders
+
+    if workers == 1 or len(sections) < 2:
+        found = [_scan_section(root, section) for section in sections]
+    else:
+        with _ThreadPoolExecutor(max_workers=workers) as executor:
+            found = list(executor.map(lambda section: _scan_section(root, section), sections))
+    for section_files, section_folders in found:
+        files.update(section_files)
+        folders.update(section_folders)
+    return files, folders
+
+def nav_files(nav: list) -> dict[str, list[str]]:
+    """Arquivo .md referenciado no nav -> caminhos do nav que apontam para ele."""
+    files: dict[str, list[str]] = {}
+    for path, value in _nav_tree(nav).entries():
+        if isinstance(value, str) and _is_document(value) and "://" not in value:
+            files.setdefault(value, []).append(path)
+    return files
+
+def compare(files: set[str], referenced: dict[str, list[str]]) -> Drift:
+    """Drift entre os documentos da pasta (scan_docs) e os do nav (nav_files)."""
+    orphans = sorted(rel for rel in files if rel not in referenced)
+    missing = sorted((path, rel) for rel, paths in referenced.items() if rel not in files for path in paths)
+    return Drift(tuple(orphans), tuple(missing))
+
+def yaml_path_for(rel: str) -> str | None:
+    """
+    Caminho no nav que o docwriter usaria para o documento 'rel' (o inverso de
+    yamlpath_to_filepath): Pasta/Doc/arquivo.md -> Pasta.Doc e
+    Pasta/index.md -> Pasta.Pasta. None se não houver um caminho equivalente.
+    """
+    folders, _, name = rel.rpartition("/")
+    if not folders or any('.' in key for key in folders.split("/")):
+        return None
+    keys = folders.split("/")
+    if name == "index.md":
+        keys.append(keys[-1])
+    yaml_path = ".".join(keys)
+    try:
+        if _yamlpath_to_filepath(yaml_path, name) != rel:
+            return None
+    except _MkdocsUtilsError:
+        return None
+    return yaml_path
+
+def _scan_section(root: str, section: str) -> tuple[list[str], list[str]]:
+    found, folders = [], []
+    stack = [section]
+    while stack:
+        rel = stack.pop()
+        try:
+            with _os.scandir(_os.path.join(root, *rel.split("/"))) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(f"{rel}/{entry.name}")
+                    elif _is_document(entry.name):
+                        found.append(f"{rel}/{entry.name}")
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        folders.append(rel)
+    return found, folders
+
+def _is_document(name: str) -> bool:
+    return name.lower().endswith(".md")
@@ -1,5 +1,3 @@
-from docwriter.config import MKDOCS_CONFIG_PATH
-
 class MkdocsUtilsError(Exception):
     """Base exception for utils package exceptions"""
     pass
@@ -29,4 +27,30 @@ class DocumentNotFoundError(FileNotFoundError):
 class MkdocsFileNotFoundError(ConfigFileNotFoundError):
     """Raised when MkDocs configuration file is not found."""
     def __init__(self, message: str = ""):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class JobCancelledError(Exception):
+    """Raised inside a background job when the user cancels it."""
+    def __init__(self, message: str = "Operação cancelada."):
+        super().__init__(message)
+
+class MkdocsConcurrencyError(MkdocsIndexingWriteError):
+    """Base for write failures caused by another process writing the same configuration."""
+    pass
+
+class MkdocsLockTimeoutError(MkdocsConcurrencyError):
+    """Raised when the configuration file lock is held by another process for too long."""
+    def __init__(self, path: str = ""):
+        self.path = path
+        super().__init__(f"O arquivo de configuração {path} está travado por outro processo; tente novamente.")
+
+class MkdocsConflictError(MkdocsConcurrencyError):
+    """Raised when the nav changed on disk and the pending changes could not be merged."""
+    def __init__(self, conflicts=()):
+        self.conflicts = tuple(conflicts)
+        if not self.conflicts:
+            super().__init__("O arquivo de configuração foi alterado por outro processo e não pôde ser combinado.")
+            return
+        paths = ", ".join(conflict.path for conflict in self.conflicts[:5])
+        more = f" e mais {len(self.conflicts) - 5}" if len(self.conflicts) > 5 else ""
+        super().__init__(f"O nav foi alterado por outro processo e as alterações conflitam em: {paths}{more}.")
@@ -0,0 +1,143 @@
+"""
+Fila de tarefas em segundo plano da interface.
+
+Toda leitura/escrita do YAML e dos documentos feita pela janela passa por aqui:
+as tarefas rodam em uma única thread (QThreadPool com maxThreadCount=1), na ordem
+em que foram enviadas, então duas escritas nunca disputam o mesmo arquivo e
+nenhuma leitura vê o nav no meio de uma alteração. Os resultados voltam para a
+thread da interface pelos sinais do Qt.
+"""
+import threading as _threading
+from PySide6.QtCore import QObject as _QObject, QRunnable as _QRunnable, QThreadPool as _QThreadPool, Signal as _Signal
+from docwriter import profiling as _profiling
+from docwriter.exceptions import JobCancelledError as _JobCancelledError
+
+
+class _JobSignals(_QObject):
+    progress = _Signal(int, int)
+    finished = _Signal(object)
+    failed = _Signal(object)
+    cancelled = _Signal()
+    # emitido sempre por último, depois de finished/failed/cancelled
+    done = _Signal()
+
+
+class Job(_QRunnable):
+    """
+    Uma chamada de função executada na fila.
+
+    Com progress=True a função recebe progress=callback(feitos, total); depois de
+    cancel() a próxima chamada desse callback levanta JobCancelledError, o que
+    desfaz a transação em andamento. Uma tarefa cancelada antes de começar não roda.
+    Com profile=True os tempos da execução ficam em 'report' (profiling.Report).
+    """
+
+    def __init__(self, function, args=(), kwargs=None, label: str = "", progress: bool = False,
+                 profile: bool = False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.label = label
+        self.with_progress = progress
+        self.profile = profile
+        self.report: _profiling.Report | None = None
+        self.signals = _JobSignals()
+        self._cancel = _threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def report_progress(self, done: int, total: int) -> None:
+        if self._cancel.is_set():
+            raise _JobCancelledError()
+        self.signals.progress.emit(done, total)
+
+    def run(self) -> None:
+        try:
+            if self._cancel.is_set():
+                raise _JobCancelledError()
+            kwargs = dict(self.kwargs)
+            if self.with_progress:
+                kwargs['progress'] = self.report_progress
+            if self.profile:
+                with _profiling.profile() as self.report:
+                    result = self.function(*self.args, **kwargs)
+            else:
+                result = self.function(*self.args, **kwargs)
+        except _JobCancelledError:
+            self.signals.cancelled.emit()
+        except Exception as ex:
+            self.signals.failed.emit(ex)
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class JobRunner(_QObject):
+    """
+    Envia tarefas para a fila e acompanha as que ainda não terminaram.
+
+        runner.submit(core.index, "Pasta.Doc", "C:/docs/doc.md", label="Adicionando",
+                      on_done=mostrar_resultado, on_error=mostrar_erro)
+
+    on_done(resultado) e on_error(exceção) rodam na thread da interface. Tarefas sem
+    'label' (leituras de rotina) não acionam jobStarted/jobProgress.
+    """
+    jobStarted = _Signal(object)
+    jobProgress = _Signal(object, int, int)
+    jobCancelled = _Signal(object)
+    idle = _Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = _QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._jobs: list[Job] = []
+
+    @property
+    def busy(self) -> bool:
+        return any(job.label for job in self._jobs)
+
+    def submit(self, function, *args, label: str = "", progress: bool = False, profile: bool = False,
+               on_done=None, on_error=None, **kwargs) -> Job:
+        job = Job(function, args, kwargs, label, progress, profile)
+        if on_done:
+            job.signals.finished.connect(on_done)
+        if on_error:
+            job.signals.failed.connect(on_error)
+        job.signals.cancelled.connect(lambda: self.jobCancelled.emit(job))
+        if label:
+            job.signals.progress.connect(lambda done, total: self.jobProgress.emit(job, done, total))
+        job.signals.done.connect(lambda: self._finish(job))
+        self._jobs.append(job)
+        if label:
+            self.jobStarted.emit(job)
+        self._pool.start(job)
+        return job
+
+    def cancel(self) -> None:
+        """Cancela a tarefa em andamento (se ela aceitar progresso) e todas as da fila."""
+        for job in self._jobs:
+            job.cancel()
+
+    def cancel_reads(self) -> None:
+        """Cancela só as tarefas sem 'label' (leituras de rotina); as alterações já enviadas terminam."""
+        for job in self._jobs:
+            if not job.label:
+                job.cancel()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Bloqueia até a fila esvaziar; usado ao fechar a janela."""
+        return self._pool.waitForDone(msecs)
+
+    def _finish(self, job: Job) -> None:
+        self._jobs.remove(job)
+        if job.label and not self.busy:
+            self.idle.emit()
@@ -0,0 +1,333 @@
+"""
+Diário de operações do nav (MKDOCS_JOURNAL=1).
+
+Em vez de regravar o arquivo de configuração a cada alteração, cada transação
+acrescenta uma linha JSON a "<mkdocs.yml>.journal", ao lado dele, com as
+operações feitas no nav:
+
+    {"journal": 1, "generation": "9f2c..."}
+    {"seq": 1, "time": 1718000000.0, "ops": [["add", "A.B", "A/B/b.md"]], "removals": []}
+    {"seq": 2, "time": 1718000004.2, "ops": [["move", "A.B", "C.B", "A/B", "C/B"]], "removals": []}
+    {"undo": 2}
+
+O nav em uso é sempre o do arquivo de configuração com as entradas do diário
+reaplicadas, na ordem (replay()). A compactação (Project.compact_journal)
+grava esse nav com uma única escrita e recomeça o diário com outra geração.
+
+Cada linha é gravada com fsync antes da transação terminar: depois de uma queda,
+as entradas completas continuam valendo e uma última linha cortada ao meio é
+ignorada (e descartada na próxima gravação). Uma entrada desfeita ({"undo": seq})
+deixa de ser reaplicada.
+
+Reaplicar uma entrada sobre um nav que já a tem não dá o mesmo nav (um add
+seguido de move cria o item de novo na origem), então a compactação grava na
+primeira linha do arquivo de configuração até onde o diário já está nele:
+
+    # docwriter-journal: 9f2c... 2
+
+Se a compactação for interrompida entre essa gravação e o recomeço do diário,
+as entradas da mesma geração com seq até esse valor não são reaplicadas
+(Journal.included()); a próxima compactação só faz as remoções e recomeça o diário.
+
+As gravações devem ser feitas com a trava do arquivo de configuração (locking).
+"""
+import json as _json
+import os as _os
+import re as _re
+import time as _time
+import uuid as _uuid
+from docwriter import profiling as _profiling
+from docwriter.navtree import Retarget as _Retarget, organize_nav_indexes as _organize_nav_indexes
+from docwriter.yaml_io import _atomic_write
+
+# Sufixo do diário, acrescentado ao nome do arquivo de configuração
+JOURNAL_SUFFIX = ".journal"
+
+_VERSION = 1
+# Marca gravada na primeira linha do arquivo de configuração pela compactação (ver mark())
+_MARK = _re.compile(r"# docwriter-journal: ([0-9a-f]+) (\d+)\r?\n")
+
+
+class Recorder:
+    """
+    Árvore do nav (NavTree ou CompactNav) que anota em 'ops' cada alteração
+    bem-sucedida, no formato do diário. As outras chamadas passam direto.
+    """
+
+    def __init__(self, tree, ops: list | None = None):
+        self.tree = tree
+        self.ops = [] if ops is None else ops
+
+    def __getattr__(self, name: str):
+        return getattr(self.tree, name)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.tree
+
+    def add(self, path: str, file_path: str):
+        result = self.tree.add(path, file_path)
+        self.ops.append(["add", path, str(file_path)])
+        return result
+
+    def remove(self, path: str):
+        result = self.tree.remove(path)
+        self.ops.append(["remove", path])
+        return result
+
+    def update(self, path: str, new_file) -> bool:
+        if not self.tree.update(path, new_file):
+            return False
+        self.ops.append(["update", path, _plain(new_file)])
+        return True
+
+    def rename(self, path: str, new_key: str) -> bool:
+        if not self.tree.rename(path, new_key):
+            return False
+        self.ops.append(["rename", path, new_key])
+        return True
+
+    def move(self, path: str, new_path: str, retarget=None) -> bool:
+        if not self.tree.move(path, new_path, retarget):
+            return False
+        if isinstance(retarget, _Retarget):
+            self.ops.append(["move", path, new_path, retarget.old_dir, retarget.new_dir])
+        else:
+            self.ops.append(["move", path, new_path, None, None])
+        return True
+
+    def organize(self, paths) -> None:
+        paths = list(dict.fromkeys(paths))
+        _organize_nav_indexes(self.tree.nav, paths)
+        self.ops.append(["organize", paths])
+
+
+class Journal:
+    """
+    O arquivo do diário de um arquivo de configuração e as entradas já lidas dele.
+
+        journal = Journal("mkdocs.yml")
+        journal.read()
+        journal.included()
+        replay(NavTree(nav), journal.entries())
+
+    read() só lê o que foi acrescentado desde a leitura anterior.
+    """
+
+    def __init__(self, config_path: str):
+        self.config_path = _os.path.abspath(config_path)
+        folder, name = _os.path.split(self.config_path)
+        self.path = _os.path.join(folder, name + JOURNAL_SUFFIX)
+        # registros da geração atual, na ordem do arquivo
+        self.records: list[dict] = []
+        self.generation: str | None = None
+        # último seq que o arquivo de configuração já contém (ver included())
+        self.compacted = 0
+        # nav em memória com as entradas já aplicadas (mantido por Project._catch_up)
+        self.nav = None
+        # fim do último registro completo e o stat do arquivo nesse ponto
+        self._offset = 0
+        self._stamp: tuple[int, int, int] | None = None
+        self._seq = 0
+
+    def stale(self) -> bool:
+        """True se o arquivo mudou (outro processo gravou ou compactou) desde a última leitura/gravação."""
+        return _stat(self.path) != self._stamp
+
+    def read(self) -> tuple[list[dict], bool]:
+        """
+        Registros acrescentados desde a leitura anterior. reset=True quando o diário
+        foi trocado (compactação, arquivo apagado): 'records' recomeçou e o que já
+        tinha sido aplicado não vale mais.
+        """
+        stamp = _stat(self.path)
+        if stamp == self._stamp:
+            return [], False
+        with _profiling.span("journal.read"):
+            return self._read(stamp)
+
+    def _read(self, stamp) -> tuple[list[dict], bool]:
+        if stamp is None:
+            reset = self.generation is not None
+            self._restart(None, 0, None)
+            return [], reset
+        new = []
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            generation = _generation(header)
+            reset = generation != self.generation
+            if generation is None:
+                # cabeçalho ilegível: o diário é tratado como vazio
+                self._restart(None, 0, stamp)
+                return [], reset
+            if reset:
+                self._restart(generation, len(header), stamp)
+            else:
+                f.seek(self._offset)
+            offset = self._offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = _json.loads(line)
+                except ValueError:
+                    # linha cortada por uma queda durante a gravação: o resto é descartado
+                    break
+                new.append(record)
+                offset += len(line)
+                self._seq = max(self._seq, record.get("seq", 0))
+        self.records.extend(new)
+        self._offset = offset
+        self._stamp = stamp
+        return new, reset
+
+    def included(self) -> int:
+        """
+        Relê a marca do arquivo de configuração: último seq desta geração que ele
+        já contém (compactação interrompida antes de recomeçar o diário), ou 0.
+        Chamar sempre que o nav do arquivo for lido de novo.
+        """
+        try:
+            with open(self.config_path, "rb") as f:
+                line = f.readline(256).decode("utf-8", "replace")
+        except FileNotFoundError:
+            line = ""
+        found = _MARK.fullmatch(line)
+        self.compacted = int(found[2]) if found and found[1] == self.generation else 0
+        return self.compacted
+
+    def entries(self, compacted: bool = False) -> list[dict]:
+        """
+        Entradas de operações que ainda valem (sem as desfeitas), na ordem; sem as
+        que o arquivo de configuração já contém, a não ser com compacted=True.
+        """
+        undone = {record["undo"] for record in self.records if "undo" in record}
+        start = 0 if compacted else self.compacted
+        return [record for record in self.records
+                if "ops" in record and record["seq"] not in undone and record["seq"] > start]
+
+    def pending(self) -> int:
+        """Quantidade de operações que a próxima compactação vai gravar."""
+        return sum(len(entry["ops"]) for entry in self.entries())
+
+    def write_entry(self, ops: list, removals=()) -> int:
+        """
+        Acrescenta uma entrada com as operações de uma transação e as remoções de
+        arquivos que ela adiou (yaml_path, file_path). Retorna o seq da entrada.
+        """
+        if self.generation is None:
+            # o diário é criado antes: reset() recomeça a contagem do seq
+            self.reset()
+        self._seq += 1
+        self._append({"seq": self._seq, "time": round(_time.time(), 3), "ops": ops,
+                      "removals": [list(removal) for removal in removals]})
+        return self._seq
+
+    def write_undo(self, seq: int) -> None:
+        """Marca a entrada 'seq' como desfeita."""
+        self._append({"undo": seq})
+
+    def reset(self) -> None:
+        """Recomeça o diário vazio, com outra geração (troca atômica do arquivo)."""
+        generation = _uuid.uuid4().hex
+        header = _json.dumps({"journal": _VERSION, "generation": generation}) + "\n"
+        _atomic_write(self.path, lambda f: f.write(header), 0, newline="")
+        self._restart(generation, len(header.encode()), _stat(self.path))
+
+    def _append(self, record: dict) -> None:
+        """Grava 'record' depois do último registro completo; chamar com a trava e logo depois de read()."""
+        if self.generation is None:
+            self.reset()
+        line = (_json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        with _profiling.span("journal.append"):
+            fd = _os.open(self.path, _os.O_WRONLY | getattr(_os, "O_BINARY", 0))
+            try:
+                if _os.fstat(fd).st_size != self._offset:
+                    # sobra de uma gravação interrompida
+                    _os.ftruncate(fd, self._offset)
+                _os.lseek(fd, self._offset, _os.SEEK_SET)
+                view = memoryview(line)
+                while view:
+                    view = view[_os.write(fd, view):]
+                _os.fsync(fd)
+                stat = _os.fstat(fd)
+            finally:
+                _os.close(fd)
+        self.records.append(record)
+        self._offset += len(line)
+        self._stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _restart(self, generation: str | None, offset: int, stamp) -> None:
+        self.records = []
+        self.generation = generation
+        self.compacted = 0
+        self._offset = offset
+        self._stamp = stamp
+        self._seq = 0
+
+
+def mark(text: str, generation: str, seq: int) -> str:
+    """
+    'text' (o arquivo de configuração) com a marca de que ele contém as entradas
+    da geração 'generation' até 'seq', no lugar da marca anterior.
+    """
+    found = _MARK.match(text)
+    if found:
+        text = text[found.end():]
+    newline = "\r\n" if "\r\n" in text else "\n"
+    return f"# docwriter-journal: {generation} {seq}{newline}{text}"
+
+def replay(tree, entries) -> None:
+    """Reaplica as operações das entradas em 'tree' (NavTree ou CompactNav), na ordem."""
+    with _profiling.span("journal.replay"):
+        for entry in entries:
+            apply(tree, entry["ops"])
+
+def apply(tree, ops) -> None:
+    """
+    Reaplica operações no formato do diário. Uma operação que não se aplica mais
+    (item que já não existe, destino ocupado) é ignorada, como a própria árvore faz.
+    """
+    for op in ops:
+        name, args = op[0], op[1:]
+        if name == "add":
+            try:
+                tree.add(*args)
+            except TypeError:
+                # o caminho passa por um documento
+                pass
+        elif name == "remove":
+            if args[0] in tree:
+                tree.remove(args[0])
+        elif name == "update":
+            tree.update(*args)
+        elif name == "rename":
+            tree.rename(*args)
+        elif name == "move":
+            path, new_path, old_dir, new_dir = args
+            tree.move(path, new_path, _Retarget(old_dir, new_dir) if old_dir is not None else None)
+        elif name == "organize":
+            _organize_nav_indexes(tree.nav, args[0])
+
+def _plain(value):
+    """Valor do nav só com dict/list/str, para o JSON (e sem compartilhar objetos com a árvore)."""
+    if isinstance(value, dict):
+        return {str(key): _plain(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_plain(child) for child in value]
+    return None if value is None else str(value)
+
+def _generation(header: bytes) -> str | None:
+    try:
+        data = _json.loads(header)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("journal") != _VERSION:
+        return None
+    return data.get("generation")
+
+def _stat(path: str) -> tuple[int, int, int] | None:
+    try:
+        stat = _os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
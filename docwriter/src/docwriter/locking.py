@@ -0,0 +1,130 @@
+"""
+Trava entre processos dos arquivos de configuração.
+
+Cada arquivo travado ganha ao lado um ".<nome>.lock", travado com fcntl.flock
+(POSIX) ou msvcrt.locking (Windows). A trava é consultiva: vale entre os
+processos que gravam pelo docwriter (editores, jobs de CI), não contra quem
+edita o arquivo direto. O arquivo de trava nunca é apagado; apagá-lo abriria
+uma janela em que dois processos travam arquivos diferentes.
+
+    with locking.locked("mkdocs.yml"):
+        ...  # conferir o arquivo e gravar
+
+Dentro do processo a trava é reentrante na mesma thread (a transação trava o
+arquivo e o write_config de dentro dela trava de novo) e exclusiva entre threads.
+"""
+import os as _os
+import threading as _threading
+import time as _time
+from contextlib import contextmanager as _contextmanager
+from docwriter import config as _config, profiling as _profiling
+from docwriter.exceptions import MkdocsLockTimeoutError as _MkdocsLockTimeoutError
+
+try:
+    import fcntl as _fcntl
+except ImportError:
+    _fcntl = None
+    import msvcrt as _msvcrt
+
+# Intervalo entre tentativas enquanto outro processo segura a trava, em segundos
+_POLL = 0.05
+
+_locks: dict[str, "FileLock"] = {}
+_locks_guard = _threading.Lock()
+
+
+class FileLock:
+    """Trava de um arquivo: uma thread do processo por vez e um processo por vez."""
+
+    def __init__(self, path: str):
+        self.path = _os.path.abspath(path)
+        folder, name = _os.path.split(self.path)
+        self.lock_path = _os.path.join(folder, f".{name}.lock")
+        self._thread_lock = _threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+
+    def acquire(self, timeout: float | None = None) -> None:
+        """Espera a trava por até 'timeout' segundos (None = MKDOCS_LOCK_TIMEOUT)."""
+        if timeout is None:
+            timeout = _config.MKDOCS_LOCK_TIMEOUT
+        deadline = _time.monotonic() + timeout
+        with _profiling.span("lock.wait"):
+            if not self._thread_lock.acquire(timeout=max(timeout, 0)):
+                raise _MkdocsLockTimeoutError(self.path)
+            try:
+                if self._depth == 0:
+                    self._fd = self._lock_file(deadline)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock(fd)
+            finally:
+                _os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.release()
+        return False
+
+    def _lock_file(self, deadline: float) -> int:
+        fd = _os.open(self.lock_path, _os.O_RDWR | _os.O_CREAT, 0o666)
+        try:
+            while not _try_lock(fd):
+                if _time.monotonic() >= deadline:
+                    raise _MkdocsLockTimeoutError(self.path)
+                _time.sleep(_POLL)
+        except BaseException:
+            _os.close(fd)
+            raise
+        return fd
+
+
+def lock_for(path: str) -> FileLock:
+    """A FileLock do arquivo; a mesma para todas as chamadas do processo."""
+    path = _os.path.abspath(path)
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = FileLock(path)
+        return lock
+
+@_contextmanager
+def locked(path: str, timeout: float | None = None):
+    """Trava 'path' durante o bloco; MkdocsLockTimeoutError se não conseguir a tempo."""
+    lock = lock_for(path)
+    lock.acquire(timeout)
+    try:
+        yield lock
+    finally:
+        lock.release()
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if _fcntl is not None:
+            _fcntl.flock(fd, _fcntl.LOCK_EX | _fcntl.LOCK_NB)
+        else:
+            # msvcrt trava bytes a partir da posição atual: sempre o primeiro
+            _os.lseek(fd, 0, _os.SEEK_SET)
+            _msvcrt.locking(fd, _msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+def _unlock(fd: int) -> None:
+    if _fcntl is not None:
+        _fcntl.flock(fd, _fcntl.LOCK_UN)
+    else:
+        _os.lseek(fd, 0, _os.SEEK_SET)
+        _msvcrt.locking(fd, _msvcrt.LK_UNLCK, 1)
@@ -1,31 +1,40 @@
 import sys
 import os
 import shutil
+from functools import partial
+from PySide6.QtCore import QStringListModel, QTimer, Signal
+from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QMessageBox, QFileDialog, QTreeView, QInputDialog
+    QApplication, QMainWindow, QMessageBox, QFileDialog, QTreeView, QInputDialog, QProgressBar, QPushButton, QCompleter
 )
-from PySide6.QtGui import QStandardItemModel, QStandardItem
 from docwriter.ui_mainwindow import Ui_MainWindow
+from docwriter.navmodel import NavModel, level_snapshot, snapshot
+from docwriter import config
 from docwriter.core import (
-    get_nav, index, unindex, _unmap_folders, _map_folders, _write_config, _read_config, _MKDOCS_CONFIG_PATH, _MKDOCS_DOC_ROOT_PATH, index_folder
+    default_project, get_nav, import_tree, index, unindex, update, rename, subscribe, index_folder,
+    search, search_index, compact_journal, undo, index_all_folders
 )
-from docwriter.navtree import nav_get, nav_add, nav_remove, nav_update
+from docwriter.exceptions import MkdocsFileNotFoundError
+from docwriter.jobs import JobRunner
+from docwriter.navtree import NavMoved
+from docwriter.watcher import Watcher
 
 
-if not _MKDOCS_CONFIG_PATH:
-    print("MKDOCS_CONFIG_PATH incorreto.")
-    quit()
-    
 class MainWindow(QMainWindow):
+    # Lotes de alterações na pasta docs, vindos da thread do Watcher
+    docsChanged = Signal(object)
+    # Eventos do nav, emitidos na thread da fila de tarefas
+    navChanged = Signal(object)
+
     def __init__(self):
         super().__init__()
+        self.project = default_project()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
         self.setWindowTitle("MkDocs Editor")
 
         self.selected_path = None
-        self.model = QStandardItemModel()
-        self.model.setHorizontalHeaderLabels(["Documentação"])
+        self.model = NavModel()
         self.ui.treeView.setModel(self.model)
         self.ui.treeView.clicked.connect(self.on_tree_clicked)
 
@@ -37,47 +46,237 @@ class MainWindow(QMainWindow):
         self.ui.pushButton_rename.clicked.connect(self.rename_document)
         self.ui.pushButton_create_index.clicked.connect(self.create_index)  # NOVO
 
+        self.action_import = QAction("Importar pasta...", self)
+        self.action_import.triggered.connect(self.import_folder)
+        self.ui.menuDocument_Tree.addAction(self.action_import)
+        self.action_index_all = QAction("Criar index.md das pastas...", self)
+        self.action_index_all.triggered.connect(self.index_all)
+        self.ui.menuDocument_Tree.addAction(self.action_index_all)
+        # Tempos de cada operação na barra de status (ligado de início com DOCWRITER_PROFILE)
+        self.action_profile = QAction("Mostrar tempos das operações", self)
+        self.action_profile.setCheckable(True)
+        self.action_profile.setChecked(bool(config.DOCWRITER_PROFILE))
+        self.ui.menuDocument_Tree.addAction(self.action_profile)
+        if config.MKDOCS_JOURNAL:
+            # Diário: as alterações só chegam ao mkdocs.yml na compactação (sozinha, pelo limite, ou ao fechar)
+            self.action_undo = QAction("Desfazer", self)
+            self.action_undo.setShortcut("Ctrl+Z")
+            self.action_undo.triggered.connect(self.undo_change)
+            self.ui.menuDocument_Tree.addAction(self.action_undo)
+            self.action_compact = QAction("Gravar alterações no mkdocs.yml", self)
+            self.action_compact.triggered.connect(self.compact_changes)
+            self.ui.menuDocument_Tree.addAction(self.action_compact)
+
+        # Todo acesso ao YAML e aos documentos roda na fila, fora da thread da interface
+        self.jobs = JobRunner(self)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(160)
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.clicked.connect(self.jobs.cancel)
+        self.ui.statusbar.addPermanentWidget(self.progress_bar)
+        self.ui.statusbar.addPermanentWidget(self.cancel_button)
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+        self.jobs.jobStarted.connect(self.on_job_started)
+        self.jobs.jobProgress.connect(self.on_job_progress)
+        self.jobs.jobCancelled.connect(self.on_job_cancelled)
+        self.jobs.idle.connect(self.on_jobs_idle)
+
+        # Busca: cada tecla vira uma consulta na fila e os caminhos encontrados aparecem como sugestões
+        self.search_model = QStringListModel(self)
+        self.completer = QCompleter(self.search_model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setWidget(self.ui.lineEdit_search)
+        self.completer.activated.connect(self.jump_to)
+        self.ui.lineEdit_search.textEdited.connect(self.on_search_edited)
+        self.ui.lineEdit_search.returnPressed.connect(self.on_search_return)
+
+        # nav de onde veio a última cópia inteira exibida (lido na thread da fila)
+        self._shown = None
+        # níveis da árvore a reler por causa de eventos: caminho -> chaves alteradas
+        self._pending_levels: dict[str, set] = {}
+        self._closing = False
         self.refresh_tree()
+        # Alterações feitas pelo core chegam como eventos; cada uma relê só o nível afetado
+        self.navChanged.connect(self.on_nav_changed)
+        subscribe(self._on_nav_event)
+
+        # Alterações feitas fora do editor na pasta docs aparecem na barra de status;
+        # a leitura inicial da pasta e os watches são feitos na thread do watcher
+        self.watcher = Watcher(self.project)
+        self.docsChanged.connect(self.on_docs_changed)
+        self.watcher.subscribe(self.docsChanged.emit)
+        self.watcher.start()
+
+    def closeEvent(self, event):
+        self._closing = True
+        self.watcher.stop()
+        # leituras na fila não interessam mais; as alterações já enviadas terminam antes de fechar
+        self.jobs.cancel_reads()
+        self.jobs.wait()
+        # entrega os resultados dessas alterações (só os erros são mostrados)
+        QApplication.processEvents()
+        if config.MKDOCS_JOURNAL:
+            try:
+                compact_journal()
+            except Exception as ex:
+                QMessageBox.critical(self, "Erro ao gravar o mkdocs.yml", str(ex))
+        super().closeEvent(event)
+
+    def run_job(self, label, function, *args, on_done=None, error_title="Erro", progress=False, **kwargs):
+        """Envia 'function' para a fila; erros viram uma mensagem e o nav exibido é sincronizado no fim."""
+        def failed(ex):
+            self.show_profile(job)
+            QMessageBox.critical(self, error_title, str(ex))
+            self.sync_tree()
+
+        def finished(result):
+            if self._closing:
+                return
+            self.show_profile(job)
+            if on_done:
+                on_done(result)
+            # os eventos já atualizaram a árvore; aqui só conta se o nav foi relido (undo, outro processo)
+            self.sync_tree()
+        job = self.jobs.submit(function, *args, label=label, progress=progress, profile=self.action_profile.isChecked(),
+                               on_done=finished, on_error=failed, **kwargs)
+        return job
+
+    def show_profile(self, job):
+        if job.report is not None:
+            self.ui.statusbar.showMessage(f"{job.label}: {job.report.summary()}")
+
+    def on_job_started(self, job):
+        self.ui.statusbar.showMessage(f"{job.label}...")
+        if self.progress_bar.isHidden():
+            # sem progresso informado a barra fica no modo "ocupado"
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.show()
+            self.cancel_button.show()
+
+    def on_job_progress(self, job, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.ui.statusbar.showMessage(f"{job.label}: {done}/{total}")
+
+    def on_job_cancelled(self, job):
+        if job.label:
+            self.ui.statusbar.showMessage(f"{job.label}: cancelado", 5000)
+        self.sync_tree()
+
+    def on_jobs_idle(self):
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+        if self.ui.statusbar.currentMessage().endswith("..."):
+            self.ui.statusbar.clearMessage()
+
+    def clear_fields(self):
+        self.ui.lineEdit.clear()
+        self.ui.lineEdit_2.clear()
+        self.selected_path = None
 
     def refresh_tree(self):
-        self.model.clear()
-        self.model.setHorizontalHeaderLabels(["Documentação"])
+        self.jobs.submit(self._nav_snapshot, True, on_done=self.model.reset)
+        # monta o índice de busca logo depois, para a primeira consulta não esperar por ele
+        self.jobs.submit(search_index)
+
+    def sync_tree(self):
+        """Se o nav foi relido (arquivo alterado por fora, undo, rollback), passa a exibir uma cópia nova."""
+        if not self._closing:
+            self.jobs.submit(self._nav_snapshot, on_done=self._sync_nav)
+
+    def _nav_snapshot(self, force=False):
+        """
+        Roda na fila: cópia inteira do nav para o modelo, ou None se ainda é o mesmo
+        nav da última cópia (as alterações nele chegam pelos eventos).
+        """
         nav = get_nav()
-        if nav:
-            self.build_tree(self.model, nav)
-
-    def build_tree(self, parent, nav_data):
-        for item in nav_data:
-            if isinstance(item, dict):
-                for key, value in item.items():
-                    node = QStandardItem(str(key))
-                    parent.appendRow(node)
-                    if isinstance(value, list):
-                        self.build_tree(node, value)
-                    elif isinstance(value, str):
-                        leaf = QStandardItem(str(value))
-                        node.appendRow(leaf)
-            elif isinstance(item, str):
-                leaf = QStandardItem(os.path.basename(item))
-                parent.appendRow(leaf)
+        if not force and nav is self._shown:
+            return None
+        self._shown = nav
+        return snapshot(nav)
+
+    def _sync_nav(self, nav):
+        if nav is not None:
+            self.model.set_nav(nav)
+
+    def _on_nav_event(self, event):
+        # thread da fila: só o evento vai para a interface; o nível é copiado depois, também na fila
+        self.navChanged.emit(event)
+
+    def on_nav_changed(self, event):
+        self._request_level(event.parent, event.path.rpartition('.')[2])
+        if isinstance(event, NavMoved):
+            self._request_level(event.old_parent, event.old_path.rpartition('.')[2])
+
+    def _request_level(self, parent, key):
+        """Agenda a releitura do nível afetado; os pedidos de um lote de eventos viram uma tarefa por nível."""
+        path, key = self.model.loaded_level(parent, key)
+        if not self._pending_levels:
+            QTimer.singleShot(0, self._flush_levels)
+        self._pending_levels.setdefault(path, set()).add(key)
+
+    def _flush_levels(self):
+        pending, self._pending_levels = self._pending_levels, {}
+        for path, keys in pending.items():
+            known = self.model.known_keys(path)
+            if known is None or self._closing:
+                # o nível saiu da árvore exibida: o evento do nível de cima cobre a mudança
+                continue
+            self.jobs.submit(self._level_snapshot, path, keys, known, on_done=partial(self._apply_level, path))
+
+    @staticmethod
+    def _level_snapshot(path, keys, known):
+        return level_snapshot(get_nav(), path, keys, known)
+
+    def _apply_level(self, path, entries):
+        for key in self.model.apply_level(path, entries):
+            self._request_level(path, key)
+
+    def on_docs_changed(self, changes):
+        self.jobs.submit(self.watcher.drift, changes, on_done=self.show_drift)
+
+    def show_drift(self, drift):
+        if drift:
+            self.ui.statusbar.showMessage(
+                f"{len(drift.orphans)} documento(s) fora do nav, {len(drift.missing)} item(ns) do nav sem arquivo")
+
+    def on_search_edited(self, text):
+        self.jobs.submit(search, text, on_done=self.show_hits)
+
+    def show_hits(self, hits):
+        self.search_model.setStringList([hit.path for hit in hits])
+        if hits and self.ui.lineEdit_search.hasFocus():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def on_search_return(self):
+        paths = self.search_model.stringList()
+        if paths:
+            self.jump_to(paths[0])
+
+    def jump_to(self, path):
+        """Abre os níveis até 'path', seleciona o item e preenche os campos como num clique."""
+        self.completer.popup().hide()
+        index = self.model.index_for_path(path)
+        if not index.isValid():
+            return
+        parent = index.parent()
+        while parent.isValid():
+            self.ui.treeView.expand(parent)
+            parent = parent.parent()
+        self.ui.treeView.setCurrentIndex(index)
+        self.ui.treeView.scrollTo(index)
+        self.on_tree_clicked(index)
 
     def on_tree_clicked(self, index):
-        item = self.model.itemFromIndex(index)
-        path = []
-        while item:
-            path.insert(0, item.text())
-            item = item.parent()
-        tree_path = ".".join(path)
+        tree_path = self.model.path(index)
         self.selected_path = tree_path
 
-        nav = get_nav()
-        value = nav_get(nav, tree_path) if nav else None
-
+        # a cópia exibida pelo modelo já está em memória, não é preciso ler o arquivo
         self.ui.lineEdit_2.setText(tree_path)
-        if isinstance(value, str):
-            self.ui.lineEdit.setText(value)
-        else:
-            self.ui.lineEdit.setText("")
+        self.ui.lineEdit.setText(self.model.file(tree_path) or "")
 
     def browse_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Selecionar arquivo Markdown", "", "Markdown Files (*.md);;All Files (*)")
@@ -90,23 +289,15 @@ class MainWindow(QMainWindow):
         if not file_path:
             QMessageBox.warning(self, "Aviso", "Informe o caminho do documento antes de adicionar.")
             return
-        try:
-            if index(yaml_path, file_path):
-                self.refresh_tree()
+        self.clear_fields()
+
+        def done(result):
+            if result:
                 QMessageBox.information(self, "Sucesso", "Documento adicionado.")
-                self.ui.lineEdit.clear()
-                self.ui.lineEdit_2.clear()
-                self.selected_path = None
             else:
                 QMessageBox.warning(self, "Aviso", "Já existe um documento neste caminho.")
-                self.ui.lineEdit.clear()
-                self.ui.lineEdit_2.clear()
-                self.selected_path = None
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro ao adicionar", str(ex))
-            self.ui.lineEdit.clear()
-            self.ui.lineEdit_2.clear()
-            self.selected_path = None
+        self.run_job("Adicionando documento", index, yaml_path, file_path,
+                     on_done=done, error_title="Erro ao adicionar")
 
     def remove_document(self):
         yaml_path = self.selected_path or self.ui.lineEdit_2.text().strip()
@@ -115,10 +306,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Erro", "Selecione um item ou informe o yaml_path.")
             return
 
-        nav = get_nav()
-        value = nav_get(nav, yaml_path) if nav else None
-
-        if isinstance(value, list) and value:
+        if self.model.is_folder(yaml_path):
             reply = QMessageBox.question(
                 self,
                 "Confirmação de exclusão",
@@ -128,109 +316,110 @@ class MainWindow(QMainWindow):
             )
             if reply != QMessageBox.StandardButton.Yes:
                 return
-            # Remove do nav/yaml
-            unindex(yaml_path, "")
-            # Remove do diretório físico (recursivo)
             keys = yaml_path.split('.')
-            folder_path = os.path.join(_MKDOCS_DOC_ROOT_PATH, *keys)
-            if os.path.isdir(folder_path):
-                shutil.rmtree(folder_path)
+            folder_path = os.path.join(self.project.doc_root, *keys)
+            work = lambda: self._remove_folder(yaml_path, folder_path)
         else:
-            # Documento simples
-            if unindex(yaml_path, file_path):
-                _unmap_folders(yaml_path, file_path)
+            work = lambda: self._remove_document(yaml_path, file_path)
 
-        self.refresh_tree()
-        self.selected_path = None
-        self.ui.lineEdit_2.clear()
-        self.ui.lineEdit.clear()
-        QMessageBox.information(self, "Sucesso", "Item removido.")
+        self.clear_fields()
+        self.run_job("Removendo", work, on_done=lambda _: QMessageBox.information(self, "Sucesso", "Item removido."),
+                     error_title="Erro ao remover")
+
+    @staticmethod
+    def _remove_folder(yaml_path, folder_path):
+        # Remove do nav/yaml
+        unindex(yaml_path, "")
+        # Remove do diretório físico (recursivo)
+        if os.path.isdir(folder_path):
+            shutil.rmtree(folder_path)
+
+    @staticmethod
+    def _remove_document(yaml_path, file_path):
+        # Documento simples: o arquivo sai junto, depois da gravação (no diário, na compactação)
+        unindex(yaml_path, file_path)
 
     def apply_update(self):
         yaml_path = self.ui.lineEdit_2.text().strip()
         file_path = self.ui.lineEdit.text().strip()
-        nav = get_nav()
-        try:
-            if nav is not None and nav_update(nav, yaml_path, file_path):
-                cfg = _read_config(_MKDOCS_CONFIG_PATH)
-                if isinstance(cfg, dict):
-                    cfg['nav'] = nav
-                    _write_config(_MKDOCS_CONFIG_PATH, cfg)
-                    self.refresh_tree()
-                    QMessageBox.information(self, "Sucesso", "Documento atualizado.")
-                    self.ui.lineEdit.clear()
-                    self.ui.lineEdit_2.clear()
-                    self.selected_path = None
-                else:
-                    QMessageBox.warning(self, "Erro", "Configuração inválida.")
-                    self.ui.lineEdit.clear()
-                    self.ui.lineEdit_2.clear()
-                    self.selected_path = None
+        self.clear_fields()
+
+        def done(result):
+            if result:
+                QMessageBox.information(self, "Sucesso", "Documento atualizado.")
             else:
                 QMessageBox.warning(self, "Aviso", "Não foi possível atualizar o documento.")
-                self.ui.lineEdit.clear()
-                self.ui.lineEdit_2.clear()
-                self.selected_path = None
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro ao atualizar", str(ex))
-            self.ui.lineEdit.clear()
-            self.ui.lineEdit_2.clear()
-            self.selected_path = None
+        self.run_job("Atualizando documento", update, yaml_path, file_path,
+                     on_done=done, error_title="Erro ao atualizar")
 
     def create_index(self):
         yaml_path = self.selected_path or self.ui.lineEdit_2.text().strip()
         if not yaml_path:
             QMessageBox.warning(self, "Erro", "Selecione uma pasta para indexar.")
             return
-        try:
-            result = index_folder(yaml_path)
+
+        def done(result):
             if result:
-                self.refresh_tree()
                 QMessageBox.information(self, "Sucesso", f"index.md indexado para: {yaml_path}")
             else:
                 QMessageBox.warning(self, "Aviso", "Não foi possível indexar o index.md.")
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro ao indexar", str(ex))
-    
+        self.run_job("Indexando pasta", index_folder, yaml_path, on_done=done, error_title="Erro ao indexar")
+
+    def index_all(self):
+        # com um item selecionado, só as pastas abaixo dele
+        root_path = self.selected_path or None
+        self.run_job("Indexando pastas", index_all_folders, root_path, progress=True,
+                     on_done=lambda paths: QMessageBox.information(self, "Sucesso", f"{len(paths)} pasta(s) indexada(s)."),
+                     error_title="Erro ao indexar")
+
+    def undo_change(self):
+        def done(result):
+            if not result:
+                self.ui.statusbar.showMessage("Nada a desfazer.", 5000)
+        self.run_job("Desfazendo", undo, on_done=done, error_title="Erro ao desfazer")
+
+    def compact_changes(self):
+        self.run_job("Gravando o mkdocs.yml", compact_journal,
+                     on_done=lambda count: self.ui.statusbar.showMessage(f"{count} alteração(ões) gravada(s).", 5000),
+                     error_title="Erro ao gravar")
+
+    def import_folder(self):
+        src_dir = QFileDialog.getExistingDirectory(self, "Selecionar pasta com documentos Markdown")
+        if not src_dir:
+            return
+        prefix, ok = QInputDialog.getText(self, "Importar pasta", "Caminho no nav (vazio = raiz):",
+                                          text=self.selected_path or "")
+        if not ok:
+            return
+        self.run_job("Importando", import_tree, src_dir, prefix.strip(), progress=True,
+                     on_done=lambda paths: QMessageBox.information(self, "Sucesso", f"{len(paths)} documento(s) importado(s)."),
+                     error_title="Erro ao importar")
+
     def rename_document(self):
         yaml_path = self.selected_path or self.ui.lineEdit_2.text().strip()
         if not yaml_path:
             QMessageBox.warning(self, "Erro", "Selecione um item para renomear.")
             return
 
-        nav = get_nav()
-        value = nav_get(nav, yaml_path) if nav else None
-
         new_name, ok = QInputDialog.getText(self, "Renomear", "Novo nome:")
         if not ok or not new_name.strip():
             return
 
-        keys = yaml_path.split('.')
-        parent_path = ".".join(keys[:-1])
-        old_dir = os.path.join(_MKDOCS_DOC_ROOT_PATH, *keys)
-        new_keys = keys[:-1] + [new_name.strip()]
-        new_yaml_path = ".".join(new_keys)
-        new_dir = os.path.join(_MKDOCS_DOC_ROOT_PATH, *new_keys)
-
-        # Renomeia diretório físico
-        if os.path.isdir(old_dir):
-            os.rename(old_dir, new_dir)
-
-        # Atualiza nav
-        if nav and nav_remove(nav, yaml_path):
-            nav_add(nav, new_yaml_path, os.path.join(new_dir, "index.md"))
-            cfg = _read_config(_MKDOCS_CONFIG_PATH)
-            if isinstance(cfg, dict):
-                cfg['nav'] = nav
-                _write_config(_MKDOCS_CONFIG_PATH, cfg)
-
-        self.refresh_tree()
-        self.selected_path = None
-        self.ui.lineEdit_2.clear()
-        self.ui.lineEdit.clear()
-        QMessageBox.information(self, "Sucesso", "Item renomeado.")
+        def done(result):
+            if result:
+                QMessageBox.information(self, "Sucesso", "Item renomeado.")
+            else:
+                QMessageBox.warning(self, "Aviso", "Não foi possível renomear: o item não existe ou o nome já está em uso.")
+        # a pasta, o nav e os arquivos da subárvore mudam juntos, com uma única escrita
+        self.clear_fields()
+        self.run_job("Renomeando", rename, yaml_path, new_name.strip(), on_done=done, error_title="Erro ao renomear")
 
 if __name__ == "__main__":
+    try:
+        default_project()
+    except MkdocsFileNotFoundError:
+        print("MKDOCS_CONFIG_PATH incorreto.")
+        quit()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,67 @@
+"""
+Manifesto das pastas já tratadas por Project.index_all_folders().
+
+Guardado em <docs>/.docwriter/indexes.json (a mesma pasta oculta do store, que
+o mkdocs, o scan_docs e o Watcher ignoram). Uma pasta registrada não é olhada
+de novo, então rodar index_all_folders() outra vez só mexe nas pastas novas,
+e um index removido de propósito do nav não volta.
+"""
+import json as _json
+from pathlib import Path as _Path
+from docwriter.locking import locked as _locked
+from docwriter.placement import replace_with as _replace_with
+from docwriter.store import STORE_DIR as _STORE_DIR
+
+_VERSION = 1
+
+
+class FolderManifest:
+    """
+    Pastas (relativas à pasta docs, separadas por '/') que já têm ou já ganharam index.md.
+
+        manifest = FolderManifest.for_docs("C:/projeto/docs")
+        pendentes = [pasta for pasta in pastas if pasta not in manifest]
+        manifest.save(["Pasta", "Pasta/Sub"])
+    """
+
+    def __init__(self, path):
+        self.path = _Path(path)
+        self._folders: set[str] | None = None
+
+    @classmethod
+    def for_docs(cls, doc_root) -> "FolderManifest":
+        return cls(_Path(doc_root) / _STORE_DIR / "indexes.json")
+
+    def __contains__(self, folder: str) -> bool:
+        return folder in self._load()
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def save(self, folders) -> None:
+        """Acrescenta 'folders' e grava; o que outro processo gravou nesse meio tempo é mantido."""
+        folders = set(folders)
+        if not folders:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _locked(str(self.path)):
+            self._folders = None
+            merged = self._load() | folders
+            data = {"version": _VERSION, "folders": sorted(merged)}
+
+            def write(temp):
+                with open(temp, "w", encoding="utf-8") as f:
+                    _json.dump(data, f, ensure_ascii=False)
+            _replace_with(self.path, write, fallback=False)
+            self._folders = merged
+
+    def _load(self) -> set[str]:
+        if self._folders is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = _json.load(f)
+                self._folders = set(data.get("folders", ())) if data.get("version") == _VERSION else set()
+            except (FileNotFoundError, ValueError):
+                # manifesto ausente ou corrompido: as pastas são conferidas de novo, o que é inofensivo
+                self._folders = set()
+        return self._folders
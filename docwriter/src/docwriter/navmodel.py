@@ -0,0 +1,354 @@
+import os as _os
+from PySide6.QtCore import QAbstractItemModel as _QAbstractItemModel, QModelIndex as _QModelIndex, Qt as _Qt
+from docwriter.compact import CompactNav as _CompactNav, NavNode as _NavNode
+from docwriter.navtree import nav_get as _nav_get
+
+
+def snapshot(nav) -> list | _CompactNav:
+    """
+    Cópia do nav para o NavModel, feita na fila de tarefas (a mesma thread que
+    altera o nav). Listas e dicts do ruamel viram list/dict comuns; uma
+    CompactNav é copiada tabela a tabela.
+    """
+    if isinstance(nav, _CompactNav):
+        return nav.copy()
+    return _copy(nav) if nav else []
+
+# valor de uma pasta que o modelo já exibe e que não mudou (ver level_snapshot)
+KEEP = object()
+
+def level_snapshot(nav, path: str, keys, known) -> list | None:
+    """
+    Roda na fila: filhos do item 'path' ("" = primeiro nível) como (texto, tipo, valor),
+    para NavModel.apply_level(). Arquivos vêm sempre; as pastas em 'keys', ou que
+    não estão em 'known' (as que o modelo já tem), são copiadas com a subárvore, e
+    as demais vêm como KEEP. None se 'path' não existe mais no nav.
+    """
+    if isinstance(nav, _CompactNav):
+        return _compact_level(nav, path, keys, known)
+    level = _nav_get(nav, path) if path else nav
+    if level is None:
+        return None
+    if isinstance(level, str):
+        return [(_os.path.basename(level), "leaf", level)] if level else []
+    entries = []
+    for item in level if isinstance(level, list) else []:
+        if isinstance(item, dict):
+            for key, child in item.items():
+                text = str(key)
+                if isinstance(child, list) and text not in keys and text in known:
+                    entries.append((text, "dir", KEEP))
+                else:
+                    entries.append((text, "dir", _copy(child)))
+        elif isinstance(item, str):
+            entries.append((_os.path.basename(item), "leaf", item))
+    return entries
+
+def _compact_level(nav: _CompactNav, path: str, keys, known) -> list | None:
+    node = nav.root
+    for key in path.split('.') if path else []:
+        node = next((child for child in node.children() if child.key == key and child.is_section), None)
+        if node is None:
+            value = nav.get(path)
+            return [(_os.path.basename(value), "leaf", value)] if isinstance(value, str) and value else None
+    entries = []
+    for child in node.children():
+        if child.key is None:
+            if child.value:
+                entries.append((_os.path.basename(child.value), "leaf", child.value))
+        elif not child.is_section:
+            entries.append((child.key, "dir", child.value))
+        elif child.key in keys or child.key not in known:
+            entries.append((child.key, "dir", nav.to_nav(f"{path}.{child.key}" if path else child.key)))
+        else:
+            entries.append((child.key, "dir", KEEP))
+    return entries
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {key: _copy(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_copy(child) for child in value]
+    return value
+
+
+class _Node:
+    """Nó exibido na árvore; 'value' aponta para a cópia do nav (ou um NavNode da CompactNav copiada)."""
+    __slots__ = ("text", "kind", "value", "parent", "children", "row")
+
+    def __init__(self, text: str, kind: str, value, parent, row: int = 0):
+        self.text = text
+        # "dir" = chave do nav (pasta ou documento), "leaf" = caminho do arquivo
+        self.kind = kind
+        self.value = value
+        self.parent = parent
+        # None enquanto os filhos não foram buscados (fetchMore)
+        self.children: list | None = None
+        self.row = row
+
+
+class NavModel(_QAbstractItemModel):
+    """
+    Modelo Qt sobre uma cópia do nav feita por snapshot() na fila de tarefas: a
+    lista (ou CompactNav) que as tarefas alteram nunca é lida na thread da
+    interface. Com uma CompactNav cada nó guarda só um NavNode (árvore + linha),
+    sem cópia das chaves.
+
+    Os filhos de cada nó só são criados quando a view pede (canFetchMore/fetchMore).
+    Cada alteração do nav chega como um único nível (apply_level, a partir de
+    level_snapshot) e vira inserções/remoções de linhas nesse nível; set_nav()
+    troca a cópia inteira (releitura do arquivo, rollback) sincronizando apenas os
+    níveis já carregados, e reset() recomeça do zero.
+    """
+
+    def __init__(self, nav: list | None = None, parent=None):
+        super().__init__(parent)
+        self._root = _Node("", "dir", nav if nav is not None else [], None)
+
+    def reset(self, nav: list | _CompactNav) -> None:
+        """Descarta tudo o que foi carregado e volta a exibir só o primeiro nível da cópia 'nav'."""
+        self.beginResetModel()
+        self._root = _Node("", "dir", nav, None)
+        self.endResetModel()
+
+    def set_nav(self, nav: list | _CompactNav) -> None:
+        """Passa a exibir a cópia 'nav', sincronizando só o que já foi carregado na view."""
+        self._root.value = nav
+        self._sync(self._root)
+
+    def index_for_path(self, path: str) -> _QModelIndex:
+        """Índice do item 'path' (pontuado), carregando os níveis do caminho que ainda não foram buscados."""
+        node = self._find(path)
+        return self._index_of(node) if node is not None else _QModelIndex()
+
+    def file(self, path: str) -> str | None:
+        """Arquivo do documento 'path' na cópia exibida; None para pastas e caminhos inexistentes."""
+        node = self._find(path)
+        value = node.value if node is not None else None
+        if isinstance(value, _NavNode):
+            value = value.value
+        return value if isinstance(value, str) else None
+
+    def is_folder(self, path: str) -> bool:
+        """True se 'path' é uma pasta com itens na cópia exibida."""
+        node = self._find(path)
+        if node is None or isinstance(node.value, str):
+            return False
+        if isinstance(node.value, _NavNode):
+            return node.value.is_section and len(node.value) > 0
+        return bool(node.value)
+
+    def loaded_level(self, parent: str, key: str) -> tuple[str, str]:
+        """
+        Nível que deve ser relido para uma alteração no item 'key' de 'parent':
+        o próprio 'parent' se ele já foi carregado na view, senão o nível carregado
+        mais fundo no caminho e a chave do item dele que leva até 'parent'.
+        """
+        node = self._root
+        if node.children is None:
+            self.fetchMore(_QModelIndex())
+        keys = parent.split('.') if parent else []
+        for depth, name in enumerate(keys):
+            child = next((child for child in node.children if child.kind == "dir" and child.text == name), None)
+            if child is None or child.children is None:
+                return '.'.join(keys[:depth]), name
+            node = child
+        return parent, key
+
+    def known_keys(self, path: str) -> set[str] | None:
+        """Pastas já exibidas no nível 'path' (ver level_snapshot); None se o nível não está carregado."""
+        node = self._find(path, fetch=False)
+        if node is None or node.children is None:
+            return None
+        return {child.text for child in node.children if child.kind == "dir"}
+
+    def apply_level(self, path: str, entries: list | None) -> set[str]:
+        """
+        Aplica um nível de level_snapshot(): só as linhas que mudaram nele são
+        removidas/inseridas. Retorna as chaves marcadas KEEP que o modelo não tem
+        (o nível mudou desde o pedido), que precisam ser pedidas de novo.
+        """
+        node = self._find(path, fetch=False)
+        if entries is None or node is None or node.children is None:
+            return set()
+        current = {}
+        for child in node.children:
+            current.setdefault((child.text, child.kind), child.value)
+        missing = set()
+        resolved = []
+        for text, kind, value in entries:
+            if value is KEEP:
+                value = current.get((text, kind), KEEP)
+                if value is KEEP:
+                    missing.add(text)
+                    value = []
+            resolved.append((text, kind, value))
+        self._sync(node, resolved)
+        return missing
+
+    def path(self, index: _QModelIndex) -> str:
+        """Caminho pontuado do item, do topo da árvore até ele."""
+        keys = []
+        node = index.internalPointer() if index.isValid() else None
+        while node is not None and node is not self._root:
+            keys.insert(0, node.text)
+            node = node.parent
+        return ".".join(keys)
+
+    # QAbstractItemModel
+
+    def index(self, row: int, column: int, parent: _QModelIndex = _QModelIndex()) -> _QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return _QModelIndex()
+        return self.createIndex(row, column, self._node(parent).children[row])
+
+    def parent(self, index: _QModelIndex = _QModelIndex()) -> _QModelIndex:
+        if not index.isValid():
+            return _QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return _QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: _QModelIndex = _QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self._node(parent).children
+        return len(children) if children is not None else 0
+
+    def columnCount(self, parent: _QModelIndex = _QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: _QModelIndex = _QModelIndex()) -> bool:
+        node = self._node(parent)
+        if node.children is not None:
+            return bool(node.children)
+        return self._has_children(node)
+
+    def canFetchMore(self, parent: _QModelIndex) -> bool:
+        node = self._node(parent)
+        return node.children is None and self._has_children(node)
+
+    def fetchMore(self, parent: _QModelIndex) -> None:
+        node = self._node(parent)
+        if node.children is not None:
+            return
+        entries = self._describe(node)
+        # vazio antes do beginInsertRows: quem observar o modelo no meio da inserção não busca de novo
+        node.children = []
+        if not entries:
+            return
+        self.beginInsertRows(parent, 0, len(entries) - 1)
+        node.children.extend(_Node(text, kind, value, node, row) for row, (text, kind, value) in enumerate(entries))
+        self.endInsertRows()
+
+    def data(self, index: _QModelIndex, role: int = _Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == _Qt.ItemDataRole.DisplayRole:
+            return index.internalPointer().text
+        return None
+
+    def headerData(self, section: int, orientation, role: int = _Qt.ItemDataRole.DisplayRole):
+        if orientation == _Qt.Orientation.Horizontal and role == _Qt.ItemDataRole.DisplayRole:
+            return "Documentação"
+        return None
+
+    # Internos
+
+    def _find(self, path: str, fetch: bool = True) -> _Node | None:
+        """Nó do caminho 'path' ("" = raiz); com fetch=False só entre os níveis já carregados."""
+        node = self._root
+        for key in path.split('.') if path else []:
+            if node.children is None:
+                if not fetch:
+                    return None
+                self.fetchMore(self._index_of(node))
+            node = next((child for child in node.children if child.kind == "dir" and child.text == key), None)
+            if node is None:
+                return None
+        return node
+
+    def _node(self, index: _QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node: _Node) -> _QModelIndex:
+        if node is self._root:
+            return _QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    @staticmethod
+    def _has_children(node: _Node) -> bool:
+        if node.kind == "leaf":
+            return False
+        return bool(node.value) and isinstance(node.value, (list, str, _NavNode, _CompactNav))
+
+    @staticmethod
+    def _describe(node: _Node) -> list[tuple[str, str, object]]:
+        """Filhos de um nó como (texto, tipo, valor), na mesma forma da árvore antiga."""
+        value = node.value
+        if node.kind == "leaf":
+            return []
+        if isinstance(value, str):
+            return [(value, "leaf", value)] if value else []
+        if isinstance(value, _CompactNav):
+            value = value.root
+        if isinstance(value, _NavNode):
+            return [(child.key, "dir", child if child.is_section else child.value) if child.key is not None
+                    else (_os.path.basename(child.value), "leaf", child.value)
+                    for child in value.children() if child.key is not None or child.value]
+        if not isinstance(value, list):
+            return []
+        entries = []
+        for item in value:
+            if isinstance(item, dict):
+                for key, child in item.items():
+                    entries.append((str(key), "dir", child))
+            elif isinstance(item, str):
+                entries.append((_os.path.basename(item), "leaf", item))
+        return entries
+
+    def _sync(self, node: _Node, entries: list | None = None) -> None:
+        """
+        Compara os filhos carregados de 'node' com o nav (ou com 'entries', já
+        descritos) e aplica só a diferença: prefixo e sufixo iguais são mantidos, o
+        trecho do meio é removido/inserido.
+        """
+        if node.children is None:
+            if node is not self._root:
+                index = self._index_of(node)
+                self.dataChanged.emit(index, index)
+            return
+
+        if entries is None:
+            entries = self._describe(node)
+        old = node.children
+        start = 0
+        while start < len(old) and start < len(entries) and (old[start].text, old[start].kind) == entries[start][:2]:
+            start += 1
+        end = 0
+        while (end < len(old) - start and end < len(entries) - start
+               and (old[-1 - end].text, old[-1 - end].kind) == entries[-1 - end][:2]):
+            end += 1
+
+        parent = self._index_of(node)
+        removed = len(old) - start - end
+        if removed:
+            self.beginRemoveRows(parent, start, start + removed - 1)
+            del old[start:start + removed]
+            for row in range(start, len(old)):
+                old[row].row = row
+            self.endRemoveRows()
+        inserted = len(entries) - start - end
+        if inserted:
+            self.beginInsertRows(parent, start, start + inserted - 1)
+            old[start:start] = [_Node(text, kind, value, node, start + offset)
+                                for offset, (text, kind, value) in enumerate(entries[start:start + inserted])]
+            for row in range(start + inserted, len(old)):
+                old[row].row = row
+            self.endInsertRows()
+
+        # Itens mantidos cujo valor foi trocado (novo arquivo, pasta recriada) descem um nível
+        for child, (_, _, value) in zip(old, entries):
+            # NavNode novos a cada _describe: iguais se apontam para a mesma linha
+            if child.value is not value and not (isinstance(value, _NavNode) and value == child.value):
+                child.value = value
+                self._sync(child)
@@ -1,69 +1,585 @@
-def nav_add(nav: list, path: str, file_path: str) -> list:
-    """Adiciona um item à estrutura nav do mkdocs.yml."""
-    keys = path.split('.')
-    current = nav
-
-    for i, key in enumerate(keys):
-        found = None
-        for item in current:
-            if isinstance(item, dict) and key in item:
-                found = item
-                break
+from dataclasses import dataclass as _dataclass
+from docwriter import profiling as _profiling
+
+
+@_dataclass(frozen=True)
+class NavEvent:
+    """
+    Alteração em um item do nav.
+    path = caminho pontuado do item
+    parent = caminho pontuado do pai ("" para o primeiro nível)
+    position = posição do item na lista do pai
+    """
+    path: str
+    parent: str
+    position: int
+
+@_dataclass(frozen=True)
+class NavAdded(NavEvent):
+    """Item (e todos os seus filhos) inserido."""
+
+@_dataclass(frozen=True)
+class NavRemoved(NavEvent):
+    """Item (e todos os seus filhos) removido; position é a que ele ocupava."""
+
+@_dataclass(frozen=True)
+class NavUpdated(NavEvent):
+    """O valor do item mudou (outro arquivo, ou filhos substituídos/reordenados)."""
+
+@_dataclass(frozen=True)
+class NavMoved(NavEvent):
+    """Item movido ou renomeado; path/parent/position já são os novos."""
+    old_path: str = ""
+    old_parent: str = ""
+    old_position: int = -1
+
+@_dataclass(frozen=True)
+class NavConflict:
+    """
+    Documento alterado de formas diferentes dos dois lados de um three_way_merge().
+    base/ours/theirs = arquivo em cada versão (None = ausente, ou uma pasta)
+    """
+    path: str
+    base: str | None
+    ours: str | None
+    theirs: str | None
+
+@_dataclass(frozen=True)
+class Retarget:
+    """
+    retarget de NavTree.move(): arquivos dentro de old_dir passam para new_dir
+    (pastas com '/'). Outros arquivos (caminhos absolutos, URLs) ficam como estão.
+    """
+    old_dir: str
+    new_dir: str
+
+    def __call__(self, file_path: str) -> str:
+        if file_path.startswith(self.old_dir + '/'):
+            # mesmo tipo do valor original (aspas preservadas pelo ruamel)
+            return type(file_path)(self.new_dir + file_path[len(self.old_dir):])
+        return file_path
+
+
+class NavTree:
+    """
+    Índice em memória sobre a lista 'nav' carregada pelo ruamel.
+
+    Cada nível (lista) ganha um dicionário chave -> item, montado sob demanda na
+    primeira vez em que é percorrido, e cada caminho pontuado já resolvido fica
+    guardado em um mapa caminho -> (lista pai, item, chave). As operações
+    alteram a estrutura original no lugar, então comentários e aspas
+    preservados pelo ruamel continuam valendo na hora de escrever o arquivo.
+
+    Todas as alterações devem passar pela árvore para que os índices continuem
+    sincronizados; use reindex() se a lista for alterada por fora.
+
+    Cada alteração gera um único NavEvent (NavAdded, NavRemoved, NavUpdated ou
+    NavMoved) para os callbacks registrados com subscribe().
+    """
+
+    def __init__(self, nav: list | None = None):
+        self.nav = nav if nav is not None else []
+        # id(lista) -> (lista, tamanho no momento da indexação, chave -> item)
+        self._levels: dict[int, tuple[list, int, dict]] = {}
+        # caminho pontuado -> (lista pai, item, chave)
+        self._paths: dict[str, tuple[list, dict, str]] = {}
+        self._listeners: list = []
+
+    def subscribe(self, callback) -> None:
+        """Registra callback(event: NavEvent), chamado a cada alteração."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def reindex(self) -> None:
+        """Descarta os índices; serão reconstruídos sob demanda."""
+        self._levels.clear()
+        self._paths.clear()
+
+    def index_all(self) -> "NavTree":
+        """Indexa a árvore inteira de uma vez (útil antes de operações em lote)."""
+        self.reindex()
+        # pilha em ordem reversa para visitar os itens na ordem do documento
+        stack = [("", key, item, self.nav) for key, item in reversed(self._level(self.nav).items())]
+        while stack:
+            prefix, key, item, level = stack.pop()
+            # chaves que o YAML leu como número ou booleano viram texto no caminho, como em search.py
+            path = f"{prefix}.{key}" if prefix else str(key)
+            self._paths[path] = (level, item, key)
+            value = item[key]
+            if isinstance(value, list):
+                stack.extend((path, child_key, child, value) for child_key, child in reversed(self._level(value).items()))
+        return self
+
+    def paths(self) -> list[str]:
+        """Todos os caminhos pontuados da árvore, na ordem do documento."""
+        return list(self.index_all()._paths)
+
+    def entries(self):
+        """(caminho, arquivo) de cada item na ordem do documento; arquivo = None para pastas."""
+        for path, (_, item, key) in list(self.index_all()._paths.items()):
+            value = item[key]
+            yield path, value if isinstance(value, str) else None
 
-        if found:
-            # Se o valor encontrado não for lista e ainda há níveis, substituir por lista
-            if i < len(keys) - 1:
-                if not isinstance(found[key], list):
-                    found[key] = []
+    def __contains__(self, path: str) -> bool:
+        return self._resolve(path) is not None
+
+    def position(self, path: str) -> int:
+        """Posição do item na lista do pai, ou -1 se ele não existir."""
+        found = self._resolve(path)
+        if found is None:
+            return -1
+        parent, item, _ = found
+        return self._position(parent, item)
+
+    def get(self, path: str) -> None | str | list:
+        found = self._resolve(path)
+        if found is None:
+            return None
+        _, item, key = found
+        return item[key]
+
+    def add(self, path: str, file_path: str) -> list:
+        """Adiciona um item à estrutura nav do mkdocs.yml."""
+        keys = path.split('.')
+        current = self.nav
+        # primeiro item criado/alterado no caminho: é o único que gera evento
+        event = None
+
+        for i, key in enumerate(keys):
+            prefix = '.'.join(keys[:i + 1])
+            found = self._child(current, key, prefix)
+
+            if found:
+                # Se o valor encontrado não for lista e ainda há níveis, substituir por lista
+                if i < len(keys) - 1:
+                    if not isinstance(found[key], list):
+                        found[key] = []
+                        event = event or (NavUpdated, prefix, current, found)
+                    current = found[key]
+                else:
+                    # Último nível: atualizar o valor diretamente
+                    self._forget_children(prefix, found[key])
+                    found[key] = file_path
+                    event = event or (NavUpdated, prefix, current, found)
+            else:
+                if i < len(keys) - 1:
+                    new_level = {key: []}
+                    if isinstance(current, list):
+                        self._append(current, new_level, key, prefix)
+                    else:
+                        raise TypeError(f"Nível '{key}' não é uma lista (type={type(current)})")
+                    event = event or (NavAdded, prefix, current, new_level)
+                    current = new_level[key]
+                else:
+                    if not isinstance(current, list):
+                        raise TypeError(f"Nível final não é lista (type={type(current)})")
+                    new_item = {key: file_path}
+                    self._append(current, new_item, key, prefix)
+                    event = event or (NavAdded, prefix, current, new_item)
+
+        if event:
+            event_type, event_path, level, item = event
+            self._emit(event_type, event_path, level, item)
+        return self.nav
+
+    def remove(self, path: str) -> list:
+        """Remove apenas o item selecionado e seus filhos da estrutura nav do mkdocs.yml."""
+        keys = path.split('.')
+        current = self.nav
+        stack = []
+        for i, key in enumerate(keys):
+            prefix = '.'.join(keys[:i + 1])
+            found = self._child(current, key, prefix)
+            if not found:
+                return self.nav
+            stack.append((current, found, key, prefix))
+            if isinstance(found[key], list):
                 current = found[key]
             else:
-                # Último nível: atualizar o valor diretamente
-                found[key] = file_path
+                break
+        # Remove apenas o item selecionado
+        parent, found, key, prefix = stack.pop()
+        position = self._detach(parent, found, key, prefix)
+        removed = prefix
+        # Se o pai ficou vazio, remove o pai (limpeza de níveis vazios)
+        while stack:
+            parent, found, key, prefix = stack.pop()
+            if isinstance(found[key], list) and not found[key]:
+                position = self._detach(parent, found, key, prefix)
+                removed = prefix
+            else:
+                break
+        # um só evento, para o nível mais alto que saiu da árvore
+        self._emit(NavRemoved, removed, None, None, position=position)
+        return self.nav
+
+    def update(self, path: str, new_file: str) -> bool:
+        """Atualiza o arquivo associado a um item existente sem recriar a hierarquia."""
+        found = self._resolve(path)
+        if found is None:
+            return False
+        parent, item, key = found
+        self._forget_children(path, item[key])
+        item[key] = new_file
+        self._emit(NavUpdated, path, parent, item)
+        return True
+
+    def rename(self, path: str, new_key: str) -> bool:
+        """
+        Troca a chave do item em 'path' por 'new_key', mantendo a posição e os filhos.
+        Retorna False se o item não existir ou se já houver um irmão com a nova chave.
+        """
+        found = self._resolve(path)
+        if found is None:
+            return False
+        parent, item, key = found
+        if new_key == key:
+            return True
+        entries = self._level(parent)
+        if new_key in entries:
+            return False
+
+        prefix = path.rpartition('.')[0]
+        new_path = f"{prefix}.{new_key}" if prefix else new_key
+        self._forget_children(path, item[key])
+        self._paths.pop(path, None)
+
+        self._rekey(item, key, new_key)
+        del entries[key]
+        entries[new_key] = item
+        self._store_level(parent, entries)
+        self._paths[new_path] = (parent, item, new_key)
+        if self._listeners:
+            position = self._position(parent, item)
+            self._emit(NavMoved, new_path, parent, item, position=position,
+                       old_path=path, old_parent=prefix, old_position=position)
+        return True
+
+    def move(self, path: str, new_path: str, retarget=None) -> bool:
+        """
+        Move o item em 'path' (com todos os filhos) para 'new_path', em qualquer nível.
+        Níveis que faltarem no destino são criados e os que ficarem vazios na origem
+        são removidos, como em add/remove; com o mesmo pai é um rename() e a posição
+        é mantida. retarget(arquivo) -> arquivo é aplicado a cada arquivo da subárvore,
+        na mesma passada.
+
+        Retorna False se o item não existir, se 'new_path' já existir, ficar dentro
+        do próprio item ou passar por um documento.
+        """
+        if new_path == path:
+            return path in self
+        found = self._resolve(path)
+        if found is None or new_path.startswith(path + '.') or self._resolve(new_path) is not None:
+            return False
+        old_parent = path.rpartition('.')[0]
+        new_parent, _, new_key = new_path.rpartition('.')
+        if new_parent == old_parent:
+            if retarget:
+                self._retarget(found[1], found[2], retarget)
+            return self.rename(path, new_key)
+
+        target, created = self._make_level(new_parent)
+        if target is None:
+            return False
+        parent, item, key = found
+        if retarget:
+            self._retarget(item, key, retarget)
+        old_position = self._position(parent, item)
+        if len(item) == 1:
+            self._detach(parent, item, key, path)
+            if new_key != key:
+                self._rekey(item, key, new_key)
         else:
-            if i < len(keys) - 1:
-                new_level = {key: []}
-                if isinstance(current, list):
-                    current.append(new_level)
+            # item com mais de uma chave: só esta sai dele
+            value = item[key]
+            self._forget_children(path, value)
+            self._paths.pop(path, None)
+            del item[key]
+            self._levels.pop(id(parent), None)
+            item = type(item)()
+            item[new_key] = value
+        self._append(target, item, new_key, new_path)
+        emptied = self._prune(old_parent)
+
+        if created:
+            self._emit(NavAdded, created, None, None, position=self.position(created))
+        self._emit(NavMoved, new_path, target, item, old_path=path, old_parent=old_parent, old_position=old_position)
+        if emptied:
+            path, position = emptied
+            self._emit(NavRemoved, path, None, None, position=position)
+        return True
+
+    def _level(self, level: list) -> dict:
+        """Índice chave -> item de uma lista, reconstruído se a lista mudou de tamanho."""
+        cached = self._levels.get(id(level))
+        if cached is not None and cached[0] is level and cached[1] == len(level):
+            return cached[2]
+        if _profiling.active:
+            _profiling.count("nav.nodes", len(level))
+        entries = {}
+        for item in level:
+            if isinstance(item, dict):
+                for key in item:
+                    # mantém a primeira ocorrência, como na busca linear
+                    entries.setdefault(key, item)
+        self._store_level(level, entries)
+        return entries
+
+    def _store_level(self, level: list, entries: dict) -> None:
+        self._levels[id(level)] = (level, len(level), entries)
+
+    def _child(self, level, key: str, path: str) -> dict | None:
+        if _profiling.active:
+            _profiling.count("nav.nodes")
+        cached = self._paths.get(path)
+        if cached is not None and cached[0] is level and key in cached[1]:
+            return cached[1]
+        if not isinstance(level, list):
+            return None
+        item = self._level(level).get(key)
+        if item is not None:
+            self._paths[path] = (level, item, key)
+        return item
+
+    def _resolve(self, path: str) -> tuple[list, dict, str] | None:
+        cached = self._paths.get(path)
+        if cached is not None and cached[2] in cached[1]:
+            return cached
+        keys = path.split('.')
+        current = self.nav
+        for i, key in enumerate(keys):
+            found = self._child(current, key, '.'.join(keys[:i + 1]))
+            if found is None:
+                return None
+            # se for o último nível, deve retornar somente se ele existir exatamente
+            if i == len(keys) - 1:
+                return current, found, key
+            current = found[key]
+            if not isinstance(current, list):
+                return None
+        return None
+
+    def _append(self, level: list, item: dict, key: str, path: str) -> None:
+        entries = self._level(level)
+        level.append(item)
+        entries.setdefault(key, item)
+        self._store_level(level, entries)
+        self._paths[path] = (level, item, key)
+
+    def _detach(self, level: list, item: dict, key: str, path: str) -> int:
+        entries = self._level(level)
+        position = self._position(level, item)
+        if position >= 0:
+            del level[position]
+        prefix = path.rpartition('.')[0]
+        for other in item:
+            other_path = f"{prefix}.{other}" if prefix else other
+            self._forget_children(other_path, item[other])
+            self._paths.pop(other_path, None)
+            if entries.get(other) is item:
+                del entries[other]
+                # outra ocorrência da mesma chave passa a ser a primeira
+                for candidate in level:
+                    if isinstance(candidate, dict) and other in candidate:
+                        entries[other] = candidate
+                        break
+        self._store_level(level, entries)
+        return position
+
+    def _make_level(self, path: str) -> tuple[list | None, str | None]:
+        """
+        Lista dos filhos de 'path', criando as seções que faltarem. Retorna também o
+        caminho da primeira seção criada (ou None); (None, None) se passar por um documento.
+        """
+        current = self.nav
+        created = None
+        keys = path.split('.') if path else []
+        for i, key in enumerate(keys):
+            prefix = '.'.join(keys[:i + 1])
+            found = self._child(current, key, prefix)
+            if found is None:
+                found = {key: []}
+                self._append(current, found, key, prefix)
+                created = created or prefix
+            elif not isinstance(found[key], list):
+                return None, None
+            current = found[key]
+        return current, created
+
+    def _prune(self, path: str) -> tuple[str, int] | None:
+        """Remove 'path' e os pais que ficaram vazios; retorna (caminho mais alto removido, posição)."""
+        emptied = None
+        while path:
+            found = self._resolve(path)
+            if found is None or not isinstance(found[1][found[2]], list) or found[1][found[2]]:
+                break
+            parent, item, key = found
+            emptied = (path, self._detach(parent, item, key, path))
+            path = path.rpartition('.')[0]
+        return emptied
+
+    @staticmethod
+    def _rekey(item: dict, key: str, new_key: str) -> None:
+        if hasattr(item, 'insert'):
+            # CommentedMap: mantém a posição da chave e seus comentários
+            item.insert(list(item).index(key), new_key, item[key])
+            del item[key]
+        else:
+            item[new_key] = item.pop(key)
+
+    @staticmethod
+    def _retarget(item: dict, key: str, retarget) -> None:
+        """Aplica retarget a todos os arquivos abaixo de item[key], alterando os valores no lugar."""
+        stack = [(item, key)]
+        while stack:
+            container, child_key = stack.pop()
+            value = container[child_key]
+            if isinstance(value, str):
+                new_value = retarget(value)
+                if new_value != value:
+                    container[child_key] = new_value
+            elif isinstance(value, list):
+                for position, child in enumerate(value):
+                    if isinstance(child, dict):
+                        stack.extend((child, grandchild) for grandchild in child)
+                    elif isinstance(child, str):
+                        new_value = retarget(child)
+                        if new_value != child:
+                            value[position] = new_value
+
+    @staticmethod
+    def _position(level: list, item: dict) -> int:
+        for position, candidate in enumerate(level):
+            if candidate is item:
+                return position
+        return -1
+
+    def _emit(self, event_type, path: str, level: list | None, item: dict | None, position: int | None = None, **extra) -> None:
+        if not self._listeners:
+            return
+        if position is None:
+            position = self._position(level, item)
+        event = event_type(path=path, parent=path.rpartition('.')[0], position=position, **extra)
+        for listener in list(self._listeners):
+            listener(event)
+
+    def _forget_children(self, path: str, value) -> None:
+        """Remove dos índices tudo o que estiver abaixo de 'path'."""
+        stack = [(path, value)]
+        while stack:
+            prefix, level = stack.pop()
+            if not isinstance(level, list):
+                continue
+            self._levels.pop(id(level), None)
+            for item in level:
+                if isinstance(item, dict):
+                    for key, child in item.items():
+                        child_path = f"{prefix}.{key}"
+                        self._paths.pop(child_path, None)
+                        stack.append((child_path, child))
+
+
+def organize_nav_indexes(nav: list, paths=None) -> list:
+    """
+    Reorganiza os indexes para que fiquem sempre como o primeiro item de cada pasta no nav.
+    Exemplo:
+    - CMES:
+        - CMES: Aplicações/CMES/index.md
+        - Outro: ...
+
+    A reordenação é feita no lugar, em uma passada por pasta, mantendo os tipos
+    do ruamel (CommentedMap/CommentedSeq) e seus comentários. Com 'paths'
+    (caminhos pontuados de pastas) só essas subárvores são reorganizadas.
+    Retorna o próprio 'nav'.
+    """
+    with _profiling.span("organize_nav_indexes"):
+        if not isinstance(nav, list):
+            # CompactNav: a mesma regra, aplicada sobre as tabelas
+            return nav.organize(paths)
+        if paths is None:
+            for item in nav:
+                if isinstance(item, dict):
+                    _organize_item(item)
+            return nav
+
+        tree = NavTree(nav)
+        for path in dict.fromkeys(paths):
+            value = tree.get(path)
+            if isinstance(value, list):
+                _organize_folder(path.rpartition('.')[2], value)
+        return nav
+
+def _organize_item(item: dict) -> None:
+    for key, value in item.items():
+        if isinstance(value, list):
+            _organize_folder(key, value)
+
+def _organize_folder(key, level: list) -> None:
+    """
+    Index da própria pasta primeiro e depois o resto, na ordem relativa original.
+    Sem index da pasta, os demais indexes vão para o topo; com ele, são descartados.
+    """
+    dir_index = None
+    indexes = []
+    others = []
+    for position, item in enumerate(level):
+        if isinstance(item, dict):
+            folder_index = False
+            for subkey, value in item.items():
+                if isinstance(value, list):
+                    _organize_folder(subkey, value)
+                elif subkey == key and len(item) == 1 and _is_index(value):
+                    folder_index = True
+            if folder_index:
+                if dir_index is None:
+                    dir_index = position
                 else:
-                    raise TypeError(f"Nível '{key}' não é uma lista (type={type(current)})")
-                current = new_level[key]
-            else:
-                if not isinstance(current, list):
-                    raise TypeError(f"Nível final não é lista (type={type(current)})")
-                current.append({key: file_path})
+                    indexes.append(position)
+                continue
+        elif _is_index(item):
+            indexes.append(position)
+            continue
+        others.append(position)
 
-    return nav
+    order = ([dir_index] if dir_index is not None else indexes) + others
+    if len(order) != len(level) or any(old != new for new, old in enumerate(order)):
+        _reorder(level, order)
+
+def _is_index(value) -> bool:
+    return isinstance(value, str) and value.endswith("index.md")
+
+def _reorder(level: list, order: list[int]) -> None:
+    """
+    Aplica a nova ordem (posições antigas; as que faltam são removidas) sem o
+    insert item a item do CommentedSeq.
+    """
+    current = list(level)
+    items = [current[old] for old in order]
+    list.__setitem__(level, slice(None), items)
+    comments = getattr(getattr(level, "ca", None), "items", None)
+    if comments:
+        # comentários do ruamel ficam presos à posição do item na lista
+        moved = {new: comments[old] for new, old in enumerate(order) if old in comments}
+        comments.clear()
+        comments.update(moved)
+
+def nav_tree(nav):
+    """
+    Árvore para operar sobre 'nav': um NavTree sobre a lista, ou o próprio
+    objeto quando ele já é uma árvore (CompactNav, ver MKDOCS_COMPACT_NAV).
+    """
+    return NavTree(nav) if isinstance(nav, list) else nav
+
+def nav_add(nav: list, path: str, file_path: str) -> list:
+    """Adiciona um item à estrutura nav do mkdocs.yml."""
+    return nav_tree(nav).add(path, file_path)
 
 def nav_remove(nav: list, path: str) -> list:
     """Remove apenas o item selecionado e seus filhos da estrutura nav do mkdocs.yml."""
-    keys = path.split('.')
-    current = nav
-    stack = []
-    for key in keys:
-        found = None
-        parent = current
-        for item in current:
-            if isinstance(item, dict) and key in item:
-                found = item
-                break
-        if not found:
-            return nav
-        stack.append((parent, found, key))
-        if isinstance(found[key], list):
-            current = found[key]
-        else:
-            break
-    # Remove apenas o item selecionado
-    parent, found, key = stack.pop()
-    parent.remove(found)
-    # Se o pai ficou vazio, remove o pai (limpeza de níveis vazios)
-    while stack:
-        parent, found, key = stack.pop()
-        if isinstance(found[key], list) and not found[key]:
-            parent.remove(found)
-        else:
-            break
-    return nav
+    return nav_tree(nav).remove(path)
 
 def nav_update(nav: list, path: str, new_file: str) -> bool:
     """
@@ -72,42 +588,56 @@ def nav_update(nav: list, path: str, new_file: str) -> bool:
         path = "Aplicações.Teste.Brincadeira"
         new_file = "Aplicações/Teste/Brincadeira/novo.md"
     """
-    keys = path.split('.')
-    current = nav
-    for i, key in enumerate(keys):
-        found = None
-        for item in current:
-            if isinstance(item, dict) and key in item:
-                found = item
-                break
-        if found is None:
-            return False
-
-        if i == len(keys) - 1:
-            found[key] = new_file
-            return True
-        else:
-            next_level = found[key]
-            if not isinstance(next_level, list):
-                return False
-            current = next_level
-    return False
+    return nav_tree(nav).update(path, new_file)
 
 def nav_get(nav: list, path: str) -> None | str | list:
-    keys = path.split('.')
-    current = nav
-    for i, key in enumerate(keys):
-        found = None
-        for item in current:
-            if isinstance(item, dict) and key in item:
-                found = item[key]
-                break
-        if found is None:
-            return None
-        # se for o último nível, deve retornar somente se ele existir exatamente
-        if i == len(keys) - 1:
-            return found
-        if not isinstance(found, list):
-            return None
-        current = found
-    return None
+    return nav_tree(nav).get(path)
+
+def three_way_merge(base, ours, theirs) -> list[NavConflict]:
+    """
+    Aplica em 'theirs' as alterações de 'ours' em relação a 'base', documento a
+    documento (cada nav pode ser uma lista ou uma árvore; 'theirs' é alterado no lugar):
+    - só 'ours' mudou o documento: vale o de 'ours' (adicionado, trocado ou removido);
+    - só 'theirs' mudou, ou os dois mudaram igual: fica o de 'theirs';
+    - os dois mudaram de formas diferentes: conflito, e 'theirs' fica como estava ali.
+
+    Documentos novos entram no fim da pasta em 'theirs' e pastas que ficarem vazias
+    saem, como em add()/remove(); um documento de 'theirs' nunca vira pasta por causa
+    de um documento novo. Seções vazias e itens sem arquivo não são comparados.
+    Retorna os conflitos (lista vazia = merge completo).
+    """
+    theirs_tree = nav_tree(theirs)
+    base_files = {path: file for path, file in nav_tree(base).entries() if file is not None}
+    ours_files = {path: file for path, file in nav_tree(ours).entries() if file is not None}
+    # caminho -> arquivo, ou None para as pastas de 'theirs'
+    theirs_entries = dict(theirs_tree.entries())
+    conflicts: list[NavConflict] = []
+    removed = set()
+
+    # remoções primeiro: um documento que virou pasta em 'ours' libera o caminho para os filhos
+    for path, file in base_files.items():
+        if path in ours_files:
+            continue
+        current = theirs_entries.get(path)
+        if current == file:
+            theirs_tree.remove(path)
+            removed.add(path)
+        elif current is not None:
+            conflicts.append(NavConflict(path, file, None, current))
+
+    for path, file in ours_files.items():
+        before = base_files.get(path)
+        current = theirs_entries.get(path)
+        if file == before or file == current:
+            continue
+        free = path not in theirs_entries and before is None
+        if not (free or (current == before and before is not None)):
+            conflicts.append(NavConflict(path, before, file, current))
+            continue
+        keys = path.split('.')
+        parents = ('.'.join(keys[:i]) for i in range(1, len(keys)))
+        if any(isinstance(theirs_entries.get(parent), str) and parent not in removed for parent in parents):
+            conflicts.append(NavConflict(path, before, file, None))
+            continue
+        theirs_tree.add(path, file)
+    return conflicts
@@ -0,0 +1,150 @@
+import errno as _errno
+import hashlib as _hashlib
+import os as _os
+import shutil as _shutil
+import tempfile as _tempfile
+from pathlib import Path as _Path
+from docwriter import config as _config, profiling as _profiling
+
+COPY = "copy"
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+SYMLINK = "symlink"
+STRATEGIES = (COPY, REFLINK, HARDLINK, SYMLINK)
+# Armazenamento por conteúdo: tratado pelo Project com um store.ContentStore, não por place()
+CAS = "cas"
+
+# Resultado de place() quando o destino já tinha o mesmo conteúdo
+SKIPPED = "skip"
+
+_CHUNK_SIZE = 8 * 1024 * 1024
+# ioctl FICLONE do Linux (btrfs, xfs com reflink=1, bcachefs...)
+_FICLONE = 0x40049409
+# Erros que indicam "não suportado aqui", e não uma falha real
+_UNSUPPORTED = {_errno.EXDEV, _errno.EPERM, _errno.EINVAL, _errno.ENOTTY, _errno.ENOSYS,
+                getattr(_errno, "EOPNOTSUPP", _errno.ENOSYS), getattr(_errno, "ENOTSUP", _errno.ENOSYS)}
+
+
+def place(source, target, strategy: str | None = None) -> str:
+    """
+    Coloca 'source' em 'target' sem carregar o arquivo inteiro na memória.
+
+    strategy = copy | reflink | hardlink | symlink (None usa MKDOCS_PLACEMENT).
+    Se a estratégia não for suportada pelo sistema de arquivos, cai para copy.
+    Se o destino já tiver o mesmo conteúdo, nada é escrito.
+    Retorna a estratégia efetivamente usada, ou SKIPPED.
+    """
+    strategy = strategy or _config.MKDOCS_PLACEMENT
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia de cópia inválida: {strategy} (use {', '.join(STRATEGIES)})")
+    source, target = _Path(source), _Path(target)
+
+    with _profiling.span("place"):
+        if _already_placed(source, target, strategy):
+            return SKIPPED
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if strategy == HARDLINK and replace_with(target, lambda temp: _os.link(source, temp)):
+            return HARDLINK
+        if strategy == SYMLINK and replace_with(target, lambda temp: _os.symlink(source.resolve(), temp)):
+            return SYMLINK
+        if strategy == REFLINK and replace_with(target, lambda temp: _reflink(source, temp)):
+            return REFLINK
+        replace_with(target, lambda temp: copy_file(source, temp), fallback=False)
+        return COPY
+
+def file_hash(path, algorithm: str = "sha256") -> str:
+    """Hash do conteúdo lido em blocos, sem carregar o arquivo inteiro."""
+    with _profiling.span("file_hash"), open(path, "rb") as f:
+        return _hashlib.file_digest(f, algorithm).hexdigest()
+
+def replace_with(target: _Path, create, fallback: bool = True) -> bool:
+    """
+    Cria o novo arquivo em um nome temporário na mesma pasta e só então troca o
+    destino com os.replace: um hard link antigo nunca é sobrescrito no lugar
+    (o que alteraria também o arquivo de origem).
+
+    create(temp) gera o conteúdo. Com fallback=True, um erro de "não suportado
+    aqui" retorna False em vez de ser levantado.
+    """
+    fd, temp = _tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    _os.close(fd)
+    try:
+        if fallback:
+            # link/symlink exigem que o nome ainda não exista
+            _os.remove(temp)
+        create(temp)
+        _os.replace(temp, target)
+        return True
+    except OSError as ex:
+        if fallback and (ex.errno in _UNSUPPORTED or getattr(ex, "winerror", None) is not None):
+            return False
+        raise
+    finally:
+        if _os.path.lexists(temp):
+            _os.remove(temp)
+
+def copy_file(source: _Path, temp: str) -> None:
+    """
+    Copia 'source' para o arquivo 'temp' em blocos pelo kernel (copy_file_range/sendfile),
+    com fallback em espaço de usuário; mantém as datas e permissões da origem.
+    """
+    with open(source, "rb") as src, open(temp, "wb") as dst:
+        size = _os.fstat(src.fileno()).st_size
+        _profiling.count("bytes.copied", size)
+        for kernel_copy in (_copy_file_range, _sendfile):
+            try:
+                kernel_copy(src.fileno(), dst.fileno(), size)
+                break
+            except OSError as ex:
+                if ex.errno not in _UNSUPPORTED:
+                    raise
+                # recomeça do zero com o próximo método
+                dst.seek(0)
+                dst.truncate()
+                src.seek(0)
+        else:
+            _shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+    _shutil.copystat(source, temp)
+
+def _already_placed(source: _Path, target: _Path, strategy: str) -> bool:
+    if strategy == SYMLINK:
+        return target.is_symlink() and target.resolve() == source.resolve()
+    if target.is_symlink() or not target.is_file():
+        return False
+    if _os.path.samefile(source, target):
+        return True
+    if strategy == HARDLINK:
+        # mesmo conteúdo em outro inode ainda vira link, para economizar espaço
+        return False
+    if source.stat().st_size != target.stat().st_size:
+        return False
+    return file_hash(source) == file_hash(target)
+
+def _reflink(source: _Path, temp: str) -> None:
+    try:
+        import fcntl as _fcntl
+    except ImportError:
+        raise OSError(_errno.ENOSYS, "reflink não suportado nesta plataforma") from None
+    with open(source, "rb") as src, open(temp, "wb") as dst:
+        _fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+def _copy_file_range(src: int, dst: int, size: int) -> None:
+    if not hasattr(_os, "copy_file_range"):
+        raise OSError(_errno.ENOSYS, "copy_file_range indisponível")
+    offset = 0
+    while offset < size:
+        copied = _os.copy_file_range(src, dst, min(_CHUNK_SIZE, size - offset))
+        if copied == 0:
+            break
+        offset += copied
+
+def _sendfile(src: int, dst: int, size: int) -> None:
+    if not hasattr(_os, "sendfile"):
+        raise OSError(_errno.ENOSYS, "sendfile indisponível")
+    offset = 0
+    while offset < size:
+        sent = _os.sendfile(dst, src, offset, min(_CHUNK_SIZE, size - offset))
+        if sent == 0:
+            break
+        offset += sent
@@ -0,0 +1,185 @@
+"""
+Instrumentação opcional das operações do docwriter: tempos e contadores.
+
+Desligada, cada ponto instrumentado custa só a checagem de 'active'. Ela é
+ligada por profile() ou pela variável DOCWRITER_PROFILE:
+
+    with profiling.profile() as report:
+        core.index("Pasta.Doc", "C:/docs/doc.md")
+    print(report.format())
+
+Com DOCWRITER_PROFILE=1 cada operação do Project (index, unindex, move...)
+escreve o detalhamento na saída de erro ao terminar; com um caminho de arquivo,
+o detalhamento é acrescentado a esse arquivo.
+
+Os tempos ficam agrupados pelo caminho dos trechos aninhados
+("project.index > commit > yaml.dump"), com o total e o tempo próprio (sem os
+trechos internos). Contadores: yaml.load, yaml.dump, bytes.copied, nav.nodes.
+"""
+import functools as _functools
+import sys as _sys
+import threading as _threading
+import time as _time
+from contextlib import contextmanager as _contextmanager, nullcontext as _nullcontext
+from docwriter import config as _config
+
+# True enquanto houver algum relatório coletando; os pontos mais quentes só checam isto
+active = False
+
+# Relatórios abertos por profile(), e o da variável DOCWRITER_PROFILE (None se desligada)
+_reports: list["Report"] = []
+_env_report: "Report | None" = None
+# Valor de DOCWRITER_PROFILE, consultado no primeiro span()
+_env_target: str | None = None
+_env_checked = False
+_lock = _threading.Lock()
+_local = _threading.local()
+_NULL = _nullcontext()
+
+
+class Report:
+    """Tempos e contadores coletados."""
+
+    def __init__(self):
+        # caminho dos trechos -> [chamadas, segundos no total, segundos próprios]
+        self.spans: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+
+    def total(self, name: str) -> float:
+        """Tempo próprio somado de todos os trechos chamados 'name', em qualquer nível."""
+        return sum(own for path, (_, _, own) in self.spans.items() if path.rpartition(" > ")[2] == name)
+
+    def summary(self, top: int = 3) -> str:
+        """Uma linha: tempo total e os trechos com mais tempo próprio (para a barra de status)."""
+        roots = sum(total for path, (_, total, _) in self.spans.items() if " > " not in path)
+        by_name: dict[str, float] = {}
+        for path, (_, _, own) in self.spans.items():
+            name = path.rpartition(" > ")[2]
+            by_name[name] = by_name.get(name, 0.0) + own
+        parts = [f"{name} {seconds * 1000:.1f} ms"
+                 for name, seconds in sorted(by_name.items(), key=lambda item: -item[1])[:top]]
+        return f"{roots * 1000:.1f} ms" + (f" ({', '.join(parts)})" if parts else "")
+
+    def format(self) -> str:
+        """Detalhamento em texto: um trecho por linha, indentado pelo nível, e os contadores."""
+        lines = []
+        for path in sorted(self.spans):
+            calls, total, own = self.spans[path]
+            depth = path.count(" > ")
+            name = path.rpartition(" > ")[2]
+            lines.append(f"{'  ' * depth}{name:<{40 - 2 * depth}} {total * 1000:10.2f} ms {own * 1000:10.2f} ms {calls:6}x")
+        if self.counters:
+            lines.append("  ".join(f"{name}={value}" for name, value in sorted(self.counters.items())))
+        return "\n".join(lines)
+
+    def _add_span(self, path: str, total: float, own: float) -> None:
+        entry = self.spans.get(path)
+        if entry is None:
+            self.spans[path] = [1, total, own]
+        else:
+            entry[0] += 1
+            entry[1] += total
+            entry[2] += own
+
+
+class _Span:
+    __slots__ = ("name", "operation", "path", "start", "children")
+
+    def __init__(self, name: str, operation: bool):
+        self.name = name
+        self.operation = operation
+
+    def __enter__(self):
+        stack = _stack()
+        self.path = f"{stack[-1].path} > {self.name}" if stack else self.name
+        self.children = 0.0
+        stack.append(self)
+        self.start = _time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = _time.perf_counter() - self.start
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        with _lock:
+            for report in _collecting():
+                report._add_span(self.path, elapsed, elapsed - self.children)
+        if self.operation and not stack and _env_report is not None:
+            _dump_env_report()
+        return False
+
+
+def span(name: str, operation: bool = False):
+    """
+    Trecho cronometrado (with span("yaml.dump"): ...). operation=True marca uma
+    operação completa: com DOCWRITER_PROFILE, o detalhamento é escrito quando ela termina.
+    """
+    if not active and not _check_env():
+        return _NULL
+    return _Span(name, operation)
+
+def count(name: str, amount: int = 1) -> None:
+    if not active:
+        return
+    with _lock:
+        for report in _collecting():
+            report.counters[name] = report.counters.get(name, 0) + amount
+
+def operation(name: str):
+    """Decorador: a chamada inteira vira um span(name, operation=True)."""
+    def decorator(function):
+        @_functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, operation=True):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@_contextmanager
+def profile():
+    """Coleta tudo o que acontecer (em qualquer thread) dentro do bloco em um Report."""
+    global active
+    report = Report()
+    with _lock:
+        _reports.append(report)
+        active = True
+    try:
+        yield report
+    finally:
+        with _lock:
+            _reports.remove(report)
+            active = bool(_reports) or _env_report is not None
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def _collecting() -> list:
+    return _reports + [_env_report] if _env_report is not None else _reports
+
+def _check_env() -> bool:
+    """Consulta DOCWRITER_PROFILE uma vez; True se a coleta ficou ligada por ela."""
+    global _env_checked, _env_target, _env_report, active
+    if _env_checked:
+        return False
+    _env_checked = True
+    _env_target = _config.DOCWRITER_PROFILE
+    if _env_target:
+        _env_report = Report()
+        active = True
+    return active
+
+def _dump_env_report() -> None:
+    global _env_report
+    with _lock:
+        report, _env_report = _env_report, Report()
+    text = report.format()
+    if _env_target in ("1", "true", "yes", "stderr"):
+        print(text, file=_sys.stderr)
+    else:
+        with open(_env_target, "a", encoding="utf-8") as f:
+            f.write(text + "\n\n")
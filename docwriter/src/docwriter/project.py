@@ -0,0 +1,1046 @@
+import os as _os
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor, as_completed as _as_completed
+from contextlib import contextmanager as _contextmanager
+from pathlib import Path as _Path
+from docwriter import config as _config, profiling as _profiling
+from docwriter.yaml_io import write_config as _write_config, read_config as _read_config, read_section as _read_section, invalidate as _invalidate, read_nav_shards as _read_nav_shards, write_nav_shards as _write_nav_shards, write_merged_config as _write_merged_config, read_nav_compact as _read_nav_compact, write_nav_compact as _write_nav_compact, snapshot as _snapshot, changed_since as _changed_since, parse_nav as _parse_nav, NAV_MANIFEST as _NAV_MANIFEST, _stamp as _file_stamp
+from docwriter.navtree import NavTree as _NavTree, NavMoved as _NavMoved, NavUpdated as _NavUpdated, organize_nav_indexes as _organize_nav_indexes, three_way_merge as _three_way_merge, Retarget as _Retarget
+from docwriter.locking import locked as _locked
+from docwriter.journal import Journal as _Journal, Recorder as _Recorder, apply as _apply_ops, mark as _journal_mark, replay as _replay
+from docwriter.exceptions import MkdocsConcurrencyError as _MkdocsConcurrencyError, MkdocsConflictError as _MkdocsConflictError, MkdocsFileNotFoundError as _MkdocsFileNotFoundError, MkdocsIndexingError as _MkdocsIndexingError, MkdocsIndexingWriteError as _MkdocsIndexingWriteError, MkdocsUtilsError as _MkdocsUtilsError, MkdocsUnindexingError as _MkdocsUnindexingError, MkdocsUnindexingWriteError as _MkdocsUnindexingWriteError
+from docwriter.utils import yamlpath_to_filepath as _yamlpath_to_filepath
+from docwriter.placement import CAS as _CAS, place as _place
+from docwriter.store import ContentStore as _ContentStore
+from docwriter.compact import CompactNav as _CompactNav
+from docwriter.manifest import FolderManifest as _FolderManifest
+from docwriter.search import NavIndex as _NavIndex, SearchHit as _SearchHit
+from docwriter.consistency import Drift as _Drift, compare as _compare, nav_files as _nav_files, scan_docs as _scan_docs, scan_tree as _scan_tree, yaml_path_for as _yaml_path_for
+
+
+# Diários abertos neste processo: (caminho absoluto, modo compacto) -> Journal. Como o
+# nav em cache do yaml_io, que é o mesmo objeto para todos os Project do arquivo, o
+# diário e o nav que já tem as entradas dele (Journal.nav) também são compartilhados
+_journals: dict[tuple[str, bool], _Journal] = {}
+
+
+class _Transaction:
+    """
+    Alterações pendentes de uma transação: o nav é alterado em memória e as
+    cópias/remoções de arquivos ficam adiadas até o commit, que grava o
+    arquivo de configuração uma única vez.
+
+    A concorrência é otimista: o arquivo não fica travado durante a transação.
+    No commit, com a trava do arquivo (locking), se outro processo gravou desde
+    o início, as alterações desta transação são aplicadas sobre o nav atual
+    (three_way_merge) em vez de sobrescrevê-lo; se conflitarem, nada é gravado.
+
+    No modo diário (MKDOCS_JOURNAL) o commit não grava o arquivo: as operações
+    da transação viram uma entrada do diário, e as remoções de arquivos ficam
+    para a compactação (assim uma entrada desfeita não perde documentos).
+    """
+
+    def __init__(self, project: "Project", workers: int = 1, progress=None):
+        self.project = project
+        self.journaled = project._journaled()
+        # arquivo no início da transação: token da concorrência otimista e base do merge
+        # (no diário basta o stat, para saber se houve uma compactação no meio)
+        if project.nav_dir:
+            self.base = None
+        elif self.journaled:
+            self.base = _file_stamp(project.config_path)
+        else:
+            self.base = _snapshot(project.config_path)
+        # no modo compacto a árvore compartilhada é alterada direto e o resto do arquivo nem é lido
+        self.compact = project._compact()
+        self.workers = max(1, workers)
+        self.progress = progress
+        if project.nav_dir or self.compact or self.journaled:
+            # no diário o nav já vem com as entradas pendentes aplicadas
+            nav = project.get_nav()
+        self.cfg = project.config if not self.compact else None
+        if not (project.nav_dir or self.compact or self.journaled):
+            nav = self.cfg.get('nav') if isinstance(self.cfg, dict) else None
+        if self.compact:
+            self.tree = nav
+        else:
+            self.tree = _NavTree(nav if isinstance(nav, list) else [])
+        if self.journaled:
+            self.tree = _Recorder(self.tree)
+        self.events: list = []
+        self.tree.subscribe(self.events.append)
+        self.dirty = False
+        # pastas que ganharam index.md e precisam ser reorganizadas no commit
+        self.organize: list[str] = []
+        self.copies: list[tuple[str, str]] = []
+        self.removals: list[tuple[str, str]] = []
+        self.created: list[_Path] = []
+        self.created_dirs: list[_Path] = []
+        # pastas renomeadas por move(): (origem, destino) pendentes e já feitas no commit
+        self.renames: list[tuple[_Path, _Path]] = []
+        self.renamed: list[tuple[_Path, _Path]] = []
+        # funções chamadas em finish(), depois da gravação (ex.: o manifesto de index_all_folders)
+        self.after: list = []
+
+    def touch(self) -> None:
+        if not self.project.nav_dir and not self.compact:
+            self.cfg['nav'] = self.tree.nav
+        self.dirty = True
+
+    def commit(self) -> None:
+        with _profiling.span("commit"):
+            self._commit()
+
+    def _commit(self) -> None:
+        if self.organize:
+            # só as pastas alteradas na transação, reordenadas no lugar
+            if self.journaled:
+                self.tree.organize(self.organize)
+            else:
+                _organize_nav_indexes(self.tree.nav, self.organize)
+            for folder in dict.fromkeys(self.organize):
+                self.events.append(_NavUpdated(path=folder, parent=folder.rpartition('.')[0], position=self.tree.position(folder)))
+        seen = set()
+        # as pastas são renomeadas antes das cópias, que já usam os caminhos novos
+        for source, target in self.renames:
+            self._track_dirs(target.parent, seen)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            source.rename(target)
+            self.renamed.append((source, target))
+        for yaml_path, file_path in self.copies:
+            target = self.project._target_file(yaml_path, file_path)
+            if not target.exists():
+                self.created.append(target)
+                self._track_dirs(target.parent, seen)
+        self._copy_documents()
+        if self.project._placement() == _CAS:
+            self.project.store.flush()
+        if not self.dirty:
+            return
+        if self.project.nav_dir:
+            # só os arquivos das seções do primeiro nível que foram alteradas
+            sections = set()
+            for event in self.events:
+                sections.add(event.path.split('.')[0])
+                if isinstance(event, _NavMoved):
+                    sections.add(event.old_path.split('.')[0])
+            _write_nav_shards(self.project.nav_dir, self.tree.nav, sections, self.project.backups)
+        else:
+            with _locked(self.project.config_path):
+                if self.journaled:
+                    self._append()
+                    return
+                self._rebase()
+                if self.compact:
+                    _write_nav_compact(self.project.config_path, self.tree, self.project.backups)
+                else:
+                    # as transações só alteram o nav: o resto do arquivo fica como está
+                    _write_config(self.project.config_path, self.cfg, self.project.backups, key='nav')
+
+    def _rebase(self) -> None:
+        """
+        Se o arquivo mudou desde o início da transação, troca o nav a gravar pelo
+        nav atual do disco com as alterações desta transação aplicadas por cima.
+        Conflitos levantam MkdocsConflictError (e a transação é desfeita).
+        """
+        config_path = self.project.config_path
+        if _changed_since(config_path, self.base) is None:
+            return
+        with _profiling.span("merge"):
+            base = _parse_nav(self.base[1])
+            _invalidate(config_path)
+            if self.compact:
+                theirs = _read_nav_compact(config_path)
+            else:
+                cfg = _read_config(config_path)
+                if not isinstance(cfg, dict):
+                    raise _MkdocsConflictError()
+                if not isinstance(cfg.get('nav'), list):
+                    cfg['nav'] = []
+                theirs = _NavTree(cfg['nav'])
+            conflicts = _three_way_merge(base, self.tree, theirs)
+            if conflicts:
+                raise _MkdocsConflictError(conflicts)
+            if self.organize:
+                _organize_nav_indexes(theirs.nav, self.organize)
+        self.tree.unsubscribe(self.events.append)
+        self.tree = theirs
+        if not self.compact:
+            self.cfg = cfg
+
+    def _append(self) -> None:
+        """Grava as operações da transação como uma entrada do diário."""
+        project = self.project
+        journal = project._journal()
+        if journal.stale() or _file_stamp(project.config_path) != self.base:
+            # outro processo acrescentou ao diário ou compactou desde o início: as
+            # operações desta transação são reaplicadas sobre o nav atual, na mesma
+            # ordem em que vão ficar no diário
+            ops = self.tree.ops
+            _invalidate(project.config_path)
+            nav = project.get_nav()
+            tree = nav if self.compact else _NavTree(nav)
+            _apply_ops(tree, ops)
+            self.tree.unsubscribe(self.events.append)
+            self.tree = _Recorder(tree, ops)
+            if not self.compact:
+                self.cfg = project.config
+        journal.write_entry(self.tree.ops, self.removals)
+
+    def _track_dirs(self, folder: _Path, seen: set) -> None:
+        """Guarda as pastas que ainda não existem até 'folder', para o rollback removê-las."""
+        missing = []
+        while folder not in seen and not folder.exists():
+            missing.append(folder)
+            seen.add(folder)
+            folder = folder.parent
+        self.created_dirs.extend(reversed(missing))
+
+    def _copy_documents(self) -> None:
+        with _profiling.span("copy_documents"):
+            self._copy_all()
+
+    def _copy_all(self) -> None:
+        map_folders = self.project._map_folders
+        total = len(self.copies)
+        if self.workers == 1 or total < 2:
+            for done, (yaml_path, file_path) in enumerate(self.copies, 1):
+                map_folders(yaml_path, file_path)
+                if self.progress:
+                    self.progress(done, total)
+            return
+        # As cópias são I/O puro: em paralelo, com o progresso reportado nesta thread
+        with _ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(map_folders, yaml_path, file_path) for yaml_path, file_path in self.copies]
+            try:
+                for done, future in enumerate(_as_completed(futures), 1):
+                    future.result()
+                    if self.progress:
+                        self.progress(done, total)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def finish(self) -> None:
+        """Remoções físicas só acontecem depois que a configuração foi gravada."""
+        if not self.journaled:
+            for yaml_path, file_path in self.removals:
+                self.project._unmap_folders(yaml_path, file_path)
+        self.project._deliver(self.events, self.tree.nav)
+        for callback in self.after:
+            callback()
+        limit = _config.MKDOCS_JOURNAL_LIMIT
+        if self.journaled and self.dirty and limit and self.project._journal().pending() >= limit:
+            self.project.compact_journal()
+
+    def rollback(self) -> None:
+        # O arquivo só é gravado no commit, então ele ainda tem o nav original
+        if (self.dirty or self.organize) and self.project.nav_dir:
+            # as seções voltam a ser lidas dos arquivos no próximo get_nav()
+            _invalidate(self.project.nav_dir)
+        elif (self.dirty or self.organize) and self.journaled:
+            # o próximo get_nav() relê o arquivo e reaplica o diário
+            _invalidate(self.project.config_path)
+        elif (self.dirty or self.organize) and self.compact:
+            # a árvore compartilhada foi alterada; a próxima leitura monta outra a partir do arquivo
+            _invalidate(self.project.config_path)
+        elif self.dirty or self.organize:
+            # o cache compartilha o objeto alterado em memória, força uma nova leitura
+            _invalidate(self.project.config_path)
+            disk = _read_config(self.project.config_path)
+            if isinstance(disk, dict) and 'nav' in disk:
+                self.cfg['nav'] = disk['nav']
+            else:
+                self.cfg.pop('nav', None)
+        for target in reversed(self.created):
+            target.unlink(missing_ok=True)
+        for source, target in reversed(self.renamed):
+            target.rename(source)
+        # Pastas criadas pelas cópias só são removidas se ficaram vazias
+        for folder in reversed(self.created_dirs):
+            if folder.is_dir() and not any(folder.iterdir()):
+                folder.rmdir()
+
+
+class Project:
+    """
+    Um site mkdocs: arquivo de configuração, pasta de documentação e a
+    configuração carregada sob demanda.
+
+    Nada é lido na criação do objeto; a configuração é lida no primeiro uso e
+    relida (pelo cache do yaml_io) só quando o arquivo muda no disco. Vários
+    projetos podem ser usados no mesmo processo.
+
+        project = Project("mkdocs.yml", "docs")
+        project.index("Aplicações.Teste", "C:/docs/teste.md")
+    """
+
+    def __init__(self, config_path: str, doc_root: str, new_section_text: str | None = None,
+                 placement: str | None = None, backups: int | None = None, nav_dir: str | None = None,
+                 compact: bool | None = None, journal: bool | None = None):
+        self.config_path = str(config_path)
+        self.doc_root = str(doc_root)
+        # Pasta com um arquivo por seção do nav (ver split_nav); None = nav dentro do arquivo de configuração
+        self.nav_dir = str(nav_dir) if nav_dir else None
+        self.new_section_text = new_section_text
+        # None = usar MKDOCS_PLACEMENT / MKDOCS_CONFIG_BACKUPS
+        self.placement = placement
+        self.backups = backups
+        # None = usar MKDOCS_COMPACT_NAV; ignorado quando há nav_dir
+        self.compact = compact
+        # None = usar MKDOCS_JOURNAL; ignorado quando há nav_dir
+        self.journal = journal
+        # Usado quando a estratégia é "cas"; nada é lido do disco até o primeiro documento
+        self.store = _ContentStore.for_docs(self.doc_root)
+        # Transação ativa (ver transaction()); None quando cada operação grava sozinha
+        self._transaction: _Transaction | None = None
+        # Callbacks que recebem os NavEvent de cada alteração confirmada (ver subscribe())
+        self._listeners: list = []
+        # Índice de busca (ver search_index()) e o nav a partir do qual ele foi montado
+        self._search: _NavIndex | None = None
+        self._search_source = None
+
+    @classmethod
+    def from_env(cls, config_path: str | None = None, doc_root: str | None = None) -> "Project":
+        """
+        Cria o projeto a partir de MKDOCS_CONFIG_PATH e MKDOCS_DOC_ROOT_PATH
+        (arquivo .env ou ambiente); os argumentos têm prioridade sobre as variáveis.
+        """
+        config_path = config_path or _config.MKDOCS_CONFIG_PATH
+        doc_root = doc_root or _config.MKDOCS_DOC_ROOT_PATH
+
+        if not config_path:
+            raise _MkdocsFileNotFoundError(
+                f"MkDocs configuration file not found: {config_path}")
+
+        if not doc_root:
+            raise _MkdocsFileNotFoundError(
+                f"MkDocs Documentation folder not found: {doc_root}")
+
+        return cls(config_path, doc_root, _config.DEFAULT_TEXT_FOR_NEW_SECTIONS, nav_dir=_config.MKDOCS_NAV_DIR)
+
+    def __repr__(self) -> str:
+        return f"Project({self.config_path!r}, {self.doc_root!r})"
+
+    @property
+    def config(self) -> dict | list:
+        """Configuração carregada (compartilhada com o cache do yaml_io)."""
+        return _read_config(self.config_path)
+
+    def get_nav(self) -> list | _CompactNav | None:
+        """Nav para alteração: a lista do ruamel ou, no modo compacto, a CompactNav."""
+        if self.nav_dir:
+            return _read_nav_shards(self.nav_dir)
+        if self._journaled():
+            return self._catch_up()
+        if self._compact():
+            return _read_nav_compact(self.config_path)
+        cf = self.config
+        if not isinstance(cf, dict):
+            return
+        return cf['nav']
+
+    def read_nav(self) -> list:
+        """
+        Nav somente para consulta: lê e analisa só o bloco nav do arquivo, sem o
+        round-trip completo. Não deve ser alterado; para isso use get_nav().
+        """
+        if self.nav_dir:
+            return _read_nav_shards(self.nav_dir)
+        if self._journaled():
+            # o bloco nav do arquivo não tem as entradas do diário
+            return self._catch_up() or []
+        if self._compact():
+            return _read_nav_compact(self.config_path)
+        nav = _read_section(self.config_path, 'nav')
+        return nav if isinstance(nav, list) else []
+
+    @_profiling.operation("project.split_nav")
+    def split_nav(self) -> list[str]:
+        """
+        Passa o nav do arquivo de configuração para nav_dir, um arquivo por seção
+        do primeiro nível. Depois disso cada alteração grava só a seção afetada;
+        use merge_nav() para gerar o arquivo completo para o mkdocs build.
+        Retorna os arquivos criados, na ordem do nav.
+        """
+        if not self.nav_dir:
+            raise _MkdocsFileNotFoundError("Pasta de seções do nav não configurada (MKDOCS_NAV_DIR).")
+        cf = self.config
+        nav = cf.get('nav') if isinstance(cf, dict) else None
+        _write_nav_shards(self.nav_dir, nav if isinstance(nav, list) else [], None, self.backups)
+        return list(_read_config(_os.path.join(self.nav_dir, _NAV_MANIFEST)) or [])
+
+    @_profiling.operation("project.merge_nav")
+    def merge_nav(self, output: str | None = None) -> None:
+        """
+        Grava o arquivo de configuração completo, com o nav montado a partir de
+        nav_dir, em 'output' (None = o próprio arquivo de configuração). O resto
+        do arquivo é copiado como está.
+        """
+        _write_merged_config(self.config_path, self.get_nav() or [], output, self.backups)
+
+    @_profiling.operation("project.compact_journal")
+    def compact_journal(self) -> int:
+        """
+        Grava no arquivo de configuração, com uma única escrita, o nav com as
+        entradas do diário (MKDOCS_JOURNAL), faz as remoções de arquivos que elas
+        adiaram e recomeça o diário vazio. Também roda sozinha quando o diário
+        chega a MKDOCS_JOURNAL_LIMIT operações.
+
+        A mesma escrita marca no arquivo até onde o diário já está nele (journal.mark):
+        se o processo cair antes de recomeçar o diário, essas entradas não são
+        reaplicadas e a próxima compactação termina o trabalho.
+        Retorna a quantidade de operações gravadas.
+        """
+        if not self._journaled() or self._transaction is not None:
+            return 0
+        with _locked(self.config_path):
+            nav = self.get_nav()
+            journal = self._journal()
+            entries = journal.entries()
+            if not journal.records:
+                return 0
+            if entries:
+                generation, seq = journal.generation, entries[-1]["seq"]
+                mark = lambda text: _journal_mark(text, generation, seq)
+                if self._compact():
+                    _write_nav_compact(self.config_path, nav, self.backups, edit=mark)
+                else:
+                    _write_config(self.config_path, self.config, self.backups, key='nav', edit=mark)
+            # as remoções de uma compactação interrompida também são feitas aqui;
+            # um arquivo removido e indexado de novo depois continua no lugar
+            referenced = _nav_files(nav)
+            for entry in journal.entries(compacted=True):
+                for yaml_path, file_path in entry["removals"]:
+                    if _yamlpath_to_filepath(yaml_path, file_path) not in referenced:
+                        self._unmap_folders(yaml_path, file_path)
+            journal.reset()
+        return sum(len(entry["ops"]) for entry in entries)
+
+    @_profiling.operation("project.undo")
+    def undo(self) -> bool:
+        """
+        Desfaz a última transação que ainda está no diário (MKDOCS_JOURNAL); chamadas
+        seguidas voltam uma transação por vez, até a última compactação. O nav é
+        relido do arquivo com as entradas restantes, então quem acompanha o nav pela
+        identidade de get_nav() (interface, índice de busca) passa a exibir o novo.
+
+        As remoções de arquivos só acontecem na compactação, então nada precisa ser
+        restaurado; documentos copiados pela transação desfeita ficam na pasta docs
+        (verify() os mostra como fora do nav).
+        Retorna False se não houver o que desfazer.
+        """
+        if not self._journaled() or self._transaction is not None:
+            return False
+        with _locked(self.config_path):
+            self.get_nav()
+            journal = self._journal()
+            entries = journal.entries()
+            if not entries:
+                return False
+            journal.write_undo(entries[-1]["seq"])
+            # o nav em memória tem a entrada aplicada: é montado de novo a partir do arquivo
+            journal.nav = None
+            _invalidate(self.config_path)
+        return True
+
+    def search_index(self) -> _NavIndex:
+        """
+        Índice de busca do nav atual. É montado na primeira chamada e depois mantido
+        pelos eventos das transações; só é remontado se o nav for relido do disco.
+        """
+        nav = self.get_nav()
+        if self._search is None or self._search_source is not nav:
+            self._search = _NavIndex(nav if isinstance(nav, (list, _CompactNav)) else None)
+            self._search_source = nav
+        return self._search
+
+    @_profiling.operation("project.search")
+    def search(self, query: str, limit: int = 20) -> list[_SearchHit]:
+        """Itens do nav cuja chave, caminho ou arquivo contém as palavras de 'query' (ver NavIndex)."""
+        return self.search_index().search(query, limit)
+
+    def subscribe(self, callback) -> None:
+        """
+        Registra callback(event) para receber um NavEvent (NavAdded, NavRemoved,
+        NavUpdated ou NavMoved) por alteração no nav. Os eventos de uma transação
+        só são entregues depois que ela foi gravada; em caso de rollback, nenhum é.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @_contextmanager
+    def transaction(self, workers: int = 1, progress=None):
+        """
+        Agrupa várias chamadas de index/unindex/index_folder em uma única leitura
+        do nav e uma única escrita do arquivo de configuração.
+
+        As cópias de documentos são feitas no commit, antes da escrita; se qualquer
+        operação falhar, o nav volta ao estado do arquivo e os arquivos criados pela
+        transação são removidos. Transações aninhadas participam da externa.
+
+        workers = threads usadas nas cópias do commit
+        progress = callback(feitos, total) chamado a cada documento copiado
+
+            with project.transaction():
+                project.index("Aplicações.Teste", "C:/docs/teste.md")
+                project.unindex("Aplicações.Antigo")
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        tx = _Transaction(self, workers, progress)
+        self._transaction = tx
+        try:
+            yield tx
+            tx.commit()
+        except BaseException:
+            tx.rollback()
+            raise
+        finally:
+            self._transaction = None
+            tx.tree.unsubscribe(tx.events.append)
+        tx.finish()
+
+    @_profiling.operation("project.batch_index")
+    def batch_index(self, items) -> list[bool]:
+        """
+        Indexa vários documentos com uma única escrita do arquivo de configuração.
+        items = iterável de (yaml_path, file_path)
+        Retorna o resultado de index() para cada item, na mesma ordem.
+        """
+        with self.transaction():
+            return [self.index(yaml_path, file_path) for yaml_path, file_path in items]
+
+    @_profiling.operation("project.import_tree")
+    def import_tree(self, src_dir: str, yaml_prefix: str = "", workers: int = 4, progress=None) -> list[str]:
+        """
+        Indexa todos os arquivos .md de uma pasta, mantendo a hierarquia de pastas.
+
+        Cada documento vira yaml_prefix.Pasta.Subpasta.nome (nome = arquivo sem .md);
+        um index.md vira o índice da própria pasta (Pasta.Subpasta.Subpasta), que é
+        a forma que yamlpath_to_filepath traduz para Pasta/Subpasta/index.md. Pontos
+        nos nomes viram '_', já que o ponto separa os níveis do caminho.
+        Um arquivo X.md ao lado de uma pasta X/ (ou dois nomes que viram a mesma
+        chave) não tem como entrar no nav: MkdocsIndexingError antes de qualquer escrita.
+
+        As inserções no nav entram em uma transação com uma única escrita e as cópias
+        rodam em 'workers' threads. progress = callback(feitos, total) das cópias.
+        Retorna os caminhos indexados (documentos que já existiam são ignorados).
+        """
+        items = []
+        for folder, dirs, files in _os.walk(src_dir):
+            dirs.sort()
+            rel = _os.path.relpath(folder, src_dir)
+            keys = [] if rel == "." else [part.replace('.', '_') for part in rel.split(_os.sep)]
+            if yaml_prefix:
+                keys = yaml_prefix.split('.') + keys
+            # index.md primeiro, para ficar no topo da pasta como em organize_nav_indexes
+            for name in sorted(files, key=lambda name: (name.lower() != "index.md", name)):
+                stem, ext = _os.path.splitext(name)
+                if ext.lower() != ".md":
+                    continue
+                if stem.lower() == "index":
+                    if not keys:
+                        # index.md na raiz do nav não tem pasta para representar
+                        continue
+                    doc_keys = keys + [keys[-1]]
+                else:
+                    doc_keys = keys + [stem.replace('.', '_')]
+                items.append(('.'.join(doc_keys), _os.path.join(folder, name)))
+
+        # um documento cuja chave também é seção (ou repetida) seria descartado em silêncio
+        sources = {}
+        sections = {'.'.join(path.split('.')[:i]) for path, _ in items for i in range(1, path.count('.') + 1)}
+        collisions = []
+        for yaml_path, file_path in items:
+            if yaml_path in sources or yaml_path in sections:
+                collisions.append(f"{yaml_path}: {_os.path.relpath(file_path, src_dir)}")
+            sources.setdefault(yaml_path, file_path)
+        if collisions:
+            raise _MkdocsIndexingError(
+                "Documentos com a mesma chave de uma seção ou de outro documento:\n" + "\n".join(collisions))
+
+        with self.transaction(workers, progress):
+            results = self.batch_index(items)
+        return [yaml_path for (yaml_path, _), indexed in zip(items, results) if indexed]
+
+    @_profiling.operation("project.index")
+    def index(self, yaml_path: str, file_path: str):
+        """
+        Index the documentation in mkdocs configuration file
+        path = path in yaml to index
+        filepath = new file path to index
+        """
+        if not self._editable():
+            return False
+
+        if self._transaction is not None:
+            return self._index(self._transaction, yaml_path, file_path)
+
+        try:
+            with self.transaction() as tx:
+                return self._index(tx, yaml_path, file_path)
+        except _MkdocsConcurrencyError:
+            raise
+        except (_MkdocsIndexingWriteError, _MkdocsFileNotFoundError) as ex:
+            raise _MkdocsIndexingError(ex)
+
+    def _index(self, tx: _Transaction, yaml_path: str, file_path: str) -> bool:
+        found = tx.tree.get(yaml_path)
+
+        if isinstance(found, list):
+            raise _MkdocsIndexingError(
+                f"{yaml_path} já existe e é uma pasta, indique o nome do arquivo \"{yaml_path}.arquivo\" se a intenção for registrar dentro de {yaml_path}.")
+
+        if found:
+            item = found.split('/')[-1]
+            if item.endswith('.md'):
+                return False
+
+        if not _Path(file_path).exists():
+            raise _MkdocsFileNotFoundError(
+                f"MkDocs documentation file not found: {file_path}")
+
+        try:
+            tx.tree.add(yaml_path, _yamlpath_to_filepath(yaml_path, file_path))
+        except _MkdocsUtilsError as ex:
+            raise _MkdocsIndexingError(ex) from None
+
+        tx.touch()
+        tx.copies.append((yaml_path, file_path))
+        return True
+
+    @_profiling.operation("project.unindex")
+    def unindex(self, yamlpath: str, file_path: str = "") -> bool:
+        if not self._editable():
+            return False
+
+        if self._transaction is not None:
+            return self._unindex(self._transaction, yamlpath, file_path)
+
+        try:
+            with self.transaction() as tx:
+                return self._unindex(tx, yamlpath, file_path)
+        except (_MkdocsUnindexingError, _MkdocsConcurrencyError):
+            raise
+        except Exception:
+            raise _MkdocsUnindexingWriteError("Erro ao tentar escrever mudanças no arquivo de configuração.")
+
+    def _unindex(self, tx: _Transaction, yamlpath: str, file_path: str) -> bool:
+        if not tx.tree.nav:
+            return False
+
+        found = tx.tree.get(yamlpath)
+
+        if not found:
+            return False
+
+        try:
+            tx.tree.remove(yamlpath)
+        except Exception as ex:
+            raise _MkdocsUnindexingError(f"Erro ao tentar desindexar {yamlpath}.")
+
+        tx.touch()
+        if file_path:
+            tx.removals.append((yamlpath, file_path))
+        return True
+
+    @_profiling.operation("project.update")
+    def update(self, yaml_path: str, file_path: str) -> bool:
+        """
+        Troca o arquivo associado a um item já existente no nav, sem recriar a hierarquia.
+        Retorna False se o caminho não existir.
+        """
+        if not self._editable():
+            return False
+
+        if self._transaction is not None:
+            return self._update(self._transaction, yaml_path, file_path)
+
+        try:
+            with self.transaction() as tx:
+                return self._update(tx, yaml_path, file_path)
+        except _MkdocsConcurrencyError:
+            raise
+        except _MkdocsIndexingWriteError as ex:
+            raise _MkdocsIndexingError(ex)
+
+    def _update(self, tx: _Transaction, yaml_path: str, file_path: str) -> bool:
+        if not tx.tree.update(yaml_path, file_path):
+            return False
+        tx.touch()
+        return True
+
+    @_profiling.operation("project.rename")
+    def rename(self, yaml_path: str, new_key: str) -> bool:
+        """
+        Troca o nome (última chave) de um item do nav, mantendo posição e filhos.
+        A pasta do item e os arquivos de toda a subárvore acompanham (ver move()).
+        Retorna False se o item não existir ou se já houver um irmão com o novo nome.
+        """
+        if '.' in new_key:
+            raise _MkdocsIndexingError(f"O novo nome \"{new_key}\" não pode conter '.'.")
+        prefix = yaml_path.rpartition('.')[0]
+        return self.move(yaml_path, f"{prefix}.{new_key}" if prefix else new_key)
+
+    @_profiling.operation("project.move")
+    def move(self, yaml_path: str, new_path: str) -> bool:
+        """
+        Move um item do nav, com todos os filhos, para 'new_path' (outro nome e/ou outro nível).
+
+        Os arquivos da subárvore que ficam na pasta do item (Pasta/Item/...) passam a
+        apontar para a pasta nova em uma única passada, a pasta física é renomeada uma
+        vez e o arquivo de configuração é gravado uma vez. Se a chave mudar, o index da
+        seção (Item.Item) é renomeado junto. Outros arquivos (caminhos absolutos, URLs)
+        ficam como estão.
+
+        Retorna False se o item não existir ou se 'new_path' já existir.
+        """
+        if not self._editable():
+            return False
+
+        if self._transaction is not None:
+            return self._move(self._transaction, yaml_path, new_path)
+
+        try:
+            with self.transaction() as tx:
+                return self._move(tx, yaml_path, new_path)
+        except _MkdocsConcurrencyError:
+            raise
+        except _MkdocsIndexingWriteError as ex:
+            raise _MkdocsIndexingError(ex)
+
+    def _move(self, tx: _Transaction, yaml_path: str, new_path: str) -> bool:
+        keys, new_keys = yaml_path.split('.'), new_path.split('.')
+        if not all(new_keys):
+            raise _MkdocsIndexingError(f"Caminho inválido: \"{new_path}\".")
+        if len(keys) >= 2 and keys[-1] == keys[-2]:
+            raise _MkdocsIndexingError(f"{yaml_path} é o index da pasta; mova a pasta {'.'.join(keys[:-1])}.")
+        if yaml_path not in tx.tree or new_path in tx.tree:
+            return False
+
+        old_dir, new_dir = '/'.join(keys), '/'.join(new_keys)
+        source = _Path(self.doc_root).joinpath(*keys)
+        target = _Path(self.doc_root).joinpath(*new_keys)
+        # pastas já renomeadas nesta transação só mudam de lugar no commit
+        current = source
+        for before, after in reversed(tx.renames):
+            if current == after or after in current.parents:
+                current = before / current.relative_to(after)
+        moves_folder = current.is_dir() and new_path != yaml_path
+        if moves_folder and (target.exists() or any(target == folder for _, folder in tx.renames)):
+            raise _MkdocsIndexingError(f"A pasta {target} já existe.")
+
+        if not tx.tree.move(yaml_path, new_path, _Retarget(old_dir, new_dir)):
+            return False
+        old_key, new_key = keys[-1], new_keys[-1]
+        if old_key != new_key and isinstance(tx.tree.get(new_path), list):
+            index_path = f"{new_path}.{old_key}"
+            if isinstance(tx.tree.get(index_path), str):
+                tx.tree.rename(index_path, new_key)
+        if moves_folder:
+            tx.renames.append((source, target))
+        tx.touch()
+        return True
+
+    @_profiling.operation("project.index_folder")
+    def index_folder(self, yaml_path: str):
+        """
+        Cria um arquivo index.md na pasta especificada por yaml_path e indexa esse arquivo no nav.
+        Se não for uma pasta válida, retorna erro.
+        """
+        keys = yaml_path.split('.')
+        folder_path = _Path(self.doc_root).joinpath(*keys)
+        index_file = folder_path / "index.md"
+
+        if not folder_path.exists() or not folder_path.is_dir():
+            raise _MkdocsFileNotFoundError(f"Pasta não encontrada: {folder_path}")
+
+        if not self._editable():
+            return
+
+        if self._transaction is None:
+            with self.transaction():
+                return self.index_folder(yaml_path)
+
+        # Cria o index.md se não existir
+        if self._write_index(index_file, keys[-1]):
+            self._transaction.created.append(index_file)
+
+        self._add_index(self._transaction, yaml_path)
+        return True
+
+    @_profiling.operation("project.index_all_folders")
+    def index_all_folders(self, root_path: str | None = None, workers: int = 4, progress=None) -> list[str]:
+        """
+        index_folder() para todas as pastas do nav abaixo de root_path (None = o nav
+        inteiro) que ainda não têm index: a pasta docs é lida uma vez, os index.md
+        que faltam são criados em 'workers' threads e as entradas entram no nav em
+        uma única transação (uma reorganização e uma escrita).
+
+        Só entram as pastas do nav que existem na pasta docs e que ainda não têm um
+        item com o próprio nome (Pasta.Pasta). As pastas vistas ficam no manifesto
+        (manifest.FolderManifest): as próximas chamadas só olham as pastas novas.
+        progress = callback(feitos, total) dos index.md criados.
+        Retorna os caminhos do nav das pastas indexadas.
+        """
+        if not self._editable():
+            return []
+        manifest = _FolderManifest.for_docs(self.doc_root)
+        base = root_path.replace('.', '/') if root_path else ""
+        with _profiling.span("scan_docs"):
+            files, folders = _scan_tree(_os.path.join(self.doc_root, *base.split('/')), workers)
+        if base:
+            files = {f"{base}/{rel}" for rel in files}
+            folders = {f"{base}/{rel}" for rel in folders}
+            if _os.path.isdir(_os.path.join(self.doc_root, *base.split('/'))):
+                folders.add(base)
+
+        with self.transaction() as tx:
+            seen, pending = [], []
+            for path, value in tx.tree.entries():
+                if value is not None or (root_path and path != root_path and not path.startswith(root_path + '.')):
+                    continue
+                keys = path.split('.')
+                rel = '/'.join(keys)
+                if rel not in folders or rel in manifest:
+                    continue
+                seen.append(rel)
+                if f"{path}.{keys[-1]}" not in tx.tree:
+                    pending.append(path)
+            self._create_indexes(tx, [path for path in pending if f"{path.replace('.', '/')}/index.md" not in files],
+                                 workers, progress)
+            for path in pending:
+                self._add_index(tx, path)
+            # só depois da gravação: um rollback deixa as pastas para a próxima chamada
+            tx.after.append(lambda: manifest.save(seen))
+        return pending
+
+    def _write_index(self, index_file: _Path, key: str) -> bool:
+        """Cria o index.md de uma pasta com o texto padrão; False se ele já existia."""
+        try:
+            with open(index_file, "x", encoding="utf-8") as f:
+                f.write(f"# {key}\n\n{self.new_section_text}")
+        except FileExistsError:
+            return False
+        return True
+
+    def _create_indexes(self, tx: _Transaction, paths: list[str], workers: int, progress) -> None:
+        """Cria os index.md das pastas em 'paths' em paralelo; os criados entram em tx.created."""
+        def create(path):
+            keys = path.split('.')
+            index_file = _Path(self.doc_root).joinpath(*keys) / "index.md"
+            if self._write_index(index_file, keys[-1]):
+                tx.created.append(index_file)
+
+        total = len(paths)
+        if workers <= 1 or total < 2:
+            for done, path in enumerate(paths, 1):
+                create(path)
+                if progress:
+                    progress(done, total)
+            return
+        with _ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(create, path) for path in paths]
+            try:
+                for done, future in enumerate(_as_completed(futures), 1):
+                    future.result()
+                    if progress:
+                        progress(done, total)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _add_index(self, tx: _Transaction, yaml_path: str) -> None:
+        """Registra Pasta/index.md como primeiro item da pasta no nav (a reorganização fica para o commit)."""
+        keys = yaml_path.split('.')
+        # Caminho relativo ao root para o mkdocs
+        rel_path = "/".join(keys) + "/index.md"
+        folder_name = keys[-1]
+
+        # Remove qualquer index anterior para essa pasta
+        tree = tx.tree
+        found = tree.get(yaml_path)
+        if isinstance(found, list):
+            # Remove index.md anterior se houver
+            kept = [item for item in found if not (isinstance(item, str) and item.endswith("index.md"))]
+            if len(kept) != len(found):
+                # pela árvore: no modo compacto 'found' é só uma cópia dos filhos
+                found[:] = kept
+                tree.update(yaml_path, found)
+            tree.add(f"{yaml_path}.{folder_name}", rel_path)
+        else:
+            tree.add(yaml_path, rel_path)
+
+        tx.touch()
+        # A reorganização roda uma vez só, no commit da transação
+        tx.organize.append(yaml_path)
+
+    @_profiling.operation("project.verify")
+    def verify(self, workers: int | None = None) -> _Drift:
+        """
+        Compara os documentos .md da pasta de documentação com os arquivos do nav.
+        Retorna um Drift com os documentos fora do nav (orphans) e os itens do
+        nav cujo arquivo não existe (missing). workers = threads da leitura da pasta.
+        """
+        nav = self.read_nav()
+        return _compare(_scan_docs(self.doc_root, workers), _nav_files(nav))
+
+    @_profiling.operation("project.repair")
+    def repair(self, drift: _Drift | None = None, workers: int | None = None) -> _Drift:
+        """
+        Corrige o nav em uma única transação (uma escrita): itens sem arquivo são
+        removidos só do nav e documentos fora dele são indexados no caminho que
+        corresponde à pasta deles (Pasta/Doc/doc.md -> Pasta.Doc).
+        Sem 'drift', usa o resultado de verify(). Retorna o que não pôde ser corrigido.
+        """
+        if drift is None:
+            drift = self.verify(workers)
+        if not drift or not self._editable():
+            return drift
+
+        orphans, missing = [], []
+        with self.transaction():
+            for yaml_path, rel in drift.missing:
+                if not self.unindex(yaml_path):
+                    missing.append((yaml_path, rel))
+            for rel in drift.orphans:
+                yaml_path = _yaml_path_for(rel)
+                try:
+                    if yaml_path and self.index(yaml_path, _os.path.join(self.doc_root, *rel.split("/"))):
+                        if rel.endswith("/index.md"):
+                            # index.md vai para o topo da pasta, como em index_folder
+                            self._transaction.organize.append(yaml_path.rpartition('.')[0])
+                        continue
+                except (_MkdocsIndexingError, _MkdocsFileNotFoundError):
+                    # já existe uma pasta nesse caminho do nav, ou o arquivo sumiu nesse meio tempo
+                    pass
+                orphans.append(rel)
+        return _Drift(tuple(orphans), tuple(missing))
+
+    def _compact(self) -> bool:
+        """Nav em memória como CompactNav (MKDOCS_COMPACT_NAV); não se aplica a nav_dir."""
+        if self.nav_dir:
+            return False
+        return self.compact if self.compact is not None else _config.MKDOCS_COMPACT_NAV
+
+    def _journaled(self) -> bool:
+        """Alterações vão para o diário (MKDOCS_JOURNAL); não se aplica a nav_dir."""
+        if self.nav_dir:
+            return False
+        return self.journal if self.journal is not None else _config.MKDOCS_JOURNAL
+
+    def _journal(self) -> _Journal:
+        key = (_os.path.abspath(self.config_path), bool(self._compact()))
+        journal = _journals.get(key)
+        if journal is None:
+            journal = _journals[key] = _Journal(self.config_path)
+        return journal
+
+    def _catch_up(self):
+        """
+        Nav do arquivo de configuração com as entradas do diário. Ao nav já em memória
+        só são aplicadas as entradas novas (de outros processos), com os eventos
+        entregues aos inscritos; ele é montado de novo se o arquivo foi relido, o
+        diário foi compactado ou uma entrada foi desfeita.
+        """
+        journal = self._journal()
+        records, reset = journal.read()
+        nav = self._base_nav()
+        if nav is None:
+            return None
+        rebuild = nav is not journal.nav or reset or any("undo" in record for record in records)
+        if rebuild and nav is journal.nav:
+            # o nav em memória já tem entradas que não valem mais
+            _invalidate(self.config_path)
+            nav = self._base_nav()
+        tree = nav if self._compact() else _NavTree(nav)
+        if rebuild:
+            # entradas que o arquivo já contém (compactação interrompida) ficam de fora
+            journal.included()
+            _replay(tree, journal.entries())
+            journal.nav = nav
+        elif records:
+            events = []
+            tree.subscribe(events.append)
+            try:
+                _replay(tree, [record for record in records if "ops" in record])
+            finally:
+                tree.unsubscribe(events.append)
+            self._deliver(events, nav)
+        return nav
+
+    def _base_nav(self):
+        """Nav do arquivo de configuração, sem o diário (a lista é criada se o arquivo não tiver uma)."""
+        if self._compact():
+            return _read_nav_compact(self.config_path)
+        cf = self.config
+        if not isinstance(cf, dict):
+            return None
+        if not isinstance(cf.get('nav'), list):
+            cf['nav'] = []
+        return cf['nav']
+
+    def _deliver(self, events: list, nav) -> None:
+        """Entrega os eventos ao índice de busca (se ele for deste nav) e aos inscritos."""
+        index = self._search
+        if index is not None and index.nav is nav:
+            for event in events:
+                index.on_event(event)
+        for event in events:
+            for listener in list(self._listeners):
+                listener(event)
+
+    def _editable(self) -> bool:
+        """As operações só alteram um arquivo de configuração que seja um mapeamento."""
+        if self._compact():
+            # o modo compacto não carrega o resto do arquivo; a leitura do nav já valida o caminho
+            _read_nav_compact(self.config_path)
+            return True
+        return isinstance(self.config, dict)
+
+    def _placement(self) -> str:
+        return self.placement or _config.MKDOCS_PLACEMENT
+
+    def _target_file(self, path: str, filepath: str) -> _Path:
+        """Caminho de destino do documento dentro da pasta de documentação (o mesmo registrado no nav)."""
+        return _Path(self.doc_root).joinpath(*_yamlpath_to_filepath(path, filepath).split('/'))
+
+    def _map_folders(self, path: str, filepath: str, strategy: str | None = None):
+        """
+        Apenas cria a estrutura de pastas e copia o arquivo do documento.
+        Não cria mais index.md automaticamente.
+        strategy = copy | reflink | hardlink | symlink | cas (None usa a do projeto / MKDOCS_PLACEMENT)
+        """
+        source_file = _Path(filepath)
+
+        if not source_file.exists():
+            raise _MkdocsFileNotFoundError(
+                f"MkDocs documentation file not found: {source_file}")
+
+        strategy = strategy or self._placement()
+        if strategy == _CAS:
+            return self.store.place(source_file, self._target_file(path, filepath))
+        return _place(source_file, self._target_file(path, filepath), strategy)
+
+    def _unmap_folders(self, path: str, filepath: str):
+        """
+        Remove a pasta física correspondente ao path da documentação, junto com o arquivo .md.
+        """
+        target_file = self._target_file(path, filepath)
+        final_dir = target_file.parent
+
+        # Remove o arquivo de documentação, se existir
+        if self._placement() == _CAS:
+            # o objeto do store também sai se este era o último caminho com o conteúdo
+            self.store.release(target_file)
+        elif target_file.exists():
+            target_file.unlink(missing_ok=True)
+        # Remove a pasta da documentação se estiver vazia
+        if final_dir.exists() and final_dir.is_dir() and not any(final_dir.iterdir()):
+            final_dir.rmdir()
@@ -0,0 +1,202 @@
+"""
+Busca por chaves, caminhos pontuados e arquivos do nav.
+
+O índice é montado uma vez a partir do nav carregado e mantido pelos NavEvent
+das alterações (on_event), sem percorrer a árvore de novo. Cada item vira um
+texto "caminho\\0arquivo" normalizado (minúsculas, sem acentos) com seus
+trigramas; uma busca parte da lista de itens do trigrama mais raro da consulta
+e só confere esses candidatos, junto com as chaves que começam com a última
+palavra (lista ordenada das chaves, por prefixo). Consultas com menos de 3
+letras usam só as chaves.
+"""
+import bisect as _bisect
+import heapq as _heapq
+import unicodedata as _unicodedata
+from itertools import chain as _chain
+from dataclasses import dataclass as _dataclass
+from docwriter.navtree import NavMoved as _NavMoved, nav_tree as _nav_tree
+
+# Acima desta proporção de itens removidos o índice é remontado
+_MAX_DEAD_RATIO = 0.5
+# Itens conferidos por resultado pedido; limita o custo de consultas que casam com quase tudo
+_CANDIDATES_PER_HIT = 50
+
+
+@_dataclass(frozen=True)
+class SearchHit:
+    """Item encontrado: caminho pontuado, chave e arquivo (None para seções)."""
+    path: str
+    key: str
+    file: str | None = None
+
+
+class NavIndex:
+    """
+    Índice de busca sobre a lista 'nav'.
+
+        index = NavIndex(nav)
+        index.search("aplic teste")      # palavras em qualquer ordem, em qualquer parte do caminho
+        project.subscribe(index.on_event)
+
+    Os resultados vêm ordenados: chave igual à última palavra, chave que começa
+    com ela, chave que a contém e, por fim, o resto; em cada grupo os caminhos
+    mais curtos primeiro.
+    """
+
+    def __init__(self, nav=None):
+        self.nav = nav if nav is not None else []
+        self.rebuild()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def rebuild(self, nav=None) -> None:
+        """Remonta o índice inteiro (de 'nav', lista ou CompactNav, se informado)."""
+        if nav is not None:
+            self.nav = nav
+        # id -> (caminho, chave, arquivo, texto normalizado, chave normalizada); None = removido
+        self._entries: list[tuple | None] = []
+        self._ids: dict[str, int] = {}
+        # caminho -> caminhos dos filhos, para remover uma subárvore sem percorrer o nav
+        self._children: dict[str, set[str]] = {}
+        # trigrama -> ids, em ordem crescente
+        self._grams: dict[str, list[int]] = {}
+        # (chave normalizada, id), ordenada, para as consultas por prefixo
+        self._keys: list[tuple[str, int]] = []
+        self._dead = 0
+        if isinstance(self.nav, list):
+            self._add_level("", self.nav, sort=False)
+        else:
+            for path, file in self.nav.entries():
+                parent, _, key = path.rpartition('.')
+                self._add(path, key, file, parent, sort=False, recurse=False)
+        self._keys.sort()
+
+    def on_event(self, event) -> None:
+        """Aplica um NavEvent já confirmado: só os caminhos do evento são relidos do nav."""
+        self._sync(event.path)
+        if isinstance(event, _NavMoved):
+            self._sync(event.old_path)
+        if self._dead > _MAX_DEAD_RATIO * max(len(self._ids), 1):
+            self.rebuild()
+
+    def search(self, query: str, limit: int = 20) -> list[SearchHit]:
+        tokens = _normalize(query).split()
+        if not tokens:
+            return []
+        last = tokens[-1]
+        # chaves que começam com a última palavra entram sempre, mesmo em consultas genéricas
+        candidates = self._prefixed(last, limit * _CANDIDATES_PER_HIT)
+        long_tokens = [token for token in tokens if len(token) >= 3]
+        if long_tokens:
+            candidates = _chain(candidates, self._rarest(long_tokens))
+
+        ranked, seen = [], set()
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry is None or entry_id in seen:
+                continue
+            seen.add(entry_id)
+            path, key, file, text, norm_key = entry
+            if not all(token in text for token in tokens):
+                continue
+            if norm_key == last:
+                score = 0
+            elif norm_key.startswith(last):
+                score = 1
+            elif last in norm_key:
+                score = 2
+            else:
+                score = 3
+            ranked.append((score, len(path), path, entry_id))
+            if len(ranked) >= limit * _CANDIDATES_PER_HIT:
+                # consulta genérica: só os primeiros itens encontrados (ordem do nav) são ordenados
+                break
+        return [SearchHit(*self._entries[entry_id][:3]) for *_, entry_id in _heapq.nsmallest(limit, ranked)]
+
+    # Internos
+
+    def _rarest(self, tokens: list[str]) -> list[int]:
+        """Ids do trigrama com menos itens entre os de todas as palavras."""
+        rarest = None
+        for token in tokens:
+            for i in range(len(token) - 2):
+                ids = self._grams.get(token[i:i + 3])
+                if ids is None:
+                    return []
+                if rarest is None or len(ids) < len(rarest):
+                    rarest = ids
+        return rarest
+
+    def _prefixed(self, prefix: str, limit: int) -> list[int]:
+        found = []
+        start = _bisect.bisect_left(self._keys, (prefix,))
+        for norm_key, entry_id in self._keys[start:start + limit]:
+            if not norm_key.startswith(prefix):
+                break
+            found.append(entry_id)
+        return found
+
+    def _sync(self, path: str) -> None:
+        self._drop(path)
+        tree = _nav_tree(self.nav)
+        if path in tree:
+            parent, _, key = path.rpartition('.')
+            self._add(path, key, tree.get(path), parent, sort=True)
+
+    def _drop(self, path: str) -> None:
+        parent = path.rpartition('.')[0]
+        if parent in self._children:
+            self._children[parent].discard(path)
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            entry_id = self._ids.pop(current, None)
+            if entry_id is not None:
+                # os ids continuam nas listas de trigramas e são ignorados na busca
+                self._entries[entry_id] = None
+                self._dead += 1
+            stack.extend(self._children.pop(current, ()))
+
+    def _add_level(self, prefix: str, level: list, sort: bool) -> None:
+        stack = [(prefix, level)]
+        while stack:
+            prefix, level = stack.pop()
+            for item in level:
+                if not isinstance(item, dict):
+                    continue
+                for key, value in item.items():
+                    path = f"{prefix}.{key}" if prefix else str(key)
+                    self._add(path, str(key), value, prefix, sort, recurse=False)
+                    if isinstance(value, list):
+                        stack.append((path, value))
+
+    def _add(self, path: str, key: str, value, parent: str, sort: bool, recurse: bool = True) -> None:
+        file = value if isinstance(value, str) else None
+        text = _normalize(f"{path}\0{file}" if file else path)
+        norm_key = _normalize(key)
+        entry_id = len(self._entries)
+        self._entries.append((path, key, file, text, norm_key))
+        self._ids[path] = entry_id
+        self._children.setdefault(parent, set()).add(path)
+        grams = self._grams
+        for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            ids = grams.get(gram)
+            if ids is None:
+                grams[gram] = [entry_id]
+            else:
+                ids.append(entry_id)
+        if sort:
+            _bisect.insort(self._keys, (norm_key, entry_id))
+        else:
+            self._keys.append((norm_key, entry_id))
+        if recurse and isinstance(value, list):
+            self._add_level(path, value, sort)
+
+
+def _normalize(text: str) -> str:
+    """Minúsculas e sem acentos: 'Aplicações' e 'aplicacoes' são iguais na busca."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return "".join(char for char in _unicodedata.normalize("NFKD", text) if not _unicodedata.combining(char))
@@ -0,0 +1,157 @@
+"""
+Armazenamento por conteúdo dos documentos (MKDOCS_PLACEMENT=cas).
+
+Cada conteúdo é guardado uma única vez em <docs>/.docwriter/objects/ab/cdef...
+(sha256) e aparece no caminho do nav como hard link para esse objeto. Um índice
+persistente (index.json) guarda arquivo de origem -> (mtime, tamanho, hash): reindexar
+ou mover um documento que não mudou não lê o arquivo de novo, e um conteúdo que já
+está no store não é copiado outra vez.
+
+A pasta começa com '.', então o mkdocs, o scan_docs e o Watcher a ignoram.
+Como no hardlink, os caminhos materializados compartilham o conteúdo: um editor
+que grava no próprio arquivo altera todas as cópias com o mesmo conteúdo.
+"""
+import json as _json
+import os as _os
+import threading as _threading
+from pathlib import Path as _Path
+from docwriter import profiling as _profiling
+from docwriter.placement import COPY as _COPY, HARDLINK as _HARDLINK, SKIPPED as _SKIPPED, copy_file as _copy_file, file_hash as _file_hash, replace_with as _replace_with
+
+# Pasta do store dentro da pasta de documentação
+STORE_DIR = ".docwriter"
+
+_INDEX_VERSION = 1
+
+
+class ContentStore:
+    """
+    Objetos endereçados pelo hash do conteúdo, materializados por hard link.
+
+        store = ContentStore.for_docs("C:/projeto/docs")
+        store.place("C:/origem/doc.md", "C:/projeto/docs/Pasta/doc.md")
+        store.flush()
+
+    Pode ser usado por várias threads ao mesmo tempo (as cópias de uma transação).
+    """
+
+    def __init__(self, root):
+        self.root = _Path(root)
+        self.objects = self.root / "objects"
+        self._index_path = self.root / "index.json"
+        # origem absoluta -> [mtime_ns, tamanho, hash]; None até a primeira leitura
+        self._files: dict[str, list] | None = None
+        self._dirty = False
+        self._lock = _threading.Lock()
+
+    @classmethod
+    def for_docs(cls, doc_root) -> "ContentStore":
+        return cls(_Path(doc_root) / STORE_DIR)
+
+    def digest(self, source) -> str:
+        """Hash do conteúdo de 'source'; só lê o arquivo se mtime/tamanho mudaram desde a última vez."""
+        source = _Path(source)
+        stat = source.stat()
+        key = str(source.resolve())
+        with self._lock:
+            entry = self._load().get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        digest = _file_hash(source)
+        with self._lock:
+            self._files[key] = [stat.st_mtime_ns, stat.st_size, digest]
+            self._dirty = True
+        return digest
+
+    def object_path(self, digest: str) -> _Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def put(self, source) -> _Path:
+        """Guarda o conteúdo de 'source' no store (se ainda não estiver) e devolve o objeto."""
+        obj = self.object_path(self.digest(source))
+        if not obj.is_file():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            _replace_with(obj, lambda temp: _copy_file(_Path(source), temp), fallback=False)
+        return obj
+
+    def place(self, source, target) -> str:
+        """
+        Materializa o conteúdo de 'source' em 'target' com um hard link para o objeto.
+        Retorna HARDLINK, SKIPPED (target já é o objeto) ou COPY quando o sistema
+        de arquivos não aceita hard links.
+        """
+        with _profiling.span("store.place"):
+            return self._place(source, target)
+
+    def _place(self, source, target) -> str:
+        obj = self.put(source)
+        target = _Path(target)
+        if target.is_file() and not target.is_symlink() and _os.path.samefile(obj, target):
+            return _SKIPPED
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if _replace_with(target, lambda temp: _os.link(obj, temp)):
+            return _HARDLINK
+        _replace_with(target, lambda temp: _copy_file(obj, temp), fallback=False)
+        return _COPY
+
+    def release(self, target) -> None:
+        """Apaga 'target'; se ele era o último link do objeto, o objeto sai do store."""
+        target = _Path(target)
+        try:
+            stat = target.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_nlink == 2:
+            # só o store e este caminho: o hash só é calculado quando o objeto pode sair
+            obj = self.object_path(_file_hash(target))
+            if obj.is_file() and _os.path.samefile(obj, target):
+                obj.unlink()
+        target.unlink(missing_ok=True)
+
+    def gc(self) -> int:
+        """
+        Remove objetos sem nenhum caminho materializado (sobras de rollbacks ou de
+        arquivos apagados fora do docwriter) e entradas do índice cuja origem sumiu.
+        Retorna a quantidade de objetos removidos.
+        """
+        removed = 0
+        if self.objects.is_dir():
+            for folder in self.objects.iterdir():
+                for obj in folder.iterdir():
+                    if obj.stat().st_nlink == 1:
+                        obj.unlink()
+                        removed += 1
+                if not any(folder.iterdir()):
+                    folder.rmdir()
+        with self._lock:
+            files = self._load()
+            for key in [key for key in files if not _os.path.exists(key)]:
+                del files[key]
+                self._dirty = True
+        self.flush()
+        return removed
+
+    def flush(self) -> None:
+        """Grava o índice, se ele mudou, com a mesma troca atômica usada para os documentos."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": _INDEX_VERSION, "files": self._files}
+
+            def write(temp):
+                with open(temp, "w", encoding="utf-8") as f:
+                    _json.dump(data, f)
+            self.root.mkdir(parents=True, exist_ok=True)
+            _replace_with(self._index_path, write, fallback=False)
+            self._dirty = False
+
+    def _load(self) -> dict:
+        if self._files is None:
+            try:
+                with open(self._index_path, encoding="utf-8") as f:
+                    data = _json.load(f)
+                self._files = data.get("files", {}) if data.get("version") == _INDEX_VERSION else {}
+            except (FileNotFoundError, ValueError):
+                # índice ausente ou corrompido: os hashes são recalculados sob demanda
+                self._files = {}
+        return self._files
@@ -30,7 +30,7 @@ class Ui_MainWindow(object):
         self.centralwidget.setObjectName(u"centralwidget")
         self.treeView = QTreeView(self.centralwidget)
         self.treeView.setObjectName(u"treeView")
-        self.treeView.setGeometry(QRect(10, 10, 721, 431))
+        self.treeView.setGeometry(QRect(10, 40, 721, 401))
         font = QFont()
         font.setFamilies([u"Inter 28pt"])
         font.setPointSize(9)
@@ -39,6 +39,12 @@ class Ui_MainWindow(object):
         self.toolButton.setObjectName(u"toolButton")
         self.toolButton.setGeometry(QRect(390, 510, 20, 20))
         self.toolButton.setFont(font)
+        # Campo de busca acima da árvore
+        self.lineEdit_search = QLineEdit(self.centralwidget)
+        self.lineEdit_search.setObjectName(u"lineEdit_search")
+        self.lineEdit_search.setGeometry(QRect(10, 10, 721, 25))
+        self.lineEdit_search.setFont(font)
+        self.lineEdit_search.setClearButtonEnabled(True)
         # Adiciona o botão de atualizar a tree
         self.pushButton_refresh = QPushButton(self.centralwidget)
         self.pushButton_refresh.setObjectName(u"pushButton_refresh")
@@ -102,6 +108,7 @@ class Ui_MainWindow(object):
         self.label.raise_()
         self.label_2.raise_()
         self.lineEdit_2.raise_()
+        self.lineEdit_search.raise_()
         self.menubar = QMenuBar(MainWindow)
         self.menubar.setObjectName(u"menubar")
         self.menubar.setGeometry(QRect(0, 0, 748, 33))
@@ -128,6 +135,7 @@ class Ui_MainWindow(object):
         self.pushButton_create_index.setText(QCoreApplication.translate("MainWindow", u"Criar index", None))
         self.toolButton.setText(QCoreApplication.translate("MainWindow", u"...", None))
         self.lineEdit.setText(QCoreApplication.translate("MainWindow", u"", None))
+        self.lineEdit_search.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Buscar no nav (chave, caminho ou arquivo)", None))
         self.label.setText(QCoreApplication.translate("MainWindow", u" New document", None))
         self.label_2.setText(QCoreApplication.translate("MainWindow", u" Path Tree", None))
         self.lineEdit_2.setText(QCoreApplication.translate("MainWindow", u"Folder.Application.Document", None))
@@ -0,0 +1,448 @@
+"""
+Observa a pasta de documentação e compara o que mudou nela com o nav.
+
+Alterações feitas fora do docwriter (git pull, editores, outras ferramentas)
+chegam como lotes de DocsChanges, já agrupados (debounce). Cada lote vem de
+uma nova leitura só das pastas afetadas, a partir de um índice em memória da
+pasta docs. Com drift() o lote vira um relatório (documentos fora do nav e
+entradas do nav sem arquivo) e apply() corrige o nav com uma única escrita.
+
+No Linux é usado inotify (via ctypes); nos demais sistemas, ou se o inotify
+falhar, as pastas conhecidas são verificadas periodicamente pelo mtime.
+
+    with Watcher(project) as watcher:
+        for changes in watcher.changes():
+            drift = watcher.drift(changes)
+            if drift:
+                watcher.apply(drift)
+"""
+import ctypes as _ctypes
+import ctypes.util as _ctypes_util
+import errno as _errno
+import os as _os
+import select as _select
+import struct as _struct
+import threading as _threading
+import time as _time
+from dataclasses import dataclass as _dataclass
+from docwriter.consistency import Drift, compare as _compare, nav_files as _nav_files
+
+
+@_dataclass(frozen=True)
+class DocsChanges:
+    """Documentos .md criados e removidos na pasta docs (relativos a ela, separados por '/')."""
+    created: tuple[str, ...] = ()
+    deleted: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.deleted)
+
+
+class _Folder:
+    __slots__ = ("mtime", "dirs", "files")
+
+    def __init__(self, mtime: int, dirs: set, files: set):
+        self.mtime = mtime
+        self.dirs = dirs
+        self.files = files
+
+
+class _PathIndex:
+    """Pastas e documentos .md da pasta docs, atualizados uma pasta por vez."""
+
+    def __init__(self, root: str):
+        self.root = root
+        # caminho relativo da pasta ("" = raiz) -> conteúdo conhecido
+        self.folders: dict[str, _Folder] = {}
+
+    def files(self):
+        for rel, folder in self.folders.items():
+            for name in folder.files:
+                yield _join(rel, name)
+
+    def load(self, rel: str = "") -> tuple[list[str], list[str]]:
+        """Lê a pasta e todas as subpastas; retorna (documentos, pastas) encontrados."""
+        files, dirs = [], []
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            folder = self._read(current)
+            if folder is None:
+                continue
+            self.folders[current] = folder
+            dirs.append(current)
+            files.extend(_join(current, name) for name in folder.files)
+            stack.extend(_join(current, name) for name in folder.dirs)
+        return files, dirs
+
+    def forget(self, rel: str) -> tuple[list[str], list[str]]:
+        """Remove a pasta e as subpastas do índice; retorna (documentos, pastas) removidos."""
+        files, dirs = [], []
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            folder = self.folders.pop(current, None)
+            if folder is None:
+                continue
+            dirs.append(current)
+            files.extend(_join(current, name) for name in folder.files)
+            stack.extend(_join(current, name) for name in folder.dirs)
+        return files, dirs
+
+    def refresh(self, rel: str) -> tuple[list[str], list[str], list[str], list[str]]:
+        """
+        Relê só a pasta 'rel' e compara com o índice.
+        Retorna (documentos criados, documentos removidos, pastas novas, pastas removidas).
+        """
+        old = self.folders.get(rel)
+        if old is None:
+            created, added = self.load(rel)
+            return created, [], added, []
+        new = self._read(rel)
+        if new is None:
+            deleted, removed = self.forget(rel)
+            return [], deleted, [], removed
+
+        created = [_join(rel, name) for name in new.files - old.files]
+        deleted = [_join(rel, name) for name in old.files - new.files]
+        added, removed = [], []
+        for name in old.dirs - new.dirs:
+            files, dirs = self.forget(_join(rel, name))
+            deleted.extend(files)
+            removed.extend(dirs)
+        # a entrada da pasta é trocada antes de ler as subpastas novas
+        self.folders[rel] = new
+        for name in new.dirs - old.dirs:
+            files, dirs = self.load(_join(rel, name))
+            created.extend(files)
+            added.extend(dirs)
+        return created, deleted, added, removed
+
+    def path(self, rel: str) -> str:
+        return _os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def _read(self, rel: str) -> _Folder | None:
+        path = self.path(rel)
+        dirs, files = set(), set()
+        try:
+            mtime = _os.stat(path).st_mtime_ns
+            with _os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.add(entry.name)
+                    elif entry.name.lower().endswith(".md"):
+                        files.add(entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return _Folder(mtime, dirs, files)
+
+
+def _join(rel: str, name: str) -> str:
+    return f"{rel}/{name}" if rel else name
+
+
+class _PollingBackend:
+    """Compara o mtime das pastas conhecidas a cada 'interval' segundos."""
+
+    def __init__(self, index: _PathIndex, interval: float):
+        self._index = index
+        self._interval = interval
+        self._wakeup = _threading.Event()
+        # último mtime visto de cada pasta que mudou e ainda pode não ter sido relida
+        self._seen: dict[str, int | None] = {}
+
+    def add(self, rel: str) -> None:
+        pass
+
+    def remove(self, rel: str) -> None:
+        self._seen.pop(rel, None)
+
+    def wait(self, timeout: float | None) -> set[str]:
+        if self._wakeup.wait(self._interval if timeout is None else min(timeout, self._interval)):
+            return set()
+        dirty = set()
+        for rel, folder in list(self._index.folders.items()):
+            try:
+                mtime = _os.stat(self._index.path(rel)).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self._seen.get(rel, folder.mtime):
+                self._seen[rel] = mtime
+                dirty.add(rel)
+        return dirty
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def close(self) -> None:
+        self._wakeup.set()
+
+
+class _InotifyBackend:
+    """Um watch do inotify por pasta; os eventos só marcam a pasta para ser relida."""
+
+    _IN_MOVED_FROM = 0x040
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_DELETE_SELF = 0x400
+    _IN_MOVE_SELF = 0x800
+    _IN_Q_OVERFLOW = 0x4000
+    _IN_IGNORED = 0x8000
+    _IN_ONLYDIR = 0x01000000
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _MASK = _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+    _EVENT = _struct.Struct("iIII")
+
+    def __init__(self, index: _PathIndex):
+        library = _ctypes_util.find_library("c")
+        libc = _ctypes.CDLL(library or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(_errno.ENOSYS, "inotify indisponível")
+        self._libc = libc
+        self._index = index
+        self._fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(_ctypes.get_errno(), "inotify_init1 falhou")
+        self._paths: dict[int, str] = {}
+        self._watches: dict[str, int] = {}
+        # o pipe acorda o select() quando wake() é chamado de outra thread
+        self._wakeup_read, self._wakeup_write = _os.pipe()
+
+    def add(self, rel: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, _os.fsencode(self._index.path(rel)), self._MASK)
+        if wd < 0:
+            error = _ctypes.get_errno()
+            if error in (_errno.ENOENT, _errno.ENOTDIR):
+                # a pasta sumiu antes do watch; o evento da pasta pai cobre isso
+                return
+            raise OSError(error, _os.strerror(error), self._index.path(rel))
+        self._paths[wd] = rel
+        self._watches[rel] = wd
+
+    def remove(self, rel: str) -> None:
+        wd = self._watches.pop(rel, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def wait(self, timeout: float | None) -> set[str]:
+        ready, _, _ = _select.select([self._fd, self._wakeup_read], [], [], timeout)
+        if self._fd not in ready:
+            return set()
+        dirty = set()
+        while True:
+            try:
+                data = _os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size + length
+                if mask & self._IN_Q_OVERFLOW:
+                    # eventos perdidos: todas as pastas são relidas
+                    dirty.update(self._index.folders)
+                    continue
+                if mask & self._IN_IGNORED:
+                    rel = self._paths.pop(wd, None)
+                    if rel is not None and self._watches.get(rel) == wd:
+                        del self._watches[rel]
+                    continue
+                rel = self._paths.get(wd)
+                if rel is None:
+                    continue
+                if mask & (self._IN_DELETE_SELF | self._IN_MOVE_SELF) and rel:
+                    # a pasta some do índice pela releitura da pasta pai
+                    dirty.add(rel.rpartition("/")[0])
+                dirty.add(rel)
+        return dirty
+
+    def wake(self) -> None:
+        if self._fd >= 0:
+            _os.write(self._wakeup_write, b"\0")
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            _os.close(self._fd)
+            self._fd = -1
+            _os.close(self._wakeup_read)
+            _os.close(self._wakeup_write)
+
+
+class Watcher:
+    """
+    Observa a pasta de documentação de um Project.
+
+    debounce = segundos sem novos eventos antes de entregar um lote
+    interval = intervalo do polling, quando o inotify não está disponível
+    polling = True força o polling; None escolhe automaticamente
+
+    Criar o Watcher não lê a pasta: o índice e os watches são montados no
+    primeiro changes() ou drift(), ou seja, na thread do watcher com start().
+    """
+
+    def __init__(self, project, debounce: float = 0.3, interval: float = 1.0, polling: bool | None = None):
+        self.project = project
+        self.debounce = debounce
+        self.interval = interval
+        self._index = _PathIndex(project.doc_root)
+        self._backend = self._create_backend(polling)
+        # leitura inicial da pasta, feita uma única vez em _scan()
+        self._scanned = False
+        self._scan_lock = _threading.Lock()
+        self._listeners: list = []
+        self._stopped = _threading.Event()
+        self._thread: _threading.Thread | None = None
+        # arquivo do nav -> caminhos no nav, reconstruído quando o nav muda
+        self._nav_files: dict[str, list[str]] | None = None
+        self._nav_source = None
+        project.subscribe(self._on_nav_changed)
+
+    @property
+    def polling(self) -> bool:
+        return isinstance(self._backend, _PollingBackend)
+
+    def subscribe(self, callback) -> None:
+        """
+        Registra callback(changes) para os lotes de DocsChanges de start().
+        O callback roda na thread do watcher; no Qt, repasse por um Signal.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def start(self) -> "Watcher":
+        """Entrega os lotes de changes() aos callbacks em uma thread separada."""
+        if self._thread is None:
+            self._thread = _threading.Thread(target=self._run, name="docwriter-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._backend.wake()
+        if self._thread is not None and self._thread is not _threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._backend.close()
+        self.project.unsubscribe(self._on_nav_changed)
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def changes(self):
+        """
+        Gera um DocsChanges por lote de alterações, até stop().
+        Os eventos são acumulados até 'debounce' segundos sem novidades, e só as
+        pastas afetadas são relidas; um arquivo criado e removido no mesmo lote
+        não aparece.
+        """
+        self._scan()
+        pending: set[str] = set()
+        deadline = None
+        while not self._stopped.is_set():
+            timeout = None if deadline is None else max(0.0, deadline - _time.monotonic())
+            dirty = self._backend.wait(timeout)
+            if self._stopped.is_set():
+                return
+            if dirty:
+                pending |= dirty
+                deadline = _time.monotonic() + self.debounce
+            elif deadline is not None and _time.monotonic() >= deadline:
+                changes = self._refresh(pending)
+                pending, deadline = set(), None
+                if changes:
+                    yield changes
+
+    def drift(self, changes: DocsChanges | None = None) -> Drift:
+        """
+        Relatório das diferenças entre a pasta e o nav. Com 'changes' só os
+        documentos do lote são verificados; sem, a pasta inteira (pelo índice).
+        """
+        self._scan()
+        nav_files = self._nav_index()
+        if changes is None:
+            return _compare(set(self._index.files()), nav_files)
+        orphans = [rel for rel in changes.created if rel not in nav_files]
+        missing = [(yaml_path, rel) for rel in changes.deleted for yaml_path in nav_files.get(rel, ())]
+        return Drift(tuple(orphans), tuple(missing))
+
+    def apply(self, drift: Drift) -> Drift:
+        """Corrige o nav com Project.repair(); retorna o que não pôde ser corrigido."""
+        return self.project.repair(drift)
+
+    def _run(self) -> None:
+        for changes in self.changes():
+            for callback in list(self._listeners):
+                callback(changes)
+
+    def _refresh(self, dirty: set[str]) -> DocsChanges:
+        created, deleted = set(), set()
+        # pais antes dos filhos: uma pasta removida já leva as subpastas junto
+        for rel in sorted(dirty, key=lambda rel: (rel.count("/") + bool(rel), rel)):
+            if rel and rel.rpartition("/")[0] not in self._index.folders:
+                continue
+            new, gone, added, removed = self._index.refresh(rel)
+            for folder in removed:
+                self._backend.remove(folder)
+            for folder in added:
+                self._watch(folder)
+            for path in gone:
+                if path in created:
+                    created.discard(path)
+                else:
+                    deleted.add(path)
+            for path in new:
+                if path in deleted:
+                    deleted.discard(path)
+                else:
+                    created.add(path)
+        return DocsChanges(tuple(sorted(created)), tuple(sorted(deleted)))
+
+    def _scan(self) -> None:
+        """Lê a pasta inteira e cria os watches, na primeira chamada de qualquer thread."""
+        with self._scan_lock:
+            if self._scanned:
+                return
+            self._index.load()
+            for rel in list(self._index.folders):
+                self._watch(rel)
+            self._scanned = True
+
+    def _create_backend(self, polling: bool | None):
+        if not polling:
+            try:
+                return _InotifyBackend(self._index)
+            except (OSError, AttributeError):
+                if polling is False:
+                    raise
+        return _PollingBackend(self._index, self.interval)
+
+    def _watch(self, rel: str) -> None:
+        try:
+            self._backend.add(rel)
+        except OSError:
+            # limite de watches do inotify (ENOSPC) etc.: passa a usar polling
+            self._backend.close()
+            self._backend = _PollingBackend(self._index, self.interval)
+
+    def _on_nav_changed(self, event) -> None:
+        self._nav_files = None
+
+    def _nav_index(self) -> dict[str, list[str]]:
+        nav = self.project.read_nav()
+        # o nav pode ter sido relido do disco (alteração externa no arquivo de configuração)
+        if self._nav_files is None or nav is not self._nav_source:
+            self._nav_files = _nav_files(nav)
+            self._nav_source = nav
+        return self._nav_files
+
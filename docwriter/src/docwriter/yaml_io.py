@@ -1,16 +1,47 @@
-import shutil as _shutil, os as _os
+import io as _io, re as _re, shutil as _shutil, os as _os, tempfile as _tempfile, threading as _threading
+from contextlib import nullcontext as _nullcontext
 from ruamel.yaml import YAML as __YAML
+from ruamel.yaml.comments import CommentedSeq as _CommentedSeq
+from docwriter import config as _config, profiling as _profiling
+from docwriter.locking import locked as _locked
 from docwriter.exceptions import DocumentNotFoundError as _DocumentNotFoundError, MkdocsIndexingWriteError as _MkdocsIndexingWriteError
 from ruamel.yaml.scalarstring import DoubleQuotedScalarString as DQ
 
+# umask do processo, lido só na primeira gravação de um arquivo novo (ver _umask)
+_UMASK: int | None = None
+_UMASK_LOCK = _threading.Lock()
+
 _yaml = __YAML()
 _yaml.preserve_quotes = True
+_NULL = _nullcontext()
+
+
+# Cache em memória: caminho absoluto -> ((st_mtime_ns, st_size), configuração carregada)
+_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+# Nav montado por read_nav_shards: pasta -> (itens de cada arquivo, lista montada)
+_shard_cache: dict[str, tuple[list, list]] = {}
+# Arquivo da pasta de seções com a ordem dos arquivos do nav
+NAV_MANIFEST = "_nav.yml"
+# Nav compacto de read_nav_compact: caminho absoluto -> ((st_mtime_ns, st_size), CompactNav)
+_compact_cache: dict[str, tuple[tuple[int, int], object]] = {}
+# Leituras parciais de read_section: (caminho absoluto, chave) -> ((st_mtime_ns, st_size), valor)
+_section_cache: dict[tuple[str, str], tuple[tuple[int, int], object]] = {}
+# Linhas que continuam o bloco de uma chave de primeiro nível: indentadas, itens
+# de lista sem indentação ("- "), comentários e linhas em branco
+_CONTINUATION = _re.compile(r"[ \t]|-(?:[ \t]|$)|#|\r?$")
 
 
 def read_config(config_path: str, key: str = "") -> dict | list:
+    """
+    Lê o arquivo de configuração, reaproveitando a última leitura enquanto o
+    arquivo não mudar no disco (mesmos st_mtime_ns e st_size).
+
+    O objeto retornado é compartilhado entre todas as leituras do mesmo caminho:
+    quem alterar a estrutura deve gravá-la com write_config (ou chamar
+    invalidate) para não deixar o cache diferente do arquivo.
+    """
     try:
-        with open(f'{config_path}', "r", encoding="utf-8") as f:
-            config = _yaml.load(f)
+        config = _load(config_path)
         if not config:
             return {} if not key else []
         if not key:
@@ -19,12 +50,477 @@ def read_config(config_path: str, key: str = "") -> dict | list:
         return value if value is not None else []
     except FileNotFoundError:
         raise _DocumentNotFoundError
+
+def read_section(config_path: str, key: str = "nav"):
+    """
+    Leitura somente para consulta de uma chave de primeiro nível (por padrão o nav).
+
+    Só o trecho do arquivo que pertence à chave é analisado, com o loader em C
+    do PyYAML quando disponível, sem o custo do round-trip do ruamel sobre o
+    arquivo inteiro (theme, plugins, tags !!python/name...). Os escalares seguem o
+    YAML 1.2, como em read_config. O resultado usa dict/list comuns e é compartilhado entre as chamadas: não deve ser alterado.
+    Se o arquivo completo já estiver em cache, o valor dele é devolvido.
+    """
+    path = _os.path.abspath(config_path)
+    try:
+        stamp = _stamp(path)
+    except FileNotFoundError:
+        raise _DocumentNotFoundError
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return read_config(config_path, key)
+    cached = _section_cache.get((path, key))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    value = _parse_section(text, key)
+    if value is None:
+        # chave ausente, ou trecho que só faz sentido com o resto do arquivo (âncoras etc.)
+        return read_config(config_path, key)
+    _section_cache[(path, key)] = (stamp, value)
+    return value
+
+def snapshot(config_path: str) -> tuple[tuple[int, int], str]:
+    """
+    (st_mtime_ns, st_size) e texto do arquivo, lidos do mesmo descritor: o token
+    da concorrência otimista das transações e a base do merge se o arquivo mudar.
+    """
+    try:
+        with open(config_path, "r", encoding="utf-8", newline="") as f:
+            stat = _os.fstat(f.fileno())
+            return (stat.st_mtime_ns, stat.st_size), f.read()
+    except FileNotFoundError:
+        raise _DocumentNotFoundError
+
+def changed_since(config_path: str, token: tuple[tuple[int, int], str]) -> str | None:
+    """
+    Texto atual do arquivo se o conteúdo mudou desde snapshot() (outro processo
+    gravou); None se continua igual. Com o mesmo stat o texto nem é lido, e um
+    stat diferente com o mesmo conteúdo (touch, cópia) não conta como mudança.
+    """
+    stamp, text = token
+    try:
+        if _stamp(_os.path.abspath(config_path)) == stamp:
+            return None
+    except FileNotFoundError:
+        raise _DocumentNotFoundError
+    current = snapshot(config_path)[1]
+    return current if current != text else None
+
+def parse_nav(text: str) -> list:
+    """Nav de um texto de configuração (por exemplo o de snapshot()), com dict/list comuns."""
+    nav = _parse_section(text, "nav")
+    if nav is None:
+        config = _yaml.load(text)
+        nav = config.get("nav") if isinstance(config, dict) else None
+    return nav if isinstance(nav, list) else []
+
+def read_nav_compact(config_path: str):
+    """
+    Nav de config_path como CompactNav (ver compact.py), sem o round-trip do ruamel:
+    o bloco nav é analisado com o loader em C do PyYAML (com os escalares do YAML 1.2,
+    como em read_config) e convertido na hora para as tabelas, sem ficar em nenhum
+    cache na forma de dicts/listas.
+
+    Como em read_config, a árvore é compartilhada e reaproveitada enquanto o arquivo
+    não mudar; quem alterá-la deve gravá-la com write_nav_compact (ou chamar invalidate).
+    """
+    from docwriter.compact import CompactNav as _CompactNav
+    path = _os.path.abspath(config_path)
+    try:
+        stamp = _stamp(path)
+    except FileNotFoundError:
+        raise _DocumentNotFoundError
+    cached = _compact_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        nav = _parse_section(f.read(), "nav")
+    if nav is None:
+        # sem bloco nav, ou um que depende do resto do arquivo: leitura completa, descartada em seguida
+        config = read_config(config_path)
+        nav = config.get("nav") if isinstance(config, dict) else None
+        invalidate(path)
+    tree = _CompactNav.from_nav(nav)
+    _compact_cache[path] = (stamp, tree)
+    return tree
+
+def write_nav_compact(config_path: str, tree, backups: int | None = None, edit=None) -> None:
+    """
+    Grava o nav de uma CompactNav no bloco nav de config_path, com a troca atômica
+    de write_config; o resto do arquivo é mantido byte a byte. A serialização é
+    feita pelo próprio CompactNav.to_yaml(), gerado direto das tabelas.
+    edit = como em write_config.
+    """
+    config_path = _os.path.abspath(config_path)
+    with _profiling.span("write_config"), _locked(config_path):
+        with open(config_path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        _profiling.count("yaml.dump")
+        with _profiling.span("yaml.dump"):
+            section = tree.to_yaml("nav")
+        text = _replace_section(text, "nav", section)
+        if edit is not None:
+            text = edit(text)
+        _atomic_write(config_path, lambda f: f.write(text), backups, newline="")
+        # a árvore em memória é exatamente o que foi gravado
+        _compact_cache[config_path] = (_stamp(config_path), tree)
+
+def invalidate(config_path: str | None = None) -> None:
+    """
+    Descarta a leitura em cache de config_path (ou de todos os arquivos).
+    Para uma pasta de seções (read_nav_shards), descarta o nav montado e os arquivos dela.
+    """
+    if config_path is None:
+        _cache.clear()
+        _section_cache.clear()
+        _shard_cache.clear()
+        _compact_cache.clear()
+        return
+    path = _os.path.abspath(config_path)
+    _cache.pop(path, None)
+    _compact_cache.pop(path, None)
+    for cached in [cached for cached in _section_cache if cached[0] == path]:
+        del _section_cache[cached]
+    if _shard_cache.pop(path, None) is not None:
+        for cached in [cached for cached in _cache if _os.path.dirname(cached) == path]:
+            del _cache[cached]
+
+def _section_span(text: str, key: str) -> tuple[int, int] | None:
+    """
+    Início e fim (offsets) do bloco da chave de primeiro nível 'key', da linha
+    'key:' até a próxima chave de primeiro nível. Comentários e linhas em branco
+    no fim entram no bloco, como o ruamel os associa ao último item.
+    """
+    pattern = _re.compile(rf"\ufeff?{_re.escape(key)}[ \t]*:(?:[ \t]|\r?$)")
+    start = None
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if start is None:
+            if pattern.match(line):
+                start = offset
+        elif not _CONTINUATION.match(line) or line.startswith(("---", "...")):
+            return start, offset
+        offset += len(line)
+    return (start, offset) if start is not None else None
+
+def _parse_section(text: str, key: str):
+    span = _section_span(text, key)
+    if span is None:
+        return None
+    import yaml as _pyyaml
+    loader = _section_loader()
+    _profiling.count("yaml.load")
+    try:
+        with _profiling.span("yaml.load_section"):
+            parsed = _pyyaml.load(text[span[0]:span[1]], Loader=loader)
+    except _pyyaml.YAMLError:
+        return None
+    if not isinstance(parsed, dict) or list(parsed) != [key]:
+        return None
+    return parsed[key] if parsed[key] is not None else []
+
+_loader = None
+
+def _section_loader():
+    """
+    Loader em C do PyYAML com as regras do YAML 1.2 do ruamel (o mesmo de read_config):
+    On/No/Yes continuam texto e 1_000, 0x10, 0o10 são inteiros, como no arquivo completo.
+    """
+    global _loader
+    if _loader is None:
+        import yaml as _pyyaml
+        from ruamel.yaml.resolver import implicit_resolvers as _implicit_resolvers
+
+        class Loader(getattr(_pyyaml, "CSafeLoader", _pyyaml.SafeLoader)):
+            yaml_implicit_resolvers = {}
+
+        for versions, tag, regexp, first in _implicit_resolvers:
+            if (1, 2) in versions:
+                Loader.add_implicit_resolver(tag, regexp, first)
+        Loader.add_constructor("tag:yaml.org,2002:int", _construct_int)
+        _loader = Loader
+    return _loader
+
+def _construct_int(loader, node) -> int:
+    # 1.2: '010' é decimal e o octal é '0o10' (o construtor do PyYAML segue o 1.1)
+    value = loader.construct_scalar(node).replace("_", "")
+    sign = -1 if value[0] == "-" else 1
+    value = value.lstrip("+-")
+    if value[:2] in ("0b", "0o", "0x"):
+        return sign * int(value[2:], {"b": 2, "o": 8, "x": 16}[value[1]])
+    return sign * int(value)
+
+def _splice_section(config_path: str, data: dict, key: str) -> str | None:
+    """
+    Texto do arquivo com só o bloco de 'key' serializado de novo; o resto do
+    arquivo fica byte a byte igual. None se o bloco não for encontrado.
+    """
+    try:
+        with open(config_path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+    span = _section_span(text, key)
+    if span is None or key not in data:
+        return None
+    buffer = _io.StringIO()
+    _dump({key: data[key]}, buffer)
+    section = buffer.getvalue()
+    if span[1] < len(text) and not section.endswith("\n"):
+        section += "\n"
+    return text[:span[0]] + section + text[span[1]:]
+
+def _stamp(path: str) -> tuple[int, int]:
+    stat = _os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _load(config_path: str):
+    path = _os.path.abspath(config_path)
+    try:
+        # stat antes da leitura: se o arquivo mudar no meio, a próxima chamada recarrega
+        stamp = _stamp(path)
+    except FileNotFoundError:
+        _cache.pop(path, None)
+        raise
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        _profiling.count("yaml.load")
+        with _profiling.span("yaml.load"):
+            config = _yaml.load(f)
+    _cache[path] = (stamp, config)
+    return config
+
+def _dump(data, stream) -> None:
+    _profiling.count("yaml.dump")
+    with _profiling.span("yaml.dump"):
+        _yaml.dump(data, stream)
       
-def write_config(config_path: str, data: dict) -> None:    
-    # Backup file before editing
-    _shutil.copy2(config_path, "./" + _os.path.basename(config_path) + ".bkp")
+def write_config(config_path: str, data: dict, backups: int | None = None, key: str | None = None,
+                 lock: bool = True, edit=None) -> None:
+    """
+    Grava a configuração de forma atômica: serializa em um arquivo temporário na
+    mesma pasta, faz fsync e substitui o original com os.replace, então uma falha
+    no meio da escrita nunca deixa o mkdocs.yml pela metade.
+
+    backups = quantidade de gerações mantidas ao lado do arquivo
+    (mkdocs.yml.bkp.1 é a mais recente); None usa MKDOCS_CONFIG_BACKUPS, 0 desativa.
+    key = só essa chave de primeiro nível mudou (ex.: "nav"): apenas o bloco dela
+    é serializado e o resto do arquivo é mantido byte a byte.
+    lock = grava com a trava do arquivo (locking.locked); False quando quem chama já
+    trava um arquivo que representa o conjunto (as seções de write_nav_shards).
+    edit = edit(texto) -> texto, aplicado ao conteúdo final antes da troca, na mesma
+    escrita (ex.: a marca do diário, journal.mark).
+    """
+    config_path = _os.path.abspath(config_path)
+    with _profiling.span("write_config"), (_locked(config_path) if lock else _NULL):
+        try:
+            text = _splice_section(config_path, data, key) if key else None
+        except Exception:
+            raise _MkdocsIndexingWriteError(f"Ocorreu um erro durante a indexação na função {__name__}.write_config")
+        if text is not None:
+            if edit is not None:
+                text = edit(text)
+            _atomic_write(config_path, lambda f: f.write(text), backups, newline="")
+        elif edit is not None:
+            buffer = _io.StringIO()
+            _dump(data, buffer)
+            text = edit(buffer.getvalue())
+            _atomic_write(config_path, lambda f: f.write(text), backups)
+        else:
+            _atomic_write(config_path, lambda f: _dump(data, f), backups)
+        if edit is None:
+            # O que acabou de ser gravado é exatamente o conteúdo do arquivo
+            _cache[config_path] = (_stamp(config_path), data)
+        # com 'edit' o texto gravado não é mais o de 'data': a próxima leitura relê o arquivo
+
+def read_nav_shards(nav_dir: str) -> list:
+    """
+    Nav montado a partir de uma pasta de seções: NAV_MANIFEST lista os arquivos
+    na ordem do nav e cada arquivo guarda um item do primeiro nível do nav.
+
+    Cada arquivo passa pelo cache de read_config, então depois de uma alteração
+    só a seção que mudou é lida de novo. A lista devolvida é a mesma enquanto
+    nenhuma seção mudar e, como em read_config, é compartilhada.
+    """
+    nav_dir = _os.path.abspath(nav_dir)
     try:
-        with open(config_path, "w", encoding="utf-8") as f:
-            _yaml.dump(data, f)
+        files = read_config(_os.path.join(nav_dir, NAV_MANIFEST))
+    except _DocumentNotFoundError:
+        files = []
+    items = [read_config(_os.path.join(nav_dir, name)) for name in (files or [])]
+    cached = _shard_cache.get(nav_dir)
+    if cached is not None and len(cached[0]) == len(items) and all(a is b for a, b in zip(cached[0], items)):
+        return cached[1]
+    nav = _CommentedSeq(items)
+    _shard_cache[nav_dir] = (items, nav)
+    return nav
+
+def write_nav_shards(nav_dir: str, nav: list, sections=None, backups: int | None = None) -> None:
+    """
+    Grava o nav na pasta de seções. Só os arquivos das seções em 'sections'
+    (chaves do primeiro nível; None = todas) e das seções novas são gravados; o
+    manifesto só é regravado se a ordem ou o conjunto de arquivos mudou, e os
+    arquivos de seções que saíram do nav são removidos. Tudo acontece com a trava
+    do manifesto.
+    """
+    nav_dir = _os.path.abspath(nav_dir)
+    _os.makedirs(nav_dir, exist_ok=True)
+    manifest = _os.path.join(nav_dir, NAV_MANIFEST)
+    # o manifesto trava o conjunto: as seções são gravadas sem trava própria
+    with _locked(manifest):
+        try:
+            old_files = list(read_config(manifest) or [])
+        except _DocumentNotFoundError:
+            old_files = []
+        by_key = {}
+        for name in old_files:
+            try:
+                by_key.setdefault(_section_key(read_config(_os.path.join(nav_dir, name))), name)
+            except _DocumentNotFoundError:
+                continue
+
+        files, used = [], set()
+        for item in nav:
+            key = _section_key(item)
+            name = by_key.get(key)
+            if name is None or name in used:
+                name = _section_file(key, used | set(old_files))
+                write_config(_os.path.join(nav_dir, name), item, backups, lock=False)
+            elif sections is None or key in sections:
+                write_config(_os.path.join(nav_dir, name), item, backups, lock=False)
+            files.append(name)
+            used.add(name)
+
+        if files != old_files:
+            write_config(manifest, _CommentedSeq(files), backups, lock=False)
+        for name in set(old_files) - used:
+            path = _os.path.join(nav_dir, name)
+            invalidate(path)
+            if _os.path.exists(path):
+                _os.remove(path)
+        _shard_cache[nav_dir] = ([item for item in nav], nav)
+
+def write_merged_config(config_path: str, nav: list, output: str | None = None, backups: int | None = None) -> None:
+    """
+    Gera o arquivo de configuração completo, com o 'nav' (por exemplo o de
+    read_nav_shards) no lugar do bloco nav de config_path, para o mkdocs build.
+    output = arquivo gerado (None = o próprio config_path); o resto do arquivo é
+    copiado byte a byte.
+    """
+    config_path = _os.path.abspath(config_path)
+    output = _os.path.abspath(output or config_path)
+    buffer = _io.StringIO()
+    _dump({"nav": nav}, buffer)
+    with _locked(output):
+        with open(config_path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        text = _replace_section(text, "nav", buffer.getvalue())
+        _atomic_write(output, lambda f: f.write(text), backups, newline="")
+
+def _replace_section(text: str, key: str, section: str) -> str:
+    """Texto com o bloco de 'key' trocado por 'section' (acrescentado no fim se não existir)."""
+    span = _section_span(text, key)
+    if span is None:
+        separator = "\n" if text and not text.endswith("\n") else ""
+        return text + separator + section
+    return text[:span[0]] + section + text[span[1]:]
+
+def _section_key(item) -> str:
+    if isinstance(item, dict):
+        return str(next(iter(item), ""))
+    return str(item)
+
+def _section_file(key: str, taken: set) -> str:
+    from pathvalidate import sanitize_filename as _sanitize_filename
+    stem = _sanitize_filename(key, replacement_text="_").strip(" .") or "secao"
+    name, counter = f"{stem}.yml", 2
+    while name in taken or name == NAV_MANIFEST:
+        name, counter = f"{stem}-{counter}.yml", counter + 1
+    return name
+
+def _atomic_write(path: str, write, backups: int | None, newline: str | None = None) -> None:
+    """
+    Escreve com write(f) em um temporário na mesma pasta e troca o arquivo com os.replace.
+    newline="" mantém as quebras de linha do texto como estão (trechos copiados do arquivo).
+    """
+    if backups is None:
+        backups = _config.MKDOCS_CONFIG_BACKUPS
+    folder, name = _os.path.split(path)
+    fd, temp_path = _tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=folder)
+    try:
+        with open(fd, "w", encoding="utf-8", newline=newline) as f:
+            write(f)
+            f.flush()
+            _os.fsync(f.fileno())
+        if _os.path.exists(path):
+            _shutil.copymode(path, temp_path)
+            if backups > 0:
+                _rotate_backups(path, backups)
+        else:
+            # mkstemp cria com 0600; um arquivo novo fica com as permissões padrão
+            _os.chmod(temp_path, 0o666 & ~_umask())
+        _os.replace(temp_path, path)
     except Exception:
-        raise _MkdocsIndexingWriteError(f"Ocorreu um erro durante a indexação na função {__name__}.write_config")
\ No newline at end of file
+        invalidate(path)
+        if _os.path.exists(temp_path):
+            _os.remove(temp_path)
+        raise _MkdocsIndexingWriteError(f"Ocorreu um erro durante a indexação na função {__name__}.write_config")
+    _fsync_dir(folder)
+    invalidate(path)
+
+def _umask() -> int:
+    """
+    umask do processo, lido uma vez. No Linux vem de /proc, sem alterá-lo; nos
+    outros sistemas os.umask só permite ler trocando o valor, o que é feito sob a
+    trava e desfeito em seguida.
+    """
+    global _UMASK
+    with _UMASK_LOCK:
+        if _UMASK is None:
+            try:
+                with open("/proc/self/status", encoding="ascii") as f:
+                    _UMASK = next(int(line.split()[1], 8) for line in f if line.startswith("Umask:"))
+            except (OSError, StopIteration, ValueError):
+                _UMASK = _os.umask(0o022)
+                _os.umask(_UMASK)
+        return _UMASK
+
+def _rotate_backups(config_path: str, backups: int) -> None:
+    """
+    Desloca mkdocs.yml.bkp.N-1 -> .bkp.N e guarda a versão atual em .bkp.1.
+    A versão atual é preservada com um hard link, sem copiar o conteúdo: o
+    os.replace seguinte só troca a entrada do diretório e o inode antigo
+    continua vivo como backup.
+    """
+    def backup(generation: int) -> str:
+        return f"{config_path}.bkp.{generation}"
+
+    if _os.path.exists(backup(backups)):
+        _os.remove(backup(backups))
+    for generation in range(backups - 1, 0, -1):
+        if _os.path.exists(backup(generation)):
+            _os.replace(backup(generation), backup(generation + 1))
+    try:
+        _os.link(config_path, backup(1))
+    except OSError:
+        # Sistemas de arquivos sem hard link (FAT, alguns compartilhamentos de rede)
+        _shutil.copy2(config_path, backup(1))
+
+def _fsync_dir(folder: str) -> None:
+    """Garante que a troca de nomes chegou ao disco (não suportado no Windows)."""
+    try:
+        fd = _os.open(folder, _os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        _os.close(fd)
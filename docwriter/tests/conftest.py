@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import pytest
+
+from docwriter import yaml_io
+
+CONFIG = """\
+# configuração de teste
+site_name: Teste
+nav:
+{nav}theme:
+  name: material
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """
+    mkdocs.yml com as seções S0..S2 de três documentos cada (S0.D0: S0/D0/D0.md),
+    a pasta docs e um documento fora dela ('source') para indexar.
+    """
+    nav = "".join(f"  - S{i}:\n" + "".join(f"      - D{j}: S{i}/D{j}/D{j}.md\n" for j in range(3))
+                  for i in range(3))
+    config_path = tmp_path / "mkdocs.yml"
+    config_path.write_text(CONFIG.format(nav=nav), encoding="utf-8")
+    doc_root = tmp_path / "docs"
+    doc_root.mkdir()
+    source = tmp_path / "novo.md"
+    source.write_text("# Novo\n", encoding="utf-8")
+    # o .env do repositório não deve valer nos testes
+    for name, value in (("MKDOCS_PLACEMENT", "copy"), ("MKDOCS_NAV_DIR", ""), ("MKDOCS_COMPACT_NAV", ""),
+                        ("MKDOCS_JOURNAL", ""), ("MKDOCS_CONFIG_BACKUPS", "1"), ("MKDOCS_LOCK_TIMEOUT", "30")):
+        monkeypatch.setenv(name, value)
+    yield SimpleNamespace(config_path=str(config_path), doc_root=str(doc_root), source=str(source))
+    yaml_io.invalidate()
@@ -0,0 +1,123 @@
+import io
+import json
+import os
+
+import pytest
+import yaml
+
+from docwriter import cli
+
+
+@pytest.fixture
+def run(site, capsys, monkeypatch):
+    def run(*argv, stdin=None):
+        if stdin is not None:
+            monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+        code = cli.main(["--config", site.config_path, "--docs", site.doc_root, *argv])
+        out, err = capsys.readouterr()
+        return code, out, err
+    return run
+
+
+def _disk_nav(site):
+    with open(site.config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["nav"]
+
+
+def _lines(out):
+    return [json.loads(line) for line in out.splitlines()]
+
+
+def test_without_command_prints_help(run):
+    code, out, _ = run()
+    assert code == 2
+    assert "usage" in out
+
+
+def test_index_and_list(site, run):
+    assert run("index", "N.A", str(site.source))[0] == 0
+    code, out, _ = run("list", "N")
+    assert code == 0
+    assert out.splitlines() == ["N", "N.A\tN/A/novo.md"]
+    assert os.path.isfile(os.path.join(site.doc_root, "N", "A", "novo.md"))
+
+
+def test_unchanged_command_fails(site, run):
+    code, _, err = run("unindex", "Nada.Aqui")
+    assert code == 1
+    assert "nada alterado para Nada.Aqui" in err
+
+
+def test_rename_and_move(site, run):
+    assert run("rename", "S0.D0", "Novo")[0] == 0
+    assert run("move", "S0.Novo", "S2.Novo")[0] == 0
+    _, out, _ = run("list", "S2")
+    assert "S2.Novo\tS2/Novo/D0.md" in out.splitlines()
+
+
+def test_errors_go_to_stderr(site, run):
+    code, out, err = run("index", "N.A", str(site.source) + ".inexistente")
+    assert code == 1
+    assert out == ""
+    assert err.startswith("docwriter: ")
+
+
+def test_verify_reports_json(site, run):
+    code, out, _ = run("verify")
+    # o nav do site aponta para arquivos que não existem na pasta docs
+    assert code == 1
+    drift = _lines(out)[0]
+    assert drift["orphans"] == []
+    assert ["S0.D0", "S0/D0/D0.md"] in drift["missing"]
+
+
+def test_batch_writes_results_after_commit(site, run):
+    stdin = "\n".join([
+        json.dumps({"op": "index", "yaml_path": "N.A", "file_path": str(site.source)}),
+        "",
+        json.dumps({"op": "unindex", "yaml_path": "S1.D0"}),
+        json.dumps({"op": "rename", "yaml_path": "Nada", "new_key": "X"}),
+    ])
+    code, out, _ = run("--batch", stdin=stdin)
+    assert code == 0
+    assert _lines(out) == [
+        {"line": 1, "op": "index", "result": True},
+        {"line": 3, "op": "unindex", "result": True},
+        {"line": 4, "op": "rename", "result": False},
+        {"committed": True},
+    ]
+    nav = _disk_nav(site)
+    assert nav[3] == {"N": [{"A": "N/A/novo.md"}]}
+    assert {"D0": "S1/D0/D0.md"} not in nav[1]["S1"]
+
+
+def test_failed_batch_reports_only_the_error(site, run):
+    before = _disk_nav(site)
+    stdin = "\n".join([
+        json.dumps({"op": "index", "yaml_path": "N.A", "file_path": str(site.source)}),
+        json.dumps({"op": "apagar-tudo"}),
+    ])
+    code, out, _ = run("--batch", stdin=stdin)
+    assert code == 1
+    # a linha 1 não foi gravada: nenhum resultado dela aparece na saída
+    assert _lines(out) == [{"line": 2, "error": "operação desconhecida: 'apagar-tudo'", "committed": False}]
+    assert _disk_nav(site) == before
+    assert os.listdir(site.doc_root) == []
+
+
+def test_batch_commit_failure_has_no_line(site, monkeypatch):
+    from docwriter import project as project_module
+    from docwriter.project import Project
+
+    def fail(*args, **kwargs):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(project_module, "_write_config", fail)
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    out = io.StringIO()
+    stdin = io.StringIO(json.dumps({"op": "index", "yaml_path": "N.A", "file_path": str(site.source)}) + "\n")
+
+    assert cli._run_batch(project, stdin, out) == 1
+    lines = _lines(out.getvalue())
+    assert len(lines) == 1
+    assert lines[0]["line"] is None and lines[0]["committed"] is False
+    assert "disco cheio" in lines[0]["error"]
@@ -0,0 +1,148 @@
+import copy
+import random
+
+import pytest
+import yaml
+
+from docwriter import yaml_io
+from docwriter.compact import CompactNav
+from docwriter.navtree import NavTree, organize_nav_indexes
+
+KEYS = ["A", "B", "C", "Ção", "index"]
+
+
+def _plain(nav):
+    return [{key: _plain(value) if isinstance(value, list) else value for key, value in item.items()}
+            if isinstance(item, dict) else item for item in nav]
+
+
+def _random_path(rng):
+    return ".".join(rng.choice(KEYS) for _ in range(rng.randint(1, 4)))
+
+
+def _random_nav(rng):
+    nav = []
+    tree = NavTree(nav)
+    for _ in range(15):
+        file_path = f"{rng.choice(KEYS)}/index.md" if rng.random() < .3 else f"f{rng.randint(0, 9)}.md"
+        tree.add(_random_path(rng), file_path)
+    nav.append("solto.md")
+    return nav
+
+
+def _retarget(file_path):
+    return file_path.replace("f", "h")
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_same_results_and_events_as_navtree(seed):
+    rng = random.Random(seed)
+    base = _random_nav(rng)
+    nav = copy.deepcopy(base)
+    tree, compact = NavTree(nav), CompactNav.from_nav(copy.deepcopy(base))
+    tree_events, compact_events = [], []
+    tree.subscribe(tree_events.append)
+    compact.subscribe(compact_events.append)
+
+    for step in range(60):
+        op = rng.choice(("add", "remove", "update", "rename", "move", "get", "position", "organize"))
+        path = _random_path(rng)
+        expected = result = None
+        if op == "add":
+            file_path = f"f{rng.randint(0, 9)}.md"
+            tree.add(path, file_path)
+            compact.add(path, file_path)
+        elif op == "remove":
+            tree.remove(path)
+            compact.remove(path)
+        elif op == "update":
+            file_path = f"g{rng.randint(0, 9)}.md"
+            expected, result = tree.update(path, file_path), compact.update(path, file_path)
+        elif op == "rename":
+            key = rng.choice(KEYS)
+            expected, result = tree.rename(path, key), compact.rename(path, key)
+        elif op == "move":
+            new_path = _random_path(rng)
+            expected, result = tree.move(path, new_path, _retarget), compact.move(path, new_path, _retarget)
+        elif op == "get":
+            expected, result = tree.get(path), compact.get(path)
+            if isinstance(expected, list):
+                expected = _plain(expected)
+        elif op == "position":
+            expected, result = tree.position(path), compact.position(path)
+        else:
+            paths = [_random_path(rng) for _ in range(2)] if rng.random() < .5 else None
+            organize_nav_indexes(nav, paths)
+            organize_nav_indexes(compact, paths)
+            tree.reindex()
+
+        context = (step, op, path)
+        assert result == expected, context
+        assert compact.to_nav() == _plain(nav), context
+        assert compact_events == tree_events, context
+        assert compact.paths() == tree.paths(), context
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_to_yaml_round_trip(seed):
+    rng = random.Random(seed)
+    compact = CompactNav.from_nav(_random_nav(rng))
+    for _ in range(20):
+        compact.move(_random_path(rng), _random_path(rng))
+        compact.remove(_random_path(rng))
+
+    loaded = yaml.safe_load(compact.to_yaml("nav"))["nav"]
+    assert loaded == compact.to_nav()
+    assert CompactNav.from_nav(loaded).to_yaml("nav") == compact.to_yaml("nav")
+
+
+def test_to_yaml_quotes_special_values():
+    nav = [
+        {"yes": "no"},
+        {"1.5": "123"},
+        {"a: b": "#comentário.md"},
+        {"Aplicações": [{"Vazia": []}, {"Nulo": None}, "- solto.md", "aspas \"duplas\".md"]},
+        {"Vazia": []},
+    ]
+    compact = CompactNav.from_nav(nav)
+    assert yaml.safe_load(compact.to_yaml("nav")) == {"nav": nav}
+    assert yaml.safe_load(CompactNav().to_yaml("nav")) == {"nav": []}
+
+
+YAML_12_KEYS = """\
+site_name: Teste
+nav:
+  - On: on.md
+  - No:
+      - Yes: sim.md
+      - 1_000: mil.md
+  - 0x10: hex.md
+theme:
+  name: material
+"""
+
+
+def _text_keys(nav):
+    return [{str(key): _text_keys(value) if isinstance(value, list) else value for key, value in item.items()}
+            for item in nav]
+
+
+def test_read_write_compact_follow_yaml_12(tmp_path):
+    config_path = str(tmp_path / "mkdocs.yml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(YAML_12_KEYS)
+    expected = [{"On": "on.md"}, {"No": [{"Yes": "sim.md"}, {"1000": "mil.md"}]}, {"16": "hex.md"}]
+    try:
+        compact = yaml_io.read_nav_compact(config_path)
+        # as mesmas chaves (em texto) que o ruamel lê no arquivo completo
+        assert compact.to_nav() == expected == _text_keys(yaml_io.read_config(config_path)["nav"])
+
+        yaml_io.write_nav_compact(config_path, compact, backups=0)
+        yaml_io.invalidate()
+        assert yaml_io.read_nav_compact(config_path).to_nav() == expected
+        assert _text_keys(yaml_io.read_config(config_path)["nav"]) == expected
+        # e o mkdocs (PyYAML, YAML 1.1) não transforma On/No/Yes em booleanos
+        with open(config_path, encoding="utf-8") as f:
+            assert yaml.safe_load(f)["nav"] == expected
+    finally:
+        yaml_io.invalidate()
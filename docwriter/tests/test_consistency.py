@@ -0,0 +1,85 @@
+import os
+
+import pytest
+import yaml
+
+from docwriter.consistency import Drift, yaml_path_for
+from docwriter.project import Project
+
+
+@pytest.fixture
+def project(site):
+    return Project(site.config_path, site.doc_root, new_section_text="{key}")
+
+
+def _write(site, rel):
+    path = os.path.join(site.doc_root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# doc\n")
+
+
+def _disk_nav(site):
+    with open(site.config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["nav"]
+
+
+def _append_nav(site, text):
+    with open(site.config_path, encoding="utf-8") as f:
+        config = f.read()
+    with open(site.config_path, "w", encoding="utf-8") as f:
+        f.write(config.replace("theme:", text + "theme:"))
+
+
+@pytest.mark.parametrize("rel, expected", [
+    ("A/B/b.md", "A.B"),
+    ("A/index.md", "A.A"),
+    ("solto.md", None),
+    ("A.v2/b.md", None),
+])
+def test_yaml_path_for(rel, expected):
+    assert yaml_path_for(rel) == expected
+
+
+def test_verify(site, project):
+    for j in range(3):
+        _write(site, f"S0/D{j}/D{j}.md")
+    _write(site, "Novo/Doc/doc.md")
+    _write(site, ".oculto/x.md")
+
+    drift = project.verify(workers=2)
+
+    assert drift.orphans == ("Novo/Doc/doc.md",)
+    assert drift.missing == tuple((f"S{i}.D{j}", f"S{i}/D{j}/D{j}.md") for i in (1, 2) for j in range(3))
+
+
+def test_repair_fixes_nav_in_one_pass(site, project):
+    for i in range(3):
+        for j in range(3):
+            if (i, j) != (2, 1):
+                _write(site, f"S{i}/D{j}/D{j}.md")
+    _write(site, "Novo/Doc/doc.md")
+    _write(site, "Novo/index.md")
+    _write(site, "solto.md")
+
+    remaining = project.repair()
+
+    # solto.md não tem caminho equivalente no nav
+    assert remaining == Drift(orphans=("solto.md",))
+    nav = _disk_nav(site)
+    assert {"D1": "S2/D1/D1.md"} not in nav[2]["S2"]
+    assert nav[3] == {"Novo": [{"Novo": "Novo/index.md"}, {"Doc": "Novo/Doc/doc.md"}]}
+    assert project.verify() == remaining
+
+
+def test_verify_with_non_string_keys(site, project):
+    # chaves que o YAML lê como número ou booleano
+    _append_nav(site, "  - 2024:\n      - true: Anos/x.md\n  - 7: sete.md\n")
+
+    drift = project.verify()
+
+    assert drift.orphans == ()
+    assert ("2024.True", "Anos/x.md") in drift.missing
+    assert ("7", "sete.md") in drift.missing
+    # os itens com chave não textual não são encontrados pelo caminho e continuam no relatório
+    assert project.repair(drift) == Drift(missing=(("2024.True", "Anos/x.md"), ("7", "sete.md")))
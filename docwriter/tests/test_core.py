@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from docwriter import core
+from docwriter.exceptions import MkdocsFileNotFoundError
+from docwriter.project import Project
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+@pytest.fixture(autouse=True)
+def no_default_project():
+    core.set_default_project(None)
+    yield
+    core.set_default_project(None)
+
+
+def test_import_reads_nothing(tmp_path):
+    # sem variáveis nem .env: a importação não pode falhar nem ler a configuração
+    env = {name: value for name, value in os.environ.items()
+           if not name.startswith(("MKDOCS_", "DOCWRITER_", "DEFAULT_TEXT"))}
+    env["PYTHONPATH"] = SRC
+    code = ("import sys, docwriter.core, docwriter.config as config;"
+            "print(config._loaded, 'dotenv' in sys.modules, docwriter.core._default_project)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False", "None"]
+
+
+def test_project_reads_config_on_first_use(tmp_path):
+    project = Project(tmp_path / "não-existe.yml", tmp_path / "docs")
+    assert project.config_path == str(tmp_path / "não-existe.yml")
+    with pytest.raises(FileNotFoundError):
+        project.config
+
+
+def test_default_project_from_env(site, monkeypatch):
+    monkeypatch.setenv("MKDOCS_CONFIG_PATH", site.config_path)
+    monkeypatch.setenv("MKDOCS_DOC_ROOT_PATH", site.doc_root)
+    monkeypatch.setenv("DEFAULT_TEXT_FOR_NEW_SECTIONS", "{key}")
+
+    project = core.default_project()
+    assert (project.config_path, project.doc_root) == (site.config_path, site.doc_root)
+    assert core.default_project() is project
+    assert core.cfg["site_name"] == "Teste"
+
+
+def test_missing_env_fails_on_first_use(monkeypatch):
+    monkeypatch.setenv("MKDOCS_CONFIG_PATH", "")
+    with pytest.raises(MkdocsFileNotFoundError):
+        core.index("N.A", "novo.md")
+
+
+def test_functions_delegate_to_default_project(site):
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    core.set_default_project(project)
+    events = []
+    core.subscribe(events.append)
+
+    assert core.index("N.A", site.source)
+    assert core.rename("N.A", "B")
+
+    assert {"N": [{"B": "N/B/novo.md"}]} in project.read_nav()
+    assert len(events) == 2
+    core.unsubscribe(events.append)
+
+
+def test_several_projects_in_one_process(site, tmp_path):
+    other_config = tmp_path / "outro.yml"
+    other_config.write_text("site_name: Outro\nnav:\n  - A: a.md\n", encoding="utf-8")
+    other_docs = tmp_path / "outro-docs"
+    other_docs.mkdir()
+    first = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    second = Project(other_config, other_docs, new_section_text="{key}")
+
+    assert second.index("N.A", site.source)
+
+    assert first.config["site_name"] == "Teste"
+    assert all("N" not in item for item in first.read_nav())
+    assert second.read_nav() == [{"A": "a.md"}, {"N": [{"A": "N/A/novo.md"}]}]
+    assert os.listdir(site.doc_root) == []
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from docwriter.navtree import NavAdded, NavMoved, NavRemoved, NavTree, NavUpdated
+from docwriter.project import Project
+
+
+@pytest.fixture
+def tree():
+    tree = NavTree([
+        {"A": [{"X": "A/X.md"}, {"Y": "A/Y.md"}]},
+        {"B": [{"C": [{"Z": "B/C/Z.md"}]}]},
+        {"D": "D.md"},
+    ])
+    tree.events = []
+    tree.subscribe(tree.events.append)
+    return tree
+
+
+def test_add_reports_topmost_new_level(tree):
+    tree.add("A.W", "A/W.md")
+    tree.add("N.M.O", "N/M/O.md")
+    assert tree.events == [NavAdded("A.W", "A", 2), NavAdded("N", "", 3)]
+
+
+def test_add_over_existing_document_is_update(tree):
+    tree.add("D", "outro.md")
+    # o documento vira pasta: o item continua no lugar, com outro valor
+    tree.add("A.X.Sub", "A/X/Sub.md")
+    assert tree.events == [NavUpdated("D", "", 2), NavUpdated("A.X", "A", 0)]
+
+
+def test_remove_reports_highest_emptied_level(tree):
+    tree.remove("A.Y")
+    tree.remove("B.C.Z")
+    tree.remove("nao.existe")
+    assert tree.events == [NavRemoved("A.Y", "A", 1), NavRemoved("B", "", 1)]
+
+
+def test_update_and_rename(tree):
+    assert tree.update("A.Y", "A/novo.md")
+    assert tree.rename("A.X", "Primeiro")
+    assert not tree.rename("A.Y", "Primeiro")
+    assert tree.events == [
+        NavUpdated("A.Y", "A", 1),
+        NavMoved("A.Primeiro", "A", 0, old_path="A.X", old_parent="A", old_position=0),
+    ]
+
+
+def test_move_creates_and_prunes_levels(tree):
+    assert tree.move("B.C", "N.C")
+    assert tree.events == [
+        NavAdded("N", "", 2),
+        NavMoved("N.C", "N", 0, old_path="B.C", old_parent="B", old_position=0),
+        NavRemoved("B", "", 1),
+    ]
+
+
+def test_project_events_after_commit_only(site):
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    events = []
+    project.subscribe(events.append)
+
+    with project.transaction():
+        project.index("S0.Novo", site.source)
+        project.unindex("S2.D0")
+        assert events == []
+    assert events == [NavAdded("S0.Novo", "S0", 3), NavRemoved("S2.D0", "S2", 0)]
+
+    events.clear()
+    with pytest.raises(RuntimeError):
+        with project.transaction():
+            project.index("S1.Outro", site.source)
+            raise RuntimeError("desfeito")
+    assert events == []
+
+    project.unsubscribe(events.append)
+    project.index("S1.Outro", site.source)
+    assert events == []
+
+
+def test_index_folder_reports_reordered_folder(site):
+    os.makedirs(os.path.join(site.doc_root, "S1"))
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    events = []
+    project.subscribe(events.append)
+    project.index_folder("S1")
+    assert events == [NavAdded("S1.S1", "S1", 3), NavUpdated("S1", "", 1)]
+    assert list(project.get_nav()[1]["S1"][0]) == ["S1"]
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+import yaml
+
+from docwriter.exceptions import MkdocsIndexingError
+from docwriter.project import Project
+
+
+@pytest.fixture
+def project(site):
+    return Project(site.config_path, site.doc_root, new_section_text="{key}")
+
+
+def _write(root, *parts, text="# doc\n"):
+    path = root.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _disk_nav(site):
+    with open(site.config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["nav"]
+
+
+def test_import_keeps_hierarchy(site, project, tmp_path):
+    src = tmp_path / "origem"
+    _write(src, "Guia", "index.md")
+    _write(src, "Guia", "b.md")
+    _write(src, "Guia", "Avançado", "c.v2.md")
+    _write(src, "Guia", "notas.txt")
+
+    imported = project.import_tree(str(src), "Novo")
+
+    assert imported == ["Novo.Guia.Guia", "Novo.Guia.b", "Novo.Guia.Avançado.c_v2"]
+    assert _disk_nav(site)[3] == {"Novo": [{"Guia": [
+        {"Guia": "Novo/Guia/index.md"},
+        {"b": "Novo/Guia/b/b.md"},
+        {"Avançado": [{"c_v2": "Novo/Guia/Avançado/c_v2/c.v2.md"}]},
+    ]}]}
+    assert os.path.isfile(os.path.join(site.doc_root, "Novo", "Guia", "index.md"))
+
+
+def test_index_md_is_case_insensitive(site, project, tmp_path):
+    src = tmp_path / "origem"
+    _write(src, "Guia", "a.md")
+    _write(src, "Guia", "INDEX.md")
+
+    imported = project.import_tree(str(src))
+
+    # INDEX.md vira o índice da pasta e fica no topo, como index.md
+    assert imported == ["Guia.Guia", "Guia.a"]
+    assert list(_disk_nav(site)[3]["Guia"][0]) == ["Guia"]
+
+
+def test_file_next_to_folder_is_rejected(site, project, tmp_path):
+    src = tmp_path / "origem"
+    _write(src, "X.md")
+    _write(src, "X", "a.md")
+    before = _disk_nav(site)
+
+    with pytest.raises(MkdocsIndexingError, match="X: X.md"):
+        project.import_tree(str(src))
+
+    assert _disk_nav(site) == before
+    assert os.listdir(site.doc_root) == []
+
+
+def test_names_mapping_to_same_key_are_rejected(site, project, tmp_path):
+    src = tmp_path / "origem"
+    _write(src, "a.b.md")
+    _write(src, "a_b.md")
+
+    with pytest.raises(MkdocsIndexingError, match="a_b"):
+        project.import_tree(str(src))
+    assert os.listdir(site.doc_root) == []
+
+
+def test_existing_documents_are_skipped(site, project, tmp_path):
+    src = tmp_path / "origem"
+    _write(src, "a.md")
+    _write(src, "b.md")
+    assert project.import_tree(str(src), "N") == ["N.a", "N.b"]
+
+    _write(src, "c.md")
+    assert project.import_tree(str(src), "N") == ["N.c"]
@@ -0,0 +1,77 @@
+import copy
+import os
+
+import pytest
+
+from docwriter import profiling
+from docwriter.manifest import FolderManifest
+from docwriter.project import Project
+
+
+@pytest.fixture
+def project(site):
+    for section in ("S0", "S1"):
+        os.makedirs(os.path.join(site.doc_root, section))
+    with open(os.path.join(site.doc_root, "S1", "index.md"), "w", encoding="utf-8") as f:
+        f.write("# Existente\n")
+    return Project(site.config_path, site.doc_root, new_section_text="{key}")
+
+
+def _section(project, key):
+    return next(item[key] for item in project.read_nav() if key in item)
+
+
+def _read(site, *parts):
+    with open(os.path.join(site.doc_root, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_indexes_existing_folders_in_one_write(project, site):
+    calls = []
+    with profiling.profile() as report:
+        assert project.index_all_folders(workers=2, progress=lambda *args: calls.append(args)) == ["S0", "S1"]
+    assert report.counters["yaml.dump"] == 1
+
+    assert _section(project, "S0")[0] == {"S0": "S0/index.md"}
+    assert _section(project, "S1")[0] == {"S1": "S1/index.md"}
+    # S2 não tem pasta na pasta docs
+    assert _section(project, "S2")[0] == {"D0": "S2/D0/D0.md"}
+    assert _read(site, "S0", "index.md") == "# S0\n\n{key}"
+    # index.md que já existia é mantido; só o que faltava foi criado (e reportado)
+    assert _read(site, "S1", "index.md") == "# Existente\n"
+    assert calls == [(1, 1)]
+    manifest = FolderManifest.for_docs(site.doc_root)
+    assert "S0" in manifest and "S1" in manifest and "S2" not in manifest
+
+
+def test_later_calls_only_look_at_new_folders(project, site):
+    project.index_all_folders()
+    project.unindex("S0.S0")
+    assert project.index_all_folders() == []
+    # o index removido de propósito não volta
+    assert _section(project, "S0")[0] == {"D0": "S0/D0/D0.md"}
+
+    project.index("N.A", site.source)
+    assert project.index_all_folders() == ["N"]
+    assert _section(project, "N") == [{"N": "N/index.md"}, {"A": "N/A/novo.md"}]
+
+
+def test_root_path_limits_the_scan(project):
+    assert project.index_all_folders("S1") == ["S1"]
+    assert _section(project, "S0")[0] == {"D0": "S0/D0/D0.md"}
+    assert project.index_all_folders() == ["S0"]
+
+
+def test_rollback_removes_created_indexes(project, site):
+    before = copy.deepcopy(project.read_nav())
+
+    def fail(done, total):
+        raise RuntimeError("cancelado")
+
+    with pytest.raises(RuntimeError):
+        project.index_all_folders(progress=fail)
+    assert project.read_nav() == before
+    assert not os.path.exists(os.path.join(site.doc_root, "S0", "index.md"))
+    assert _read(site, "S1", "index.md") == "# Existente\n"
+    # nada foi registrado no manifesto: a próxima chamada refaz tudo
+    assert project.index_all_folders() == ["S0", "S1"]
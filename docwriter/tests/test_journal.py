@@ -0,0 +1,163 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+import yaml
+
+from docwriter import project as project_module, yaml_io
+from docwriter.navtree import nav_tree
+from docwriter.project import Project
+
+
+def _project(site, compact=False):
+    return Project(site.config_path, site.doc_root, new_section_text="{key}", compact=compact, journal=True)
+
+def _fresh(site, compact=False):
+    """Project como o de outro processo: nada do arquivo nem do diário em memória."""
+    project_module._journals.clear()
+    yaml_io.invalidate()
+    return _project(site, compact)
+
+def _entries(nav):
+    return list(nav_tree(nav).entries())
+
+def _journal_lines(site):
+    with open(site.config_path + ".journal", "rb") as f:
+        return f.read().split(b"\n")
+
+def _disk_nav(site):
+    with open(site.config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["nav"]
+
+
+def test_torn_last_line_is_ignored_then_truncated(site):
+    project = _project(site)
+    project.index("N.A", site.source)
+    torn = b'{"seq":2,"time":1.0,"ops":[["add","N.B","N/B/b.md"'
+    with open(site.config_path + ".journal", "ab") as f:
+        f.write(torn)
+
+    other = _fresh(site)
+    paths = [path for path, _ in _entries(other.get_nav())]
+    assert "N.A" in paths and "N.B" not in paths
+
+    other.index("N.C", site.source)
+    lines = _journal_lines(site)
+    assert lines[-1] == b""
+    records = [json.loads(line) for line in lines[:-1]]
+    assert [record.get("seq") for record in records[1:]] == [1, 2]
+    assert records[2]["ops"] == [["add", "N.C", "N/C/novo.md"]]
+    assert torn not in b"\n".join(lines)
+
+
+def test_undo_last_entry(site):
+    with open(site.config_path, "rb") as f:
+        before = f.read()
+    project = _project(site)
+    project.index("N.A", site.source)
+    project.index("N.B", site.source)
+
+    assert project.undo()
+    paths = [path for path, _ in _entries(project.get_nav())]
+    assert "N.A" in paths and "N.B" not in paths
+    assert json.loads(_journal_lines(site)[-2]) == {"undo": 2}
+    # o arquivo de configuração não muda; outro processo vê o mesmo nav
+    with open(site.config_path, "rb") as f:
+        assert f.read() == before
+    other = _fresh(site)
+    assert _entries(other.get_nav()) == _entries(project.get_nav())
+
+    assert other.undo()
+    assert "N" not in nav_tree(other.get_nav())
+    assert not other.undo()
+
+
+def test_undo_stops_at_compaction(site):
+    project = _project(site)
+    project.index("N.A", site.source)
+    assert project.compact_journal() == 1
+    assert not project.undo()
+    assert "N.A" in nav_tree(project.get_nav())
+
+
+def _compact_and_index(config_path, doc_root, source):
+    project_module._journals.clear()
+    yaml_io.invalidate()
+    project = Project(config_path, doc_root, new_section_text="{key}", journal=True)
+    project.compact_journal()
+    project.index("N.B", source)
+
+
+def test_generation_reset_seen_by_second_project(site):
+    project = _project(site)
+    project.index("N.A", site.source)
+    generation = project._journal().generation
+
+    # outro processo compacta (nova geração) e grava uma entrada na geração nova
+    process = multiprocessing.Process(target=_compact_and_index, args=(site.config_path, site.doc_root, site.source))
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+
+    paths = [path for path, _ in _entries(project.get_nav())]
+    assert paths.count("N.A") == 1 and paths.count("N.B") == 1
+    journal = project._journal()
+    assert journal.generation != generation
+    assert [entry["seq"] for entry in journal.entries()] == [1]
+
+    project.index("N.C", site.source)
+    assert [path for path, _ in _entries(_fresh(site).get_nav())] == paths + ["N.C"]
+
+
+class _Crash(Exception):
+    pass
+
+def _crash_after(write):
+    def wrapper(*args, **kwargs):
+        write(*args, **kwargs)
+        raise _Crash()
+    return wrapper
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_replay_after_interrupted_compaction(site, monkeypatch, compact):
+    removed = os.path.join(site.doc_root, "S1", "D0", "D0.md")
+    os.makedirs(os.path.dirname(removed))
+    with open(removed, "w", encoding="utf-8") as f:
+        f.write("# D0\n")
+
+    project = _project(site, compact)
+    # operações que não podem ser reaplicadas sobre um nav que já as tem
+    project.index("A.X", site.source)
+    project.move("A.X", "B.X")
+    project.index("C.Y", site.source)
+    project.rename("C.Y", "Z")
+    project.unindex("S1.D0", "S1/D0/D0.md")
+    expected = _entries(project.get_nav())
+
+    # queda depois de gravar o arquivo de configuração e antes de recomeçar o diário
+    with monkeypatch.context() as patch:
+        patch.setattr(project_module, "_write_config", _crash_after(project_module._write_config))
+        patch.setattr(project_module, "_write_nav_compact", _crash_after(project_module._write_nav_compact))
+        with pytest.raises(_Crash):
+            project.compact_journal()
+    assert _entries(_disk_nav(site)) == expected
+    assert len(_journal_lines(site)) == 7
+    assert os.path.exists(removed)
+
+    other = _fresh(site, compact)
+    assert _entries(other.get_nav()) == expected
+    assert not other.undo()
+    # entradas novas, depois da compactação interrompida, continuam valendo
+    other.index("N.D", site.source)
+    expected.append(("N", None))
+    expected.append(("N.D", "N/D/novo.md"))
+    assert _entries(_fresh(site, compact).get_nav()) == expected
+
+    # a compactação seguinte termina o trabalho: remoções adiadas e diário recomeçado
+    assert _fresh(site, compact).compact_journal() == 1
+    assert _entries(_disk_nav(site)) == expected
+    assert not os.path.exists(removed)
+    assert len(_journal_lines(site)) == 2
+    assert _entries(_fresh(site, compact).get_nav()) == expected
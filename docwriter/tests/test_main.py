@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from docwriter import core
+from docwriter.project import Project
+
+
+@pytest.fixture
+def window(site, monkeypatch):
+    from docwriter import main
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    core.set_default_project(project)
+    # mensagens de sucesso/erro não devem bloquear o teste
+    monkeypatch.setattr(main.QMessageBox, "information", lambda *args: None)
+    monkeypatch.setattr(main.QMessageBox, "warning", lambda *args: None)
+    window = main.MainWindow()
+    resets = []
+    window.model.modelReset.connect(lambda: resets.append(1))
+    _settle(app, window)
+    yield app, window, resets
+    window.close()
+    core.set_default_project(None)
+
+
+def _settle(app, window, timeout=5.0):
+    """Processa eventos até a fila de tarefas e os níveis pendentes esvaziarem."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if not window.jobs._jobs and not window._pending_levels:
+            app.processEvents()
+            if not window.jobs._jobs and not window._pending_levels:
+                return
+        time.sleep(0.01)
+    raise AssertionError("fila de tarefas não esvaziou")
+
+
+def _children(model, path):
+    parent = model.index_for_path(path) if path else model.index(-1, 0)
+    if model.canFetchMore(parent):
+        model.fetchMore(parent)
+    return [model.data(model.index(row, 0, parent)) for row in range(model.rowCount(parent))]
+
+
+def test_edits_update_only_affected_level(site, window):
+    app, window, resets = window
+    assert _children(window.model, "") == ["S0", "S1", "S2"]
+    assert _children(window.model, "S1") == ["D0", "D1", "D2"]
+    resets.clear()
+
+    window.run_job("Adicionando", core.index, "S1.Novo", site.source)
+    window.run_job("Renomeando", core.rename, "S1.D0", "Primeiro")
+    _settle(app, window)
+
+    assert resets == []
+    assert _children(window.model, "S1") == ["Primeiro", "D1", "D2", "Novo"]
+    assert window.model.file("S1.Novo") == "S1/Novo/novo.md"
+
+
+def test_close_finishes_pending_writes(site, window):
+    app, window, _ = window
+    # a escrita fica na fila atrás de uma leitura ainda em andamento
+    window.jobs.submit(time.sleep, 0.2)
+    window.run_job("Adicionando", core.index, "N.A", site.source)
+    window.close()
+    assert {"N": [{"A": "N/A/novo.md"}]} in Project(site.config_path, site.doc_root).read_nav()
@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+
+import pytest
+import yaml
+
+from docwriter.exceptions import MkdocsConflictError
+from docwriter.navtree import NavConflict, NavTree, three_way_merge
+from docwriter.project import Project
+
+BASE = [
+    {"A": [{"X": "A/X.md"}, {"Y": "A/Y.md"}]},
+    {"B": [{"Z": "B/Z.md"}]},
+]
+
+
+def _nav(**changes):
+    """Cópia de BASE com {caminho com '_' no lugar de '.': arquivo ou None para remover}."""
+    nav = yaml.safe_load(yaml.safe_dump(BASE))
+    tree = NavTree(nav)
+    for path, file_path in changes.items():
+        path = path.replace("_", ".")
+        if file_path is None:
+            tree.remove(path)
+        else:
+            tree.add(path, file_path)
+    return nav
+
+
+def test_merge_without_conflicts():
+    ours = _nav(A_W="A/W.md", B_Z=None)
+    theirs = _nav(A_X="A/X2.md", B_V="B/V.md")
+    assert three_way_merge(BASE, ours, theirs) == []
+    assert theirs == [
+        {"A": [{"X": "A/X2.md"}, {"Y": "A/Y.md"}, {"W": "A/W.md"}]},
+        {"B": [{"V": "B/V.md"}]},
+    ]
+
+
+def test_same_change_on_both_sides():
+    ours = _nav(A_X="A/novo.md", C_D="C/D.md")
+    theirs = _nav(A_X="A/novo.md", C_D="C/D.md")
+    assert three_way_merge(BASE, ours, theirs) == []
+    assert theirs == ours
+
+
+def test_same_document_changed_on_both_sides():
+    ours = _nav(A_X="A/nosso.md")
+    theirs = _nav(A_X="A/deles.md")
+    expected = yaml.safe_load(yaml.safe_dump(theirs))
+    assert three_way_merge(BASE, ours, theirs) == [NavConflict("A.X", "A/X.md", "A/nosso.md", "A/deles.md")]
+    assert theirs == expected
+
+
+def test_same_new_path_added_on_both_sides():
+    ours = _nav(C_D="C/nosso.md")
+    theirs = _nav(C_D="C/deles.md")
+    assert three_way_merge(BASE, ours, theirs) == [NavConflict("C.D", None, "C/nosso.md", "C/deles.md")]
+
+
+def test_removed_by_us_updated_by_them():
+    ours = _nav(A_X=None)
+    theirs = _nav(A_X="A/deles.md")
+    assert three_way_merge(BASE, ours, theirs) == [NavConflict("A.X", "A/X.md", None, "A/deles.md")]
+    assert theirs == _nav(A_X="A/deles.md")
+
+
+def test_updated_by_us_removed_by_them():
+    ours = _nav(A_X="A/nosso.md")
+    theirs = _nav(A_X=None)
+    assert three_way_merge(BASE, ours, theirs) == [NavConflict("A.X", "A/X.md", "A/nosso.md", None)]
+    assert theirs == _nav(A_X=None)
+
+
+def test_removed_on_both_sides():
+    ours = _nav(B_Z=None)
+    theirs = _nav(B_Z=None)
+    assert three_way_merge(BASE, ours, theirs) == []
+    assert theirs == [BASE[0]]
+
+
+def test_transaction_conflict(site):
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    with pytest.raises(MkdocsConflictError) as raised:
+        with project.transaction():
+            project.update("S0.D1", "S0/D1/nosso.md")
+            # outro editor grava o mesmo documento enquanto a transação está aberta
+            with open(site.config_path, encoding="utf-8") as f:
+                text = f.read().replace("S0/D1/D1.md", "S0/D1/deles.md")
+            with open(site.config_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(site.config_path + ".tmp", site.config_path)
+    assert [conflict.path for conflict in raised.value.conflicts] == ["S0.D1"]
+    with open(site.config_path, encoding="utf-8") as f:
+        assert f.read() == text
+
+
+def _index_many(config_path, doc_root, source, paths):
+    project = Project(config_path, doc_root, new_section_text="{key}")
+    for path in paths:
+        project.index(path, source)
+
+
+@pytest.mark.parametrize("journal", ["", "1"])
+def test_parallel_processes(site, monkeypatch, journal):
+    monkeypatch.setenv("MKDOCS_JOURNAL", journal)
+    processes = [multiprocessing.Process(target=_index_many,
+                                         args=(site.config_path, site.doc_root, site.source,
+                                               [f"P{i}.Doc{j}" for j in range(15)]))
+                 for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(120)
+    assert [process.exitcode for process in processes] == [0] * 4
+
+    project = Project(site.config_path, site.doc_root)
+    project.compact_journal()
+    with open(site.config_path, encoding="utf-8") as f:
+        nav = yaml.safe_load(f)["nav"]
+    indexed = {key: [next(iter(item)) for item in value] for entry in nav for key, value in entry.items()
+               if key.startswith("P")}
+    assert indexed == {f"P{i}": [f"Doc{j}" for j in range(15)] for i in range(4)}
+    # o nav original continua lá
+    assert [next(iter(entry)) for entry in nav[:3]] == ["S0", "S1", "S2"]
@@ -0,0 +1,103 @@
+import copy
+import os
+
+import pytest
+
+from docwriter.exceptions import MkdocsIndexingError
+from docwriter.navtree import NavTree, Retarget
+from docwriter.project import Project
+
+
+@pytest.fixture
+def project(site):
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    with project.transaction():
+        project.index("A.X", site.source)
+        project.index("A.Y.Z", site.source)
+        project.index("A.A", site.source)
+        project.index("A.Fora", site.source)
+        project.update("A.Fora", "/externo/fora.md")
+        project.index("A.Link", site.source)
+        project.update("A.Link", "https://exemplo.com/doc.md")
+    return project
+
+
+def _doc(site, *parts):
+    return os.path.join(site.doc_root, *parts)
+
+
+def _nav(project):
+    return next(item["B"] for item in project.read_nav() if "B" in item)
+
+
+def test_retarget_changes_only_files_inside_folder():
+    retarget = Retarget("A/B", "C")
+    assert retarget("A/B/doc.md") == "C/doc.md"
+    assert retarget("A/B/D/doc.md") == "C/D/doc.md"
+    assert retarget("A/BB/doc.md") == "A/BB/doc.md"
+    assert retarget("/abs/A/B/doc.md") == "/abs/A/B/doc.md"
+
+
+def test_navtree_move_retargets_whole_subtree():
+    tree = NavTree([{"A": [{"X": "A/X/x.md"}, {"Y": [{"Z": "A/Y/Z/z.md"}]}, {"U": "https://u"}]}])
+    assert tree.move("A", "B", Retarget("A", "B"))
+    assert tree.nav == [{"B": [{"X": "B/X/x.md"}, {"Y": [{"Z": "B/Y/Z/z.md"}]}, {"U": "https://u"}]}]
+
+
+def test_rename_moves_folder_and_section_index(project, site):
+    assert project.rename("A", "B")
+    assert _nav(project) == [
+        {"X": "B/X/novo.md"},
+        {"Y": [{"Z": "B/Y/Z/novo.md"}]},
+        # o index da seção acompanha o novo nome
+        {"B": "B/novo.md"},
+        {"Fora": "/externo/fora.md"},
+        {"Link": "https://exemplo.com/doc.md"},
+    ]
+    assert not os.path.exists(_doc(site, "A"))
+    for parts in (("X",), ("Y", "Z"), ()):
+        assert os.path.isfile(_doc(site, "B", *parts, "novo.md"))
+
+
+def test_move_to_other_level(project, site):
+    assert project.move("A.Y", "B.Nova.Y")
+    assert _nav(project) == [{"Nova": [{"Y": [{"Z": "B/Nova/Y/Z/novo.md"}]}]}]
+    assert os.path.isfile(_doc(site, "B", "Nova", "Y", "Z", "novo.md"))
+    assert not os.path.exists(_doc(site, "A", "Y"))
+
+
+def test_chained_moves_in_one_transaction(project, site):
+    with project.transaction():
+        assert project.move("A.Y", "A.W")
+        assert project.move("A.W", "B.V")
+        # as pastas só mudam de lugar no commit
+        assert os.path.isdir(_doc(site, "A", "Y"))
+    assert _nav(project) == [{"V": [{"Z": "B/V/Z/novo.md"}]}]
+    assert os.path.isfile(_doc(site, "B", "V", "Z", "novo.md"))
+    assert not os.path.exists(_doc(site, "A", "Y"))
+
+
+def test_move_rolls_back_with_transaction(project, site):
+    before = copy.deepcopy(project.read_nav())
+    with pytest.raises(RuntimeError):
+        with project.transaction():
+            project.move("A.Y", "B.Y")
+            raise RuntimeError("desfeito")
+    assert project.read_nav() == before
+    assert os.path.isfile(_doc(site, "A", "Y", "Z", "novo.md"))
+    assert not os.path.exists(_doc(site, "B"))
+
+
+def test_move_refusals(project, site):
+    assert not project.move("Nada", "B")
+    assert not project.move("A.X", "A.A")
+    with pytest.raises(MkdocsIndexingError):
+        project.move("A.A", "B")
+    with pytest.raises(MkdocsIndexingError):
+        project.move("A.X", "B..X")
+    with pytest.raises(MkdocsIndexingError):
+        project.rename("A.X", "B.X")
+    os.makedirs(_doc(site, "B"))
+    with pytest.raises(MkdocsIndexingError):
+        project.rename("A", "B")
+    assert os.path.isfile(_doc(site, "A", "X", "novo.md"))
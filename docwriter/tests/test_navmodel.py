@@ -0,0 +1,218 @@
+from docwriter.compact import CompactNav
+from docwriter.navmodel import snapshot
+from docwriter.navtree import NavTree, nav_get
+
+NAV = [{"A": [{"B": "A/B.md"}, {"C": [{"D": "A/C/D.md"}]}]}, {"E": "E.md"}]
+
+
+def test_snapshot_of_list_is_independent():
+    nav = [{"A": [{"B": "A/B.md"}, {"C": [{"D": "A/C/D.md"}]}]}, {"E": "E.md"}]
+    copy = snapshot(nav)
+    assert copy == NAV
+
+    tree = NavTree(nav)
+    tree.add("A.C.F", "A/C/F.md")
+    tree.remove("E")
+    tree.move("A.B", "G.B")
+    assert copy == NAV
+
+
+def test_snapshot_of_compact_nav_is_independent():
+    tree = CompactNav.from_nav(NAV)
+    events = []
+    tree.subscribe(events.append)
+    copy = snapshot(tree)
+    assert copy.to_nav() == NAV
+
+    tree.add("A.C.F", "A/C/F.md")
+    tree.rename("A.B", "X")
+    tree.remove("E")
+    copy.add("Z", "Z.md")
+
+    assert copy.to_nav() == NAV + [{"Z": "Z.md"}]
+    assert nav_get(copy, "A.B") == "A/B.md"
+    assert "Z" not in tree
+    # os callbacks ficam só na árvore original
+    assert len(events) == 3
+
+
+def test_snapshot_of_empty_nav():
+    assert snapshot(None) == []
+    assert snapshot([]) == []
+
+
+import threading
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QModelIndex, QPersistentModelIndex
+
+from docwriter.jobs import JobRunner
+from docwriter.navmodel import KEEP, NavModel, level_snapshot
+from docwriter.navtree import NavMoved
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _nav():
+    return [
+        {"A": [{"B": "A/B.md"}, {"C": [{"D": "A/C/D.md"}, {"E": [{"F": "A/C/E/F.md"}]}]}]},
+        {"G": "G.md"},
+        {"H": [{"I": "H/I.md"}]},
+    ]
+
+
+def _rows(model, parent=QModelIndex()):
+    """Árvore exibida pelo modelo, buscando todos os níveis."""
+    if model.canFetchMore(parent):
+        model.fetchMore(parent)
+    rows = []
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        children = _rows(model, index)
+        rows.append((model.data(index), children) if children else model.data(index))
+    return rows
+
+
+class _Signals:
+    def __init__(self, model):
+        self.calls = []
+        model.modelReset.connect(lambda: self.calls.append("reset"))
+        model.rowsInserted.connect(lambda parent, first, last: self.calls.append(("+", model.path(parent), first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.calls.append(("-", model.path(parent), first, last)))
+
+
+def _follow(model, nav):
+    """Aplica cada evento como a janela: um nível por evento, copiado do nav atual."""
+    def apply(parent, key):
+        path, key = model.loaded_level(parent, key)
+        keys = {key}
+        while keys:
+            entries = level_snapshot(nav, path, keys, model.known_keys(path))
+            keys = model.apply_level(path, entries)
+
+    def on_event(event):
+        apply(event.parent, event.path.rpartition('.')[2])
+        if isinstance(event, NavMoved):
+            apply(event.old_parent, event.old_path.rpartition('.')[2])
+    return on_event
+
+
+@pytest.fixture(params=["list", "compact"])
+def live(request, app):
+    nav = _nav()
+    tree = NavTree(nav) if request.param == "list" else CompactNav.from_nav(nav)
+    model = NavModel(snapshot(tree.nav))
+    tree.subscribe(_follow(model, tree.nav))
+    return tree, model
+
+
+def _expected(tree):
+    model = NavModel()
+    model.reset(snapshot(tree.nav))
+    return _rows(model)
+
+
+def test_level_snapshot_copies_only_what_changed():
+    nav = _nav()
+    entries = level_snapshot(nav, "", {"A"}, {"A", "H"})
+    assert entries == [("A", "dir", nav[0]["A"]), ("G", "dir", "G.md"), ("H", "dir", KEEP)]
+    assert entries[0][2] is not nav[0]["A"]
+    # pastas que o modelo ainda não tem vêm inteiras
+    assert level_snapshot(nav, "A.C", set(), set()) == [("D", "dir", "A/C/D.md"), ("E", "dir", [{"F": "A/C/E/F.md"}])]
+    assert level_snapshot(nav, "A.B", set(), set()) == [("B.md", "leaf", "A/B.md")]
+    assert level_snapshot(nav, "X.Y", {"Z"}, set()) is None
+
+
+def test_level_snapshot_of_compact_nav():
+    tree = CompactNav.from_nav(_nav())
+    assert level_snapshot(tree, "", {"A"}, {"A", "H"}) == [("A", "dir", _nav()[0]["A"]), ("G", "dir", "G.md"), ("H", "dir", KEEP)]
+    assert level_snapshot(tree, "A.C", {"E"}, {"E"}) == [("D", "dir", "A/C/D.md"), ("E", "dir", [{"F": "A/C/E/F.md"}])]
+    assert level_snapshot(tree, "A.B", set(), set()) == [("B.md", "leaf", "A/B.md")]
+    assert level_snapshot(tree, "X", set(), set()) is None
+
+
+def test_events_update_rows_without_reset(live):
+    tree, model = live
+    # carrega os níveis até A.C (os filhos de A.C entram na view)
+    assert model.index_for_path("A.C.D").isValid()
+    # itens que não mudaram continuam com o mesmo índice
+    kept = QPersistentModelIndex(model.index_for_path("H"))
+    signals = _Signals(model)
+
+    tree.add("A.C.X", "A/C/X.md")
+    tree.remove("G")
+    tree.rename("A.B", "B2")
+    tree.update("A.C.D", "A/C/D2.md")
+
+    assert "reset" not in signals.calls
+    assert ("+", "A.C", 2, 2) in signals.calls
+    assert ("-", "", 1, 1) in signals.calls
+    assert _rows(model) == _expected(tree)
+    assert model.file("A.C.D") == "A/C/D2.md"
+    assert kept.isValid() and model.path(QModelIndex(kept)) == "H"
+
+
+def test_move_between_levels(live):
+    tree, model = live
+    model.index_for_path("A.C.E")
+    model.index_for_path("H")
+    signals = _Signals(model)
+
+    tree.move("A.C.E", "H.E")
+    tree.move("H.I", "N.I")
+
+    assert "reset" not in signals.calls
+    assert ("-", "A.C", 1, 1) in signals.calls
+    assert _rows(model) == _expected(tree)
+
+
+def test_changes_below_unloaded_levels(live):
+    tree, model = live
+    # só o primeiro nível foi carregado: o nível de A recebe a cópia nova
+    tree.add("A.C.E.Z", "A/C/E/Z.md")
+    tree.add("Novo.Sub.Doc", "Novo/Sub/Doc.md")
+    assert _rows(model) == _expected(tree)
+
+
+def test_missing_keep_is_requested_again(app):
+    model = NavModel()
+    model.reset(snapshot(_nav()))
+    model.index_for_path("A")
+    # o nível mudou desde o pedido: 'Outra' não está no modelo
+    entries = [("A", "dir", KEEP), ("Outra", "dir", KEEP)]
+    assert model.apply_level("", entries) == {"Outra"}
+    assert model.apply_level("X.Y", entries) == set()
+
+
+def test_file_and_folder_lookups(app):
+    for nav in (_nav(), CompactNav.from_nav(_nav())):
+        model = NavModel()
+        model.reset(snapshot(nav))
+        assert model.file("A.C.D") == "A/C/D.md"
+        assert model.file("A.C") is None
+        assert model.file("Nada") is None
+        assert model.is_folder("A.C")
+        assert not model.is_folder("G")
+        assert not model.is_folder("Nada")
+
+
+def test_cancel_reads_keeps_writes(app):
+    runner = JobRunner()
+    started, release = threading.Event(), threading.Event()
+    ran = []
+
+    def blocking():
+        started.set()
+        release.wait(5)
+    runner.submit(blocking, label="Primeira")
+    assert started.wait(5)
+    runner.submit(ran.append, "leitura")
+    runner.submit(ran.append, "escrita", label="Gravando")
+
+    runner.cancel_reads()
+    release.set()
+    assert runner.wait(5000)
+    assert ran == ["escrita"]
@@ -0,0 +1,164 @@
+import random
+
+import pytest
+
+from docwriter.navtree import NavTree, nav_add, nav_get, nav_remove, nav_update
+
+
+# Implementação linear original das funções nav_*, usada como referência
+
+
+def _old_find(level, key):
+    for item in level:
+        if isinstance(item, dict) and key in item:
+            return item
+    return None
+
+def old_nav_add(nav, path, file_path):
+    keys = path.split('.')
+    current = nav
+    for i, key in enumerate(keys):
+        found = _old_find(current, key)
+        if found:
+            if i < len(keys) - 1:
+                if not isinstance(found[key], list):
+                    found[key] = []
+                current = found[key]
+            else:
+                found[key] = file_path
+        else:
+            if i < len(keys) - 1:
+                new_level = {key: []}
+                current.append(new_level)
+                current = new_level[key]
+            else:
+                current.append({key: file_path})
+    return nav
+
+def old_nav_remove(nav, path):
+    current = nav
+    stack = []
+    for key in path.split('.'):
+        parent = current
+        found = _old_find(current, key)
+        if not found:
+            return nav
+        stack.append((parent, found, key))
+        if isinstance(found[key], list):
+            current = found[key]
+        else:
+            break
+    parent, found, key = stack.pop()
+    parent.remove(found)
+    while stack:
+        parent, found, key = stack.pop()
+        if isinstance(found[key], list) and not found[key]:
+            parent.remove(found)
+        else:
+            break
+    return nav
+
+def old_nav_update(nav, path, new_file):
+    keys = path.split('.')
+    current = nav
+    for i, key in enumerate(keys):
+        found = _old_find(current, key)
+        if found is None:
+            return False
+        if i == len(keys) - 1:
+            found[key] = new_file
+            return True
+        if not isinstance(found[key], list):
+            return False
+        current = found[key]
+    return False
+
+def old_nav_get(nav, path):
+    keys = path.split('.')
+    current = nav
+    for i, key in enumerate(keys):
+        found = _old_find(current, key)
+        if found is None:
+            return None
+        found = found[key]
+        if i == len(keys) - 1:
+            return found
+        if not isinstance(found, list):
+            return None
+        current = found
+    return None
+
+
+def _random_path(rng, depth=3):
+    return ".".join(rng.choice("ABCD") for _ in range(rng.randint(1, depth)))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_shims_match_linear_implementation(seed):
+    rng = random.Random(seed)
+    new, old = [], []
+    for step in range(300):
+        op = rng.choice(("add", "add", "remove", "update", "get"))
+        path = _random_path(rng)
+        if op == "add":
+            file_path = f"{path.replace('.', '/')}/{step}.md"
+            assert nav_add(new, path, file_path) is new
+            old_nav_add(old, path, file_path)
+        elif op == "remove":
+            assert nav_remove(new, path) is new
+            old_nav_remove(old, path)
+        elif op == "update":
+            assert nav_update(new, path, f"novo/{step}.md") == old_nav_update(old, path, f"novo/{step}.md")
+        else:
+            assert nav_get(new, path) == old_nav_get(old, path)
+        assert new == old, (step, op, path)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tree_reused_across_operations(seed):
+    # a mesma árvore (com os índices montados) precisa dar o mesmo resultado das funções lineares
+    rng = random.Random(seed)
+    tree, old = NavTree(), []
+    for step in range(300):
+        op = rng.choice(("add", "add", "remove", "update", "get"))
+        path = _random_path(rng)
+        if op == "add":
+            tree.add(path, f"{step}.md")
+            old_nav_add(old, path, f"{step}.md")
+        elif op == "remove":
+            tree.remove(path)
+            old_nav_remove(old, path)
+        elif op == "update":
+            assert tree.update(path, f"{step}.md") == old_nav_update(old, path, f"{step}.md")
+        else:
+            assert tree.get(path) == old_nav_get(old, path)
+        assert tree.nav == old, (step, op, path)
+
+
+def test_reindex_after_external_change():
+    nav = [{"A": [{"B": "A/B.md"}]}]
+    tree = NavTree(nav)
+    assert tree.get("A.B") == "A/B.md"
+
+    # alteração feita por fora da árvore: o índice antigo ainda aponta para o item removido
+    nav[0]["A"] = [{"C": "A/C.md"}]
+    nav.append({"D": "D.md"})
+    tree.reindex()
+
+    assert "A.B" not in tree
+    assert tree.get("A.C") == "A/C.md"
+    assert tree.get("D") == "D.md"
+    assert tree.paths() == ["A", "A.C", "D"]
+
+    tree.add("A.E", "A/E.md")
+    assert nav == [{"A": [{"C": "A/C.md"}, {"E": "A/E.md"}]}, {"D": "D.md"}]
+
+
+def test_level_index_notices_appended_items():
+    nav = [{"A": "A.md"}]
+    tree = NavTree(nav)
+    assert "A" in tree
+    # itens acrescentados por fora mudam o tamanho da lista, o que invalida o índice do nível
+    nav.append({"B": "B.md"})
+    assert tree.get("B") == "B.md"
+
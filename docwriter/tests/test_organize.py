@@ -0,0 +1,113 @@
+import copy
+import random
+
+import pytest
+
+from docwriter.navtree import nav_get, organize_nav_indexes
+
+
+def old_organize_node(node):
+    """organize_node da implementação original (nova lista a cada pasta), usada como referência."""
+    if not isinstance(node, dict):
+        return node
+    new_dict = {}
+    for key, value in node.items():
+        if not isinstance(value, list):
+            new_dict[key] = value
+            continue
+        indexes = []
+        others = []
+        for item in value:
+            if isinstance(item, dict):
+                for subkey, subvalue in item.items():
+                    if subkey == key and subvalue.endswith("index.md"):
+                        indexes.append(item)
+                    else:
+                        others.append(old_organize_node(item))
+            elif isinstance(item, str) and item.endswith("index.md"):
+                indexes.append(item)
+            else:
+                others.append(item)
+        dir_index = None
+        for item in value:
+            if isinstance(item, dict) and key in item and item[key].endswith("index.md"):
+                dir_index = item
+                break
+        new_list = []
+        if dir_index:
+            new_list.append(dir_index)
+            others = [o for o in others if o != dir_index]
+        else:
+            new_list.extend(indexes)
+        new_list.extend(others)
+        new_dict[key] = new_list
+    return new_dict
+
+
+def _random_folder(rng, key, depth, folders, prefix=""):
+    """Conteúdo aleatório da pasta 'key'; os caminhos das subpastas vão para 'folders'."""
+    level = []
+    for n in range(rng.randint(0, 6)):
+        kind = rng.choice(("doc", "doc", "folder", "folder_index", "other_index", "str_index", "str"))
+        if kind == "folder" and depth < 3:
+            name = f"P{depth}-{n}"
+            path = f"{prefix}.{name}" if prefix else name
+            folders.append(path)
+            level.append({name: _random_folder(rng, name, depth + 1, folders, path)})
+        elif kind == "folder_index":
+            level.append({key: f"{key}/{n}/index.md"})
+        elif kind == "other_index":
+            level.append({f"I{n}": f"{key}/I{n}/index.md"})
+        elif kind == "str_index":
+            level.append(f"{key}/s{n}/index.md")
+        elif kind == "str":
+            level.append(f"{key}/s{n}.md")
+        else:
+            level.append({f"D{n}": f"{key}/D{n}.md"})
+    return level
+
+def _random_nav(rng):
+    folders = []
+    nav = [{"Home": "index.md"}]
+    for n in range(rng.randint(1, 4)):
+        name = f"Top{n}"
+        folders.append(name)
+        nav.append({name: _random_folder(rng, name, 0, folders, name)})
+    return nav, folders
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_original_organize(seed):
+    nav, _ = _random_nav(random.Random(seed))
+    expected = [old_organize_node(item) for item in nav]
+    assert organize_nav_indexes(nav) is nav
+    assert nav == expected
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_paths_subset(seed):
+    rng = random.Random(seed)
+    nav, folders = _random_nav(rng)
+    paths = rng.sample(folders, rng.randint(1, len(folders)))
+
+    # referência: organize_node só nas subárvores pedidas, o resto fica como estava
+    expected = copy.deepcopy(nav)
+    for path in paths:
+        level = nav_get(expected, path)
+        key = path.rpartition('.')[2]
+        level[:] = old_organize_node({key: level})[key]
+
+    organize_nav_indexes(nav, paths)
+    assert nav == expected
+
+
+def test_paths_subset_leaves_other_folders():
+    nav = [
+        {"A": [{"a": "A/a.md"}, {"A": "A/index.md"}]},
+        {"B": [{"b": "B/b.md"}, {"B": "B/index.md"}]},
+    ]
+    organize_nav_indexes(nav, ["B"])
+    assert nav == [
+        {"A": [{"a": "A/a.md"}, {"A": "A/index.md"}]},
+        {"B": [{"B": "B/index.md"}, {"b": "B/b.md"}]},
+    ]
@@ -0,0 +1,101 @@
+import errno
+import os
+
+import pytest
+
+from docwriter import placement
+from docwriter.placement import COPY, HARDLINK, REFLINK, SKIPPED, SYMLINK, place
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "origem.md"
+    path.write_text("# Documento\n" * 1000, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def target(tmp_path):
+    return tmp_path / "docs" / "Pasta" / "Doc" / "doc.md"
+
+
+def test_copy_is_independent(source, target):
+    assert place(source, target, COPY) == COPY
+    assert target.read_bytes() == source.read_bytes()
+    assert not os.path.samefile(source, target)
+    assert place(source, target, COPY) == SKIPPED
+
+    source.write_text("# Alterado\n", encoding="utf-8")
+    assert target.read_text(encoding="utf-8").startswith("# Documento")
+    assert place(source, target, COPY) == COPY
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_hardlink_shares_inode(source, target):
+    target.parent.mkdir(parents=True)
+    target.write_text("# Antigo\n", encoding="utf-8")
+    assert place(source, target, HARDLINK) == HARDLINK
+    assert os.path.samefile(source, target)
+    assert place(source, target, HARDLINK) == SKIPPED
+
+
+def test_replacing_a_hardlink_keeps_the_old_source(tmp_path, source, target):
+    place(source, target, HARDLINK)
+    other = tmp_path / "outro.md"
+    other.write_text("# Outro\n", encoding="utf-8")
+    # a troca é feita por os.replace: o arquivo de origem anterior não é sobrescrito
+    assert place(other, target, COPY) == COPY
+    assert source.read_text(encoding="utf-8").startswith("# Documento")
+    assert target.read_text(encoding="utf-8") == "# Outro\n"
+
+
+def test_symlink_points_to_source(source, target):
+    assert place(source, target, SYMLINK) == SYMLINK
+    assert target.is_symlink()
+    assert target.resolve() == source.resolve()
+    assert place(source, target, SYMLINK) == SKIPPED
+
+
+def test_reflink_falls_back_to_copy(source, target):
+    # reflink só existe em alguns sistemas de arquivos; nos outros vira cópia
+    assert place(source, target, REFLINK) in (REFLINK, COPY)
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_unsupported_link_falls_back_to_copy(source, target, monkeypatch):
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "outro dispositivo")
+    monkeypatch.setattr(placement._os, "link", cross_device)
+    assert place(source, target, HARDLINK) == COPY
+    assert not os.path.samefile(source, target)
+    assert [name for name in os.listdir(target.parent) if name.endswith(".tmp")] == []
+
+
+def test_real_errors_are_raised(source, target, monkeypatch):
+    def denied(src, dst):
+        raise OSError(errno.EACCES, "sem permissão")
+    monkeypatch.setattr(placement._os, "link", denied)
+    with pytest.raises(OSError):
+        place(source, target, HARDLINK)
+    assert not target.exists()
+
+
+def test_kernel_copy_fallback(source, target, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.ENOSYS, "indisponível")
+    monkeypatch.setattr(placement, "_copy_file_range", unsupported)
+    monkeypatch.setattr(placement, "_sendfile", unsupported)
+    assert place(source, target, COPY) == COPY
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_invalid_strategy(source, target):
+    with pytest.raises(ValueError):
+        place(source, target, "teleporte")
+
+
+def test_project_uses_configured_strategy(site):
+    from docwriter.project import Project
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}", placement=HARDLINK)
+    assert project.index("N.A", site.source)
+    assert os.path.samefile(os.path.join(site.doc_root, "N", "A", "novo.md"), site.source)
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from docwriter import profiling
+from docwriter.project import Project
+
+
+@pytest.fixture(autouse=True)
+def no_env(monkeypatch):
+    """Cada teste começa sem DOCWRITER_PROFILE consultado."""
+    monkeypatch.delenv("DOCWRITER_PROFILE", raising=False)
+    monkeypatch.setattr(profiling, "_env_checked", True)
+    monkeypatch.setattr(profiling, "_env_report", None)
+    monkeypatch.setattr(profiling, "active", False)
+
+
+def test_nested_spans_have_total_and_own_time():
+    with profiling.profile() as report:
+        with profiling.span("fora"):
+            time.sleep(0.01)
+            for _ in range(2):
+                with profiling.span("dentro"):
+                    time.sleep(0.01)
+        profiling.count("itens", 3)
+        profiling.count("itens")
+
+    assert set(report.spans) == {"fora", "fora > dentro"}
+    calls, total, own = report.spans["fora"]
+    assert calls == 1 and own < total
+    assert report.spans["fora > dentro"][0] == 2
+    assert total == pytest.approx(own + report.spans["fora > dentro"][1])
+    assert report.total("dentro") == report.spans["fora > dentro"][2]
+    assert report.counters == {"itens": 4}
+    assert report.summary(top=1).endswith(f"(dentro {report.total('dentro') * 1000:.1f} ms)")
+    lines = report.format().splitlines()
+    assert lines[0].startswith("fora ") and lines[1].startswith("  dentro ") and lines[2] == "itens=4"
+
+
+def test_nothing_is_collected_outside_profile():
+    assert profiling.span("x") is profiling._NULL
+    with profiling.profile() as report:
+        pass
+    profiling.count("itens")
+    with profiling.span("x"):
+        pass
+    assert report.spans == {} and report.counters == {}
+    assert not profiling.active
+
+
+def test_spans_from_other_threads_have_own_stack():
+    def work():
+        with profiling.span("thread"):
+            pass
+
+    with profiling.profile() as report:
+        with profiling.span("principal"):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+    assert set(report.spans) == {"principal", "thread"}
+
+
+def test_project_operations_are_reported(site):
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    with profiling.profile() as report:
+        project.index("N.A", site.source)
+    assert "project.index" in report.spans
+    assert report.counters["yaml.dump"] == 1
+    assert report.counters["bytes.copied"] == len(b"# Novo\n")
+
+
+def test_env_variable_appends_each_operation(site, tmp_path, monkeypatch):
+    target = tmp_path / "perfil.txt"
+    monkeypatch.setenv("DOCWRITER_PROFILE", str(target))
+    monkeypatch.setattr(profiling, "_env_checked", False)
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    project.index("N.A", site.source)
+    project.rename("N.A", "B")
+
+    blocks = target.read_text(encoding="utf-8").strip().split("\n\n")
+    assert [block.splitlines()[0].split()[0] for block in blocks] == ["project.index", "project.rename"]
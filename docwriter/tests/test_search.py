@@ -0,0 +1,88 @@
+import pytest
+
+from docwriter import search
+from docwriter.project import Project
+from docwriter.search import NavIndex, SearchHit
+
+
+@pytest.fixture
+def index():
+    return NavIndex([
+        {"Aplicações": [
+            {"Teste": "Aplicacoes/Teste/teste.md"},
+            {"Testes de carga": "Aplicacoes/Carga/carga.md"},
+            {"Manual": [{"Instalação": "Aplicacoes/Manual/instalar.md"}]},
+        ]},
+        {"Teste": "teste.md"},
+        {"Contestação": "outros/contestacao.md"},
+    ])
+
+
+def _state(index):
+    """Itens vivos do índice, comparáveis com os de um índice novo."""
+    return sorted(entry[:3] for entry in index._entries if entry is not None)
+
+
+def test_search_ranks_exact_prefix_and_substring(index):
+    assert [hit.path for hit in index.search("test")] == [
+        "Teste", "Aplicações.Teste", "Aplicações.Testes de carga", "Contestação"]
+    assert index.search("aplic teste", limit=1) == [SearchHit("Aplicações.Teste", "Teste", "Aplicacoes/Teste/teste.md")]
+
+
+def test_search_ignores_accents_and_matches_files(index):
+    assert [hit.path for hit in index.search("instalacao")] == ["Aplicações.Manual.Instalação"]
+    assert [hit.path for hit in index.search("instalar.md")] == ["Aplicações.Manual.Instalação"]
+    assert index.search("Manual")[0] == SearchHit("Aplicações.Manual", "Manual")
+
+
+def test_short_query_uses_key_prefixes(index):
+    assert [hit.path for hit in index.search("ma")] == ["Aplicações.Manual"]
+    assert index.search("  ") == []
+
+
+@pytest.fixture(params=["list", "compact"])
+def project(request, site, monkeypatch):
+    if request.param == "compact":
+        monkeypatch.setenv("MKDOCS_COMPACT_NAV", "1")
+    return Project(site.config_path, site.doc_root, new_section_text="{key}")
+
+
+def test_events_keep_index_equal_to_rebuild(project, site, monkeypatch):
+    index = project.search_index()
+    assert len(index) == 12
+    rebuilds = []
+    monkeypatch.setattr(NavIndex, "rebuild", lambda self, nav=None: rebuilds.append(nav))
+
+    project.index("S1.Novo", site.source)
+    project.index("N.A.B", site.source)
+    project.unindex("S0.D1")
+    project.rename("S2", "Renomeada")
+    project.move("S1.D0", "N.D0")
+    project.update("S1.D2", "S1/D2/outro.md")
+
+    assert project.search_index() is index
+    assert rebuilds == []
+    monkeypatch.undo()
+    assert _state(index) == _state(NavIndex(project.get_nav()))
+    assert [hit.path for hit in project.search("renomeada d0")] == ["Renomeada.D0"]
+    assert project.search("S2") == []
+    assert project.search("outro.md") == [SearchHit("S1.D2", "D2", "S1/D2/outro.md")]
+
+
+def test_removed_entries_trigger_rebuild(project, monkeypatch):
+    monkeypatch.setattr(search, "_MAX_DEAD_RATIO", 0.2)
+    index = project.search_index()
+    project.unindex("S0")
+    # três documentos e a seção saíram; acima de 20% dos itens o índice é remontado
+    assert index._dead == 0
+    assert _state(index) == _state(NavIndex(project.get_nav()))
+
+
+def test_reloaded_nav_rebuilds_index(site, monkeypatch):
+    monkeypatch.setenv("MKDOCS_JOURNAL", "1")
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    index = project.search_index()
+    project.index("N.A", site.source)
+    assert project.undo()
+    assert project.search_index() is not index
+    assert project.search("novo.md") == []
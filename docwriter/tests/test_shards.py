@@ -0,0 +1,111 @@
+import os
+import stat
+
+import pytest
+import yaml
+
+from docwriter import yaml_io
+from docwriter.project import Project
+
+
+@pytest.fixture
+def project(site, tmp_path):
+    return Project(site.config_path, site.doc_root, new_section_text="{key}", nav_dir=tmp_path / "nav")
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _mtimes(folder):
+    return {name: os.stat(os.path.join(folder, name)).st_mtime_ns for name in os.listdir(folder)}
+
+
+def test_split_writes_one_file_per_section(site, project):
+    original = _load(site.config_path)["nav"]
+
+    assert project.split_nav() == ["S0.yml", "S1.yml", "S2.yml"]
+
+    assert _load(os.path.join(project.nav_dir, yaml_io.NAV_MANIFEST)) == ["S0.yml", "S1.yml", "S2.yml"]
+    assert _load(os.path.join(project.nav_dir, "S1.yml")) == original[1]
+    yaml_io.invalidate()
+    assert project.read_nav() == original
+
+
+def test_edit_touches_only_its_section(site, project):
+    project.split_nav()
+    before = _mtimes(project.nav_dir)
+
+    assert project.index("S1.Novo", site.source)
+
+    after = _mtimes(project.nav_dir)
+    changed = sorted(name for name in after if after[name] != before.get(name))
+    assert changed == ["S1.yml", "S1.yml.bkp.1"]
+    assert {"Novo": "S1/Novo/novo.md"} in _load(os.path.join(project.nav_dir, "S1.yml"))["S1"]
+
+
+def test_new_and_removed_sections(site, project):
+    project.split_nav()
+    assert project.index("Nova.Doc", site.source)
+    assert _load(os.path.join(project.nav_dir, yaml_io.NAV_MANIFEST)) == ["S0.yml", "S1.yml", "S2.yml", "Nova.yml"]
+
+    assert project.unindex("S0")
+    assert _load(os.path.join(project.nav_dir, yaml_io.NAV_MANIFEST)) == ["S1.yml", "S2.yml", "Nova.yml"]
+    assert not os.path.exists(os.path.join(project.nav_dir, "S0.yml"))
+
+
+def test_split_merge_round_trip(site, project, tmp_path):
+    original = _load(site.config_path)
+    project.split_nav()
+    project.merge_nav()
+    assert _load(site.config_path) == original
+    # uma segunda volta não muda mais nada no texto
+    with open(site.config_path, encoding="utf-8") as f:
+        merged = f.read()
+    project.split_nav()
+    project.merge_nav()
+    with open(site.config_path, encoding="utf-8") as f:
+        assert f.read() == merged
+
+    assert project.rename("S2.D1", "Outro")
+    output = tmp_path / "mkdocs.build.yml"
+    project.merge_nav(str(output))
+
+    built = output.read_text(encoding="utf-8")
+    # o resto do arquivo é copiado como está
+    assert built.startswith("# configuração de teste\nsite_name: Teste\n")
+    assert built.endswith("theme:\n  name: material\n")
+    assert _load(output)["nav"][2] == {"S2": [{"D0": "S2/D0/D0.md"}, {"Outro": "S2/Outro/D1.md"}, {"D2": "S2/D2/D2.md"}]}
+    with open(site.config_path, encoding="utf-8") as f:
+        assert f.read() == merged
+
+
+def test_new_file_mode_follows_umask(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_io, "_UMASK", None)
+    previous = os.umask(0o027)
+    try:
+        path = tmp_path / "novo.yml"
+        yaml_io.write_config(str(path), {"nav": []}, backups=0)
+    finally:
+        os.umask(previous)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_umask_is_read_lazily(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_io, "_UMASK", None)
+    calls = []
+    umask = os.umask
+    monkeypatch.setattr(yaml_io._os, "umask", lambda mask: calls.append(mask) or umask(mask))
+
+    path = tmp_path / "existente.yml"
+    path.write_text("nav: []\n", encoding="utf-8")
+    yaml_io.write_config(str(path), {"nav": [{"A": "a.md"}]}, backups=0)
+    # um arquivo que já existe mantém as permissões dele: o umask nem é lido
+    assert yaml_io._UMASK is None
+
+    yaml_io.write_config(str(tmp_path / "outro.yml"), {"nav": []}, backups=0)
+    assert yaml_io._UMASK is not None
+    if os.path.exists("/proc/self/status"):
+        # no Linux o umask vem de /proc, sem ser trocado
+        assert calls == []
@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+
+from docwriter import store as store_module
+from docwriter.placement import HARDLINK, SKIPPED
+from docwriter.project import Project
+from docwriter.store import ContentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore.for_docs(tmp_path / "docs")
+
+
+@pytest.fixture
+def sources(tmp_path):
+    a = tmp_path / "a.md"
+    b = tmp_path / "b.md"
+    a.write_text("# Igual\n", encoding="utf-8")
+    b.write_text("# Igual\n", encoding="utf-8")
+    return a, b
+
+
+def _objects(store):
+    return sorted(store.objects.rglob("*")) if store.objects.is_dir() else []
+
+
+def test_same_content_is_stored_once(store, sources, tmp_path):
+    a, b = sources
+    first = tmp_path / "docs" / "A" / "a.md"
+    second = tmp_path / "docs" / "B" / "b.md"
+    assert store.place(a, first) == HARDLINK
+    assert store.place(b, second) == HARDLINK
+    assert store.place(a, first) == SKIPPED
+
+    obj = store.object_path(store.digest(a))
+    assert [path for path in _objects(store) if path.is_file()] == [obj]
+    assert os.path.samefile(obj, first) and os.path.samefile(obj, second)
+    assert obj.stat().st_nlink == 3
+
+
+def test_release_removes_object_with_last_link(store, sources, tmp_path):
+    a, b = sources
+    first = tmp_path / "docs" / "A" / "a.md"
+    second = tmp_path / "docs" / "B" / "b.md"
+    store.place(a, first)
+    store.place(b, second)
+    obj = store.object_path(store.digest(a))
+
+    store.release(first)
+    assert not first.exists()
+    assert obj.is_file() and obj.stat().st_nlink == 2
+
+    store.release(second)
+    assert not second.exists()
+    assert not obj.exists()
+    # caminho que já não existe: nada a fazer
+    store.release(second)
+
+
+def test_gc_removes_orphans_and_stale_index_entries(store, sources, tmp_path):
+    a, b = sources
+    target = tmp_path / "docs" / "A" / "a.md"
+    store.place(a, target)
+    b.write_text("# Outro\n", encoding="utf-8")
+    # objeto sem caminho materializado, como o que sobra de um rollback
+    orphan = store.put(b)
+    kept = store.object_path(store.digest(a))
+    b.unlink()
+
+    assert store.gc() == 1
+    assert not orphan.exists() and not orphan.parent.exists()
+    assert kept.is_file()
+    index = json.loads((store.root / "index.json").read_text(encoding="utf-8"))
+    assert list(index["files"]) == [str(a.resolve())]
+    assert store.gc() == 0
+
+
+def test_digest_reads_only_changed_files(store, sources, monkeypatch):
+    a, _ = sources
+    calls = []
+    file_hash = store_module._file_hash
+    monkeypatch.setattr(store_module, "_file_hash", lambda path: calls.append(path) or file_hash(path))
+
+    digest = store.digest(a)
+    assert store.digest(a) == digest
+    assert len(calls) == 1
+
+    a.write_text("# Alterado, com outro tamanho\n", encoding="utf-8")
+    assert store.digest(a) != digest
+    assert len(calls) == 2
+
+
+def test_index_survives_reopen(store, sources, monkeypatch):
+    a, _ = sources
+    digest = store.digest(a)
+    store.flush()
+
+    monkeypatch.setattr(store_module, "_file_hash", lambda path: pytest.fail("hash recalculado"))
+    assert ContentStore(store.root).digest(a) == digest
+
+
+def test_corrupt_index_is_rebuilt(store, sources):
+    a, _ = sources
+    store.root.mkdir(parents=True)
+    (store.root / "index.json").write_text("{corrompido", encoding="utf-8")
+    assert store.digest(a) == ContentStore(store.root / "outro").digest(a)
+
+
+def test_project_refcounts_documents(site, monkeypatch):
+    monkeypatch.setenv("MKDOCS_PLACEMENT", "cas")
+    project = Project(site.config_path, site.doc_root, new_section_text="{key}")
+    project.index("N.A", site.source)
+    project.index("N.B", site.source)
+    obj = project.store.object_path(project.store.digest(site.source))
+    assert obj.stat().st_nlink == 3
+    # o índice é gravado no commit
+    assert (project.store.root / "index.json").is_file()
+
+    project.unindex("N.A", site.source)
+    assert obj.stat().st_nlink == 2
+    project.unindex("N.B", site.source)
+    assert not obj.exists()
+    assert project.store.gc() == 0
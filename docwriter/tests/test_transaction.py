@@ -0,0 +1,98 @@
+import os
+
+import pytest
+import yaml
+
+from docwriter import project as project_module
+from docwriter.exceptions import MkdocsFileNotFoundError
+from docwriter.project import Project
+
+
+@pytest.fixture
+def project(site):
+    return Project(site.config_path, site.doc_root, new_section_text="{key}")
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = []
+    write = project_module._write_config
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return write(*args, **kwargs)
+    monkeypatch.setattr(project_module, "_write_config", counting)
+    return calls
+
+
+def _disk_nav(site):
+    with open(site.config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["nav"]
+
+
+def test_batch_index_writes_once(site, project, writes):
+    items = [(f"N.D{i}", site.source) for i in range(10)] + [("S0.D0", site.source)]
+    results = project.batch_index(items)
+
+    assert results == [True] * 10 + [False]
+    assert len(writes) == 1
+    assert _disk_nav(site)[-1] == {"N": [{f"D{i}": f"N/D{i}/novo.md"} for i in range(10)]}
+    for i in range(10):
+        assert os.path.isfile(os.path.join(site.doc_root, "N", f"D{i}", "novo.md"))
+
+
+def test_transaction_groups_operations(site, project, writes):
+    with project.transaction():
+        assert project.index("N.A", site.source)
+        assert project.unindex("S1.D0")
+        assert project.update("S0.D1", "S0/D1/outro.md")
+        # transações aninhadas participam da externa
+        with project.transaction():
+            assert project.index("N.B", site.source)
+        assert writes == []
+
+    assert len(writes) == 1
+    nav = _disk_nav(site)
+    assert nav[0] == {"S0": [{"D0": "S0/D0/D0.md"}, {"D1": "S0/D1/outro.md"}, {"D2": "S0/D2/D2.md"}]}
+    assert nav[1] == {"S1": [{"D1": "S1/D1/D1.md"}, {"D2": "S1/D2/D2.md"}]}
+    assert nav[3] == {"N": [{"A": "N/A/novo.md"}, {"B": "N/B/novo.md"}]}
+
+
+def test_rollback_restores_nav_and_files(site, project, writes):
+    with open(site.config_path, "rb") as f:
+        before = f.read()
+    missing = os.path.join(os.path.dirname(site.source), "nao-existe.md")
+
+    with pytest.raises(MkdocsFileNotFoundError):
+        with project.transaction():
+            project.index("N.A", site.source)
+            project.unindex("S0.D0")
+            project.index("N.B", missing)
+
+    assert writes == []
+    with open(site.config_path, "rb") as f:
+        assert f.read() == before
+    # o nav em memória volta ao do arquivo e nenhuma pasta criada fica para trás
+    assert project.get_nav()[0]["S0"][0] == {"D0": "S0/D0/D0.md"}
+    assert "N" not in [next(iter(item)) for item in project.get_nav()]
+    assert os.listdir(site.doc_root) == []
+
+
+def test_rollback_after_copy_failure_removes_copies(site, project, monkeypatch):
+    copied = []
+    map_folders = project._map_folders
+
+    def failing(yaml_path, file_path, strategy=None):
+        if yaml_path == "N.C":
+            raise OSError("disco cheio")
+        copied.append(map_folders(yaml_path, file_path, strategy))
+    monkeypatch.setattr(project, "_map_folders", failing)
+
+    with pytest.raises(OSError):
+        with project.transaction():
+            for key in "ABC":
+                project.index(f"N.{key}", site.source)
+
+    assert copied
+    assert os.listdir(site.doc_root) == []
+    assert [next(iter(item)) for item in _disk_nav(site)] == ["S0", "S1", "S2"]
@@ -0,0 +1,130 @@
+import os
+import queue
+import shutil
+import threading
+
+import pytest
+
+from docwriter import watcher as watcher_module
+from docwriter.consistency import Drift
+from docwriter.project import Project
+from docwriter.watcher import DocsChanges, Watcher
+
+
+@pytest.fixture
+def project(site):
+    return Project(site.config_path, site.doc_root, new_section_text="{key}")
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher(request, project):
+    watcher = Watcher(project, debounce=0.05, interval=0.02, polling=request.param == "polling")
+    yield watcher
+    watcher.stop()
+
+
+@pytest.fixture
+def batches(watcher):
+    received = queue.Queue()
+    watcher.subscribe(received.put)
+    watcher.start()
+    # a leitura inicial roda na thread do watcher; espera por ela antes de mexer na pasta
+    watcher._scan()
+    return lambda: received.get(timeout=5)
+
+
+def _write(site, rel, text="# doc\n"):
+    path = os.path.join(site.doc_root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def test_backend_selection(watcher, request):
+    assert watcher.polling == (request.node.callspec.params["watcher"] == "polling")
+
+
+def test_creating_the_watcher_does_not_scan(site, project, monkeypatch):
+    threads = []
+    load = watcher_module._PathIndex.load
+
+    def recording(index, rel=""):
+        threads.append(threading.current_thread().name)
+        return load(index, rel)
+    monkeypatch.setattr(watcher_module._PathIndex, "load", recording)
+
+    watcher = Watcher(project, debounce=0.05, interval=0.02)
+    try:
+        assert threads == []
+        watcher.start()
+        watcher._scan()
+        # uma única leitura, feita pela thread do watcher
+        assert threads == ["docwriter-watcher"]
+    finally:
+        watcher.stop()
+
+
+def test_full_drift(site, watcher):
+    _write(site, "S0/D0/D0.md")
+    _write(site, "Solto/a.md")
+
+    drift = watcher.drift()
+
+    assert drift.orphans == ("Solto/a.md",)
+    assert ("S0.D0", "S0/D0/D0.md") not in drift.missing
+    assert ("S0.D1", "S0/D1/D1.md") in drift.missing
+    assert len(drift.missing) == 8
+
+
+def test_batches_report_created_and_deleted(site, watcher, batches):
+    _write(site, "S0/D0/D0.md")
+    _write(site, "Novo/Sub/b.md")
+    assert batches() == DocsChanges(created=("Novo/Sub/b.md", "S0/D0/D0.md"))
+
+    shutil.rmtree(os.path.join(site.doc_root, "Novo"))
+    changes = batches()
+    assert changes == DocsChanges(deleted=("Novo/Sub/b.md",))
+    assert watcher.drift(changes) == Drift()
+
+
+def test_short_lived_file_is_not_reported(site, watcher, batches):
+    os.remove(_write(site, "Temp/x.md"))
+    _write(site, "S1/D1/D1.md")
+    assert batches() == DocsChanges(created=("S1/D1/D1.md",))
+
+
+def test_apply_repairs_nav(site, project, watcher, batches):
+    _write(site, "N/A/a.md")
+    changes = batches()
+    drift = watcher.drift(changes)
+    assert drift == Drift(orphans=("N/A/a.md",))
+
+    assert watcher.apply(drift) == Drift()
+    assert {"N": [{"A": "N/A/a.md"}]} in project.read_nav()
+    # o índice do nav usado por drift() acompanha a alteração
+    assert watcher.drift(changes) == Drift()
+
+
+def test_missing_after_delete(site, watcher, batches):
+    _write(site, "S2/D2/D2.md")
+    batches()
+    os.remove(os.path.join(site.doc_root, "S2", "D2", "D2.md"))
+    assert watcher.drift(batches()) == Drift(missing=(("S2.D2", "S2/D2/D2.md"),))
+
+
+def test_watch_failure_falls_back_to_polling(site, project, monkeypatch):
+    def no_watches(backend, rel):
+        raise OSError(28, "limite de watches")
+    monkeypatch.setattr(watcher_module._InotifyBackend, "add", no_watches)
+    watcher = Watcher(project, debounce=0.05, interval=0.02, polling=False)
+    received = queue.Queue()
+    watcher.subscribe(received.put)
+    try:
+        watcher.start()
+        watcher._scan()
+        assert watcher.polling
+        _write(site, "S0/D1/D1.md")
+        assert received.get(timeout=5) == DocsChanges(created=("S0/D1/D1.md",))
+    finally:
+        watcher.stop()
@@ -0,0 +1,206 @@
+import datetime
+import os
+
+import pytest
+
+from docwriter import yaml_io
+from docwriter.exceptions import MkdocsIndexingWriteError
+
+CONFIG = """\
+site_name: Teste  # comentário preservado
+nav:
+  - Home: index.md
+  - Pasta:
+      - Doc: Pasta/doc.md
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    path = site / "mkdocs.yml"
+    path.write_bytes(CONFIG.encode())
+    yield str(path)
+    yaml_io.invalidate()
+
+
+def _leftovers(folder):
+    """Arquivos da pasta além do mkdocs.yml e da trava (locking)."""
+    return sorted(name for name in os.listdir(folder) if name not in ("mkdocs.yml", ".mkdocs.yml.lock"))
+
+
+def test_failed_dump_keeps_original(config_path, monkeypatch):
+    config = yaml_io.read_config(config_path)
+    config["nav"].append({"Novo": "novo.md"})
+
+    def broken_dump(data, stream):
+        stream.write("site_name: pela metade\nnav:\n  - ")
+        raise RuntimeError("falha no meio da serialização")
+    monkeypatch.setattr(yaml_io, "_dump", broken_dump)
+
+    with pytest.raises(MkdocsIndexingWriteError):
+        yaml_io.write_config(config_path, config, backups=2)
+
+    with open(config_path, "rb") as f:
+        assert f.read() == CONFIG.encode()
+    # nem temporário nem backup: a troca não chegou a acontecer
+    assert _leftovers(os.path.dirname(config_path)) == []
+
+
+def test_failed_section_write_keeps_original(config_path, monkeypatch):
+    config = yaml_io.read_config(config_path)
+    config["nav"].append({"Novo": "novo.md"})
+    monkeypatch.setattr(yaml_io._os, "replace", _raise_os_error)
+
+    with pytest.raises(MkdocsIndexingWriteError):
+        yaml_io.write_config(config_path, config, backups=0, key="nav")
+
+    with open(config_path, "rb") as f:
+        assert f.read() == CONFIG.encode()
+    assert _leftovers(os.path.dirname(config_path)) == []
+
+def _raise_os_error(*args):
+    raise OSError("disco cheio")
+
+
+def test_backup_count_follows_setting(config_path, monkeypatch):
+    monkeypatch.setenv("MKDOCS_CONFIG_BACKUPS", "3")
+    versions = []
+    for generation in range(5):
+        with open(config_path, "rb") as f:
+            versions.append(f.read())
+        config = yaml_io.read_config(config_path)
+        config["site_name"] = f"Versão {generation}"
+        yaml_io.write_config(config_path, config)
+
+    folder = os.path.dirname(config_path)
+    assert _leftovers(folder) == ["mkdocs.yml.bkp.1", "mkdocs.yml.bkp.2", "mkdocs.yml.bkp.3"]
+    # .bkp.1 é a versão anterior à última gravação, .bkp.3 a mais antiga mantida
+    for generation in (1, 2, 3):
+        with open(f"{config_path}.bkp.{generation}", "rb") as f:
+            assert f.read() == versions[-generation]
+
+
+def test_backups_disabled(config_path, monkeypatch):
+    monkeypatch.setenv("MKDOCS_CONFIG_BACKUPS", "0")
+    config = yaml_io.read_config(config_path)
+    yaml_io.write_config(config_path, config)
+    assert _leftovers(os.path.dirname(config_path)) == []
+
+
+def test_backups_next_to_config(config_path, tmp_path, monkeypatch):
+    elsewhere = tmp_path / "cwd"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    config = yaml_io.read_config(config_path)
+    yaml_io.write_config(config_path, config, backups=1, key="nav")
+    # caminho relativo ao diretório atual também grava o backup na pasta do arquivo
+    relative = os.path.relpath(config_path)
+    yaml_io.write_config(relative, yaml_io.read_config(relative), backups=2)
+
+    assert os.listdir(elsewhere) == []
+    assert _leftovers(os.path.dirname(config_path)) == ["mkdocs.yml.bkp.1", "mkdocs.yml.bkp.2"]
+    with open(f"{config_path}.bkp.2", "rb") as f:
+        assert f.read() == CONFIG.encode()
+
+
+def test_read_config_reuses_until_file_changes(config_path):
+    config = yaml_io.read_config(config_path)
+    assert yaml_io.read_config(config_path) is config
+    assert yaml_io.read_config(config_path, "nav") is config["nav"]
+
+    # outro processo grava o arquivo: tamanho diferente invalida a leitura
+    with open(config_path, "a", encoding="utf-8") as f:
+        f.write("extra: 1\n")
+    reloaded = yaml_io.read_config(config_path)
+    assert reloaded is not config
+    assert reloaded["extra"] == 1
+
+
+def test_same_size_change_is_noticed(config_path):
+    config = yaml_io.read_config(config_path)
+    stat = os.stat(config_path)
+    with open(config_path, "rb") as f:
+        text = f.read()
+    with open(config_path, "wb") as f:
+        f.write(text.replace(b"Teste", b"Outro"))
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert yaml_io.read_config(config_path)["site_name"] == "Outro"
+    assert config["site_name"] == "Teste"
+
+
+def test_write_config_keeps_written_object_cached(config_path):
+    config = yaml_io.read_config(config_path)
+    config["nav"].append({"Novo": "novo.md"})
+    yaml_io.write_config(config_path, config, backups=0, key="nav")
+    assert yaml_io.read_config(config_path) is config
+
+
+def test_write_config_with_edit_drops_cache(config_path):
+    config = yaml_io.read_config(config_path)
+    config["nav"].append({"Novo": "novo.md"})
+    yaml_io.write_config(config_path, config, backups=0, key="nav", edit=lambda text: "# marca\n" + text)
+
+    reloaded = yaml_io.read_config(config_path)
+    assert reloaded is not config
+    assert reloaded["nav"][-1] == {"Novo": "novo.md"}
+    # gravar o objeto relido mantém a linha acrescentada por 'edit'
+    yaml_io.write_config(config_path, reloaded, backups=0)
+    with open(config_path, encoding="utf-8") as f:
+        assert f.readline() == "# marca\n"
+
+
+def test_invalidate_forces_reload(config_path):
+    config = yaml_io.read_config(config_path)
+    yaml_io.invalidate(config_path)
+    assert yaml_io.read_config(config_path) is not config
+
+
+SCALARS = """\
+site_name: Escalares
+nav:
+  - On: on/index.md
+  - No:
+      - Yes: no/yes.md
+      - y: no/y.md
+  - 1_000: mil.md
+  - 0x10: hex.md
+  - 010: dez.md
+  - 0o10: oito.md
+  - true: verdade.md
+  - 2024-01-31: data.md
+theme:
+  name: material
+"""
+
+
+def test_read_section_matches_read_config(config_path):
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(SCALARS)
+
+    section = yaml_io.read_section(config_path)
+    yaml_io.invalidate()
+    full = yaml_io.read_config(config_path)["nav"]
+
+    # só o bloco nav foi analisado, sem o arquivo completo em cache
+    assert section is not full
+    assert section == full
+    keys = [key for item in section for key in item]
+    assert keys[:2] == ["On", "No"]
+    assert keys[2:6] == [1000, 16, 10, 8]
+    assert list(section[1]["No"][0]) == ["Yes"]
+    assert keys[6:] == [True, datetime.date(2024, 1, 31)]
+
+
+def test_read_section_returns_cached_full_config(config_path):
+    config = yaml_io.read_config(config_path)
+    assert yaml_io.read_section(config_path) is config["nav"]
+    assert yaml_io.read_section(config_path, "site_name") == "Teste"
+
+
+def test_read_section_falls_back_for_anchors(config_path):
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write("base: &doc index.md\nnav:\n  - Home: *doc\n")
+    assert yaml_io.read_section(config_path) == [{"Home": "index.md"}]